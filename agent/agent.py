@@ -1,23 +1,120 @@
-from typing import List, Optional
-from constants.tool_constants import TOOL_HANDLERS, TOOL_MODELS
+import asyncio
+from typing import Any, Callable, Dict, List, Optional, Tuple, Union
+from pydantic import BaseModel
+from constants.tool_constants import TOOL_HANDLERS, TOOL_MODELS, PLAN_STEP_ADAPTER, BATCH_TOOL_HANDLERS
+from constants.tool_constants import ASYNC_TOOL_HANDLERS
 from .llm import call_llm
+from .plan_graph import step_dependencies
+from .executor import execute_plan
+from .plan_optimizer import optimize_plan
 from utils.logger import get_logger
 from .types.tool_types import IntermediateValues
-from .types.plan_types import PlanStepModel, AnswerResultType
-from typeguard import typechecked, TypeCheckError
+from .types.plan_types import PlanStep, AnswerResultType, plan_step
+from typeguard import TypeCheckError
+from utils.type_checking import typechecked
 from utils.latency_tracker import track_latency
 
 logger = get_logger(__name__)
 
+
+def _validate_raw_step(step: dict) -> PlanStep:
+    """
+    Validate a raw plan step (e.g. JSON emitted by an LLM) into a trusted step.
+
+    Args:
+        step (dict): Raw step with 'tool' and 'args'.
+
+    Returns:
+        PlanStep: Step whose args are an instance of the tool's args model.
+
+    Raises:
+        ValidationError: If the tool is unknown or its args are invalid.
+    """
+
+    model = PLAN_STEP_ADAPTER.validate_python(step)
+    return plan_step(model.tool, model.args)
+
+def _build_plan(q: str) -> Optional[List[PlanStep]]:
+    """
+    Generate the plan for a query, validate any raw steps in it and optimize it.
+
+    Args:
+        q (str): Input query.
+
+    Returns:
+        Optional[List[PlanStep]]: Trusted plan steps, or None if no plan was produced.
+    """
+
+    plan_raw: Optional[List[Union[PlanStep, dict]]] = call_llm(q)
+    plan: Optional[List[PlanStep]] = None
+
+    if plan_raw and isinstance(plan_raw, list):
+        # Trusted steps pass straight through; raw dicts are validated at this boundary
+        plan = [step if isinstance(step, PlanStep) else _validate_raw_step(step) for step in plan_raw]
+        plan = optimize_plan(plan, TOOL_HANDLERS)
+    logger.info("Generated plan: %s", plan)
+    return plan
+
+
+def _report_step_error(tool_name: str, args: BaseModel, error: Exception) -> None:
+    """
+    Log (and for expected errors, print) why a plan step failed.
+
+    Args:
+        tool_name (str): Tool of the failed step.
+        args (BaseModel): Args of the failed step.
+        error (Exception): Exception raised by the step's handler.
+    """
+
+    if isinstance(error, TypeCheckError):
+        logger.error("TypeError: %s", error)
+        print("TypeError:", error)
+    elif isinstance(error, ZeroDivisionError):
+        logger.error("ValueError: %s", error)
+        print("ZeroDivisionError:", error)
+    elif isinstance(error, ValueError):
+        logger.error("ValueError: %s", error)
+        print("ValueError:", error)
+    else:
+        logger.error(
+            "Error executing tool: %s with args: %s", tool_name, args.model_dump(),
+            exc_info=(type(error), error, error.__traceback__),
+        )
+
+
+def _resolve_handler(tool_name: str) -> Callable:
+    """
+    Return the handler of a tool.
+
+    Args:
+        tool_name (str): Tool name of a plan step.
+
+    Returns:
+        Callable: The tool's handler.
+
+    Raises:
+        ValueError: If the tool has no args model or handler.
+    """
+
+    if not TOOL_MODELS.get(tool_name):
+        raise ValueError(f"No args model defined for tool {tool_name}")
+
+    handler = TOOL_HANDLERS.get(tool_name)
+    if not handler:
+        raise ValueError(f"No handler found for tool {tool_name}")
+    return handler
+
 @track_latency(__name__)
 @typechecked
 def answer(q: str) -> AnswerResultType:
     """
     Process a natural language query by generating and executing a tool plan.
 
-    The query is passed to the LLM to produce a plan. Each step is validated
-    and dispatched to the corresponding handler. Intermediate results are shared,
-    and the final tool's output is returned.
+    The query is passed to the LLM to produce a plan. Steps produced by
+    `call_llm` are already validated and are dispatched to their handlers as
+    they are; only raw (dict) steps are validated, once, on entry. Intermediate
+    results are shared, and the final tool's output is returned. Steps that
+    share no intermediate_values key run in parallel (see `execute_plan`).
 
     Args:
         q (str): Input query.
@@ -33,58 +130,182 @@ def answer(q: str) -> AnswerResultType:
     """
 
     try:
-        plan_raw: Optional[List[PlanStepModel]] = call_llm(q) # Raw LLM output (list of dicts)
-        plan: Optional[List[PlanStepModel]] = None
-
-        if plan_raw and isinstance(plan_raw, list):
-            plan = [PlanStepModel.model_validate(step) for step in plan_raw] # Parsing each step into a Pydantic model
-        logger.info("Generated plan: %s", plan)
+        plan: Optional[List[PlanStep]] = _build_plan(q)
     except Exception:
         logger.exception("Failed to generate plan from LLM")
         return str(None)
 
     if plan:
+        for step in plan:
+            _resolve_handler(step.tool)
+
         intermediate_values: IntermediateValues = {}
-        result: AnswerResultType = ""
+        outcomes: List[Any] = execute_plan(plan, TOOL_HANDLERS, intermediate_values)
 
-        for step in plan:
-            tool_name: str = step.tool
-
-            args_model = TOOL_MODELS.get(tool_name)
-
-            if not args_model:
-                raise ValueError(f"No args model defined for tool {tool_name}")
-                
-            handler = TOOL_HANDLERS.get(tool_name)
-            
-            if not handler:
-                raise ValueError(f"No handler found for tool {tool_name}")
-            
-            args = args_model.model_validate(step.args)
-            
-            logger.info("Executing tool: %s with args: %s", tool_name, args.model_dump())
-
-            try:
-                result = handler(args, intermediate_values)
-                logger.info("Tool %s executed successfully, result: %s", tool_name, result)
-            except TypeCheckError as tce:
-                logger.error("TypeError: %s", tce)
-                print("TypeError:", tce)
-                return None
-            except ZeroDivisionError as zde:
-                logger.error("ValueError: %s", zde)
-                print("ZeroDivisionError:", zde)
-                return None
-            except ValueError as ve:
-                logger.error("ValueError: %s", ve)
-                print("ValueError:", ve)
-                return None
-            except Exception as e:
-                logger.exception("Error executing tool: %s with args: %s", tool_name, args.model_dump())
+        # Report the first failing step in plan order, as the sequential loop would
+        for step, outcome in zip(plan, outcomes):
+            if isinstance(outcome, Exception):
+                _report_step_error(step.tool, step.args, outcome)
                 return None
 
+        result: AnswerResultType = outcomes[-1]
         logger.info("Final result: %s", result)
         return result
 
     logger.warning("Invalid or empty plan returned: %s", plan)
     return None
+
+
+@track_latency(__name__)
+@typechecked
+def answer_many(queries: List[str]) -> List[AnswerResultType]:
+    """
+    Answer a batch of queries, running each tool once per step for the whole batch.
+
+    Identical queries are planned and executed once. The plans are then run
+    side by side: at every step index, the steps of all still-running plans
+    are grouped by tool and each group goes through the tool's batch handler
+    in one call (tools without one run step by step). Every plan keeps its
+    own intermediate values, so each result is what `answer(q)` returns for
+    the same query.
+
+    Args:
+        queries (List[str]): Input queries.
+
+    Returns:
+        List[AnswerResultType]: One result per query, in input order.
+
+    Raises:
+        ValueError: If a step has no corresponding args model or handler.
+    """
+
+    logger.info("answer_many called with %d queries", len(queries))
+
+    unique_queries: List[str] = list(dict.fromkeys(queries))
+    outcomes: Dict[str, AnswerResultType] = {}
+    plans: Dict[str, List[PlanStep]] = {}
+
+    for q in unique_queries:
+        try:
+            plan: Optional[List[PlanStep]] = _build_plan(q)
+        except Exception:
+            logger.exception("Failed to generate plan from LLM")
+            outcomes[q] = str(None)
+            continue
+
+        if not plan:
+            logger.warning("Invalid or empty plan returned: %s", plan)
+            outcomes[q] = None
+            continue
+        plans[q] = plan
+
+    intermediate_values: Dict[str, IntermediateValues] = {q: {} for q in plans}
+    results: Dict[str, AnswerResultType] = {q: "" for q in plans}
+    running: List[str] = list(plans)
+    step_index: int = 0
+
+    while running:
+        groups: Dict[str, List[str]] = {}
+        for q in running:
+            groups.setdefault(plans[q][step_index].tool, []).append(q)
+
+        for tool_name, group in groups.items():
+            handler = _resolve_handler(tool_name)
+            args_list: List[BaseModel] = [plans[q][step_index].args for q in group]
+            states: List[IntermediateValues] = [intermediate_values[q] for q in group]
+
+            logger.info("Executing tool: %s for %d queries", tool_name, len(group))
+
+            step_results: List[Union[AnswerResultType, Exception]] = []
+            batch_handler = BATCH_TOOL_HANDLERS.get(tool_name)
+            if batch_handler:
+                try:
+                    step_results = batch_handler(args_list, states)
+                except Exception as e:
+                    step_results = [e] * len(group)
+            else:
+                for args, state in zip(args_list, states):
+                    try:
+                        step_results.append(handler(args, state))
+                    except Exception as e:
+                        step_results.append(e)
+
+            for q, args, result in zip(group, args_list, step_results):
+                if isinstance(result, Exception):
+                    _report_step_error(tool_name, args, result)
+                    outcomes[q] = None
+                else:
+                    results[q] = result
+
+        step_index += 1
+        for q in running:
+            if q not in outcomes and step_index == len(plans[q]):
+                logger.info("Final result: %s", results[q])
+                outcomes[q] = results[q]
+        running = [q for q in running if q not in outcomes]
+
+    # Duplicate queries get their own copy of mutable results
+    return [dict(outcomes[q]) if isinstance(outcomes[q], dict) else outcomes[q] for q in queries]
+
+
+@track_latency(__name__)
+@typechecked
+async def answer_async(q: str) -> AnswerResultType:
+    """
+    Asyncio-native variant of `answer` that does not block the event loop on lookups.
+
+    Steps are started as soon as the steps they depend on (see
+    `step_dependencies`) have finished, so steps that touch no common
+    intermediate_values key run concurrently. Tools with an async handler
+    have their lookups awaited; the others run inline. The result, and the
+    error reported when a step fails, are the same as `answer(q)`.
+
+    Args:
+        q (str): Input query.
+
+    Returns:
+        AnswerResultType: Final result from the executed plan. Can be a string, a float, or None if execution fails or the plan is invalid.
+
+    Raises:
+        ValueError: If a step has no corresponding args model or handler.
+    """
+
+    try:
+        plan: Optional[List[PlanStep]] = _build_plan(q)
+    except Exception:
+        logger.exception("Failed to generate plan from LLM")
+        return str(None)
+
+    if not plan:
+        logger.warning("Invalid or empty plan returned: %s", plan)
+        return None
+
+    handlers: List[Callable] = [_resolve_handler(step.tool) for step in plan]
+    dependencies: List[Tuple[int, ...]] = step_dependencies(plan, TOOL_HANDLERS)
+    intermediate_values: IntermediateValues = {}
+    tasks: List[asyncio.Task] = []
+
+    async def run_step(index: int) -> AnswerResultType:
+        # A failed dependency re-raises here, so its dependents never run
+        await asyncio.gather(*(tasks[i] for i in dependencies[index]))
+
+        step: PlanStep = plan[index]
+        logger.info("Executing tool: %s with args: %s", step.tool, step.args.model_dump())
+
+        async_handler = ASYNC_TOOL_HANDLERS.get(step.tool)
+        if async_handler:
+            return await async_handler(step.args, intermediate_values)
+        return handlers[index](step.args, intermediate_values)
+
+    for index in range(len(plan)):
+        tasks.append(asyncio.create_task(run_step(index)))
+    results: List[Union[AnswerResultType, BaseException]] = await asyncio.gather(*tasks, return_exceptions=True)
+
+    # Report the first failing step in plan order, as the sequential loop would
+    for step, result in zip(plan, results):
+        if isinstance(result, Exception):
+            _report_step_error(step.tool, step.args, result)
+            return None
+
+    logger.info("Final result: %s", results[-1])
+    return results[-1]
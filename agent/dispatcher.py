@@ -0,0 +1,114 @@
+import re
+from typing import Dict, FrozenSet, Iterable, List, Pattern, Set
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def _build_trie(triggers: Iterable[str]) -> Dict:
+    """
+    Build a character trie from trigger tokens.
+
+    Args:
+        triggers (Iterable[str]): Lowercased trigger tokens.
+
+    Returns:
+        Dict: Nested dict trie; the empty-string key marks the end of a trigger.
+    """
+
+    trie: Dict = {}
+    for trigger in triggers:
+        node = trie
+        for char in trigger:
+            node = node.setdefault(char, {})
+        node[""] = True
+    return trie
+
+
+def _trie_to_regex(node: Dict) -> str:
+    """
+    Render a trie as a regex that branches on one character at a time.
+
+    Alternatives are grouped by their first character, so the regex engine
+    only follows the branch matching the current character instead of trying
+    every trigger in turn. Optional tails are greedy, so the longest trigger
+    starting at a position wins.
+
+    Args:
+        node (Dict): Trie node produced by `_build_trie`.
+
+    Returns:
+        str: Regex source for the sub-trie.
+    """
+
+    branches: List[str] = [
+        re.escape(char) + _trie_to_regex(child)
+        for char, child in sorted(node.items()) if char
+    ]
+    if not branches:
+        return ""
+
+    body = branches[0] if len(branches) == 1 else f"(?:{'|'.join(branches)})"
+    if "" in node:
+        return f"(?:{body})?"
+    return body
+
+
+class IntentDispatcher:
+    """
+    Single-pass trigger scanner that decides which parsers can match a prompt.
+
+    All trigger tokens of all tools are compiled into one trie-shaped regex
+    and the prompt is scanned once. A parser is only worth running if at least
+    one of its triggers occurs in the prompt; parsers registered without
+    triggers are always run.
+    """
+
+    def __init__(self, triggers: Dict[str, Iterable[str]]):
+        """
+        Compile the trigger automaton.
+
+        Args:
+            triggers (Dict[str, Iterable[str]]): Mapping of tool name to its lowercased trigger tokens.
+        """
+
+        self._tools_by_trigger: Dict[str, FrozenSet[str]] = {}
+        owners: Dict[str, Set[str]] = {}
+        for tool_name, tokens in triggers.items():
+            for token in tokens:
+                owners.setdefault(token.lower(), set()).add(tool_name)
+
+        # Only the longest trigger at a position is reported, so every trigger
+        # also carries the tools of the shorter triggers it starts with.
+        for token in owners:
+            tools: Set[str] = set()
+            for prefix_end in range(1, len(token) + 1):
+                tools |= owners.get(token[:prefix_end], set())
+            self._tools_by_trigger[token] = frozenset(tools)
+
+        self._all_tools: FrozenSet[str] = frozenset(triggers)
+        self._pattern: Pattern = re.compile(f"(?=({_trie_to_regex(_build_trie(owners))}))") if owners else None
+
+    def dispatch(self, prompt: str) -> FrozenSet[str]:
+        """
+        Scan a lowercased prompt once and return the tools whose triggers occur in it.
+
+        Args:
+            prompt (str): Lowercased prompt.
+
+        Returns:
+            FrozenSet[str]: Names of the tools whose triggers were found.
+        """
+
+        found: Set[str] = set()
+        if self._pattern is None:
+            return frozenset(found)
+
+        tools_by_trigger = self._tools_by_trigger
+        for match in self._pattern.finditer(prompt):
+            found |= tools_by_trigger[match.group(1)]
+            if len(found) == len(self._all_tools):
+                break  # Every tool is already triggered; the rest of the prompt cannot add anything
+
+        logger.debug("Dispatcher triggered tools: %s", found)
+        return frozenset(found)
@@ -0,0 +1,136 @@
+import threading
+from concurrent.futures import FIRST_COMPLETED, Future, ThreadPoolExecutor, wait
+from typing import Any, Callable, Dict, List, Optional, Set, Tuple
+from config.settings import PLAN_EXECUTOR_WORKERS
+from .plan_graph import step_dependencies
+from .types.plan_types import PlanStep
+from .types.tool_types import IntermediateValues
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class _NotRun:
+    """Outcome of a step skipped because an earlier step it depends on failed."""
+
+    __slots__ = ()
+
+    def __repr__(self) -> str:
+        return "NOT_RUN"
+
+
+NOT_RUN = _NotRun()
+
+_pool: Optional[ThreadPoolExecutor] = None
+_pool_lock = threading.Lock()
+
+
+def _get_pool() -> ThreadPoolExecutor:
+    """Return the shared step thread pool, creating it on first use."""
+
+    global _pool
+    with _pool_lock:
+        if _pool is None:
+            _pool = ThreadPoolExecutor(max_workers=PLAN_EXECUTOR_WORKERS, thread_name_prefix="plan-step")
+        return _pool
+
+
+def _run_step(step: PlanStep, handler: Callable, intermediate_values: IntermediateValues) -> Any:
+    """Run one step through its handler."""
+
+    logger.info("Executing tool: %s with args: %s", step.tool, step.args.model_dump())
+    result = handler(step.args, intermediate_values)
+    logger.info("Tool %s executed successfully, result: %s", step.tool, result)
+    return result
+
+
+def _run_sequential(
+    plan: List[PlanStep], handlers: Dict[str, Callable], intermediate_values: IntermediateValues
+) -> List[Any]:
+    """Run the steps in order, stopping at the first failure."""
+
+    outcomes: List[Any] = [NOT_RUN] * len(plan)
+    for index, step in enumerate(plan):
+        try:
+            outcomes[index] = _run_step(step, handlers[step.tool], intermediate_values)
+        except Exception as e:
+            outcomes[index] = e
+            break
+    return outcomes
+
+
+def _run_parallel(
+    plan: List[PlanStep],
+    handlers: Dict[str, Callable],
+    intermediate_values: IntermediateValues,
+    dependencies: List[Tuple[int, ...]],
+) -> List[Any]:
+    """Submit every step to the pool as soon as all steps it depends on have succeeded."""
+
+    outcomes: List[Any] = [NOT_RUN] * len(plan)
+    waiting_on: List[Set[int]] = [set(step_dependencies) for step_dependencies in dependencies]
+    dependents: List[List[int]] = [[] for _ in plan]
+    for index, step_dependencies in enumerate(dependencies):
+        for dependency in step_dependencies:
+            dependents[dependency].append(index)
+
+    pool: ThreadPoolExecutor = _get_pool()
+    ready: List[int] = [index for index, blockers in enumerate(waiting_on) if not blockers]
+    running: Dict[Future, int] = {}
+
+    while ready or running:
+        for index in ready:
+            step: PlanStep = plan[index]
+            running[pool.submit(_run_step, step, handlers[step.tool], intermediate_values)] = index
+        ready = []
+
+        done, _ = wait(running, return_when=FIRST_COMPLETED)
+        for future in done:
+            index = running.pop(future)
+            error: Optional[BaseException] = future.exception()
+            if error is not None:
+                # Steps depending on a failed step are never started
+                outcomes[index] = error
+                continue
+
+            outcomes[index] = future.result()
+            for dependent in dependents[index]:
+                waiting_on[dependent].discard(index)
+                if not waiting_on[dependent]:
+                    ready.append(dependent)
+
+    return outcomes
+
+
+def execute_plan(
+    plan: List[PlanStep], handlers: Dict[str, Callable], intermediate_values: IntermediateValues
+) -> List[Any]:
+    """
+    Run a plan, executing independent steps in parallel on a thread pool.
+
+    Dependencies come from the intermediate_values keys each handler declares
+    (see `step_dependencies`), so every step sees the same state it would see
+    in a sequential run and the outcomes match running the plan in order.
+    Plans with no two independent steps, or a pool of one worker, run inline
+    without touching the pool.
+
+    Args:
+        plan (List[PlanStep]): Plan steps in execution order.
+        handlers (Dict[str, Callable]): Handler per tool.
+        intermediate_values (IntermediateValues): State shared by the steps.
+
+    Returns:
+        List[Any]: Per step, its result, the exception it raised, or NOT_RUN if it was skipped
+            because a step before it failed.
+    """
+
+    dependencies: List[Tuple[int, ...]] = step_dependencies(plan, handlers)
+    parallel: bool = PLAN_EXECUTOR_WORKERS > 1 and any(
+        index - 1 not in dependencies[index] for index in range(1, len(plan))
+    )
+
+    if not parallel:
+        return _run_sequential(plan, handlers, intermediate_values)
+
+    logger.info("Running plan on thread pool with dependencies: %s", dependencies)
+    return _run_parallel(plan, handlers, intermediate_values, dependencies)
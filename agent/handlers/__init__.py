@@ -1,8 +1,8 @@
 from .calc_handler import handle_calc
-from .temp_handler import handle_temp
-from .weather_handler import handle_weather
-from .fx_handler import handle_fx
-from .kb_handler import handle_kb
+from .temp_handler import handle_temp, handle_temp_many, handle_temp_async
+from .weather_handler import handle_weather, handle_weather_many, handle_weather_async
+from .fx_handler import handle_fx, handle_fx_many, handle_fx_async
+from .kb_handler import handle_kb, handle_kb_many, handle_kb_async
 
 __all__ = [
     "handle_calc",
@@ -10,4 +10,12 @@ __all__ = [
     "handle_weather",
     "handle_fx",
     "handle_kb",
+    "handle_temp_many",
+    "handle_weather_many",
+    "handle_fx_many",
+    "handle_kb_many",
+    "handle_temp_async",
+    "handle_weather_async",
+    "handle_fx_async",
+    "handle_kb_async",
 ]
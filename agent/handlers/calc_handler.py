@@ -1,10 +1,12 @@
 from typing import Union, Dict, List
 from .. import tools
 from utils.logger import get_logger
+from constants.miscellaneous_constants import CHAIN_OPERATORS
 from ..types.tool_types import CalcArgs, IntermediateValues
 from ..types.plan_types import CalcResultType
-from typeguard import typechecked
+from utils.type_checking import typechecked
 from utils.latency_tracker import track_latency
+from ..plan_graph import declares_state
 
 logger = get_logger(__name__)
 
@@ -21,13 +23,12 @@ def _calc_with_city_temperatures(expr: str, temp_val_dict: Dict[str, float], int
         CalcResultType: Updated temperature results as a string for single city or dict for multiple cities.
     """
     
-    calc_results: Dict[str, float] = {}
     ops: List[str] = [op.strip() for op in expr.split("and")]
-    for key, val in temp_val_dict.items():
-        result: CalcResultType = val
-        for op in ops:
-            result: CalcResultType = tools.evaluate(f"{result}{op}")
-        calc_results[key] = result
+
+    # Compile the op chain once and apply it to every city in one pass
+    calc_results: Dict[str, float] = dict(zip(
+        temp_val_dict, tools.calc_elementwise(list(temp_val_dict.values()), ops)
+    ))
 
     intermediate_values["temperature"] = calc_results
     intermediate_values["last_calc_result"] = calc_results
@@ -62,9 +63,35 @@ def _calc_with_numbers(numbers: List[float], operation: str, intermediate_values
     return result
 
 
+def _calc_elementwise(numbers: List[float], expr: str, intermediate_values: IntermediateValues) -> CalcResultType:
+    """
+    Case-3: Apply an expression to each number of a list.
+
+    Args:
+        numbers (List[float]): List of numeric values.
+        expr (str): Expression applied to every value, e.g. "+ 5".
+        intermediate_values (IntermediateValues): Shared state.
+
+    Returns:
+        CalcResultType: The single result for one number, otherwise the results joined as "6.0, 7.0, 8.0".
+    """
+
+    ops: List[str] = [op.strip() for op in expr.split("and")]
+    results: List[CalcResultType] = tools.calc_elementwise(numbers, ops)
+    intermediate_values["last_calc_result"] = results
+
+    logger.info("handle_calc results: %s", results)
+    if len(results) == 1:
+        return results[0]
+    return ", ".join(str(result) for result in results)
+
+
 def _calc_with_last_result(expr: str, intermediate_values: IntermediateValues) -> CalcResultType:
     """
-    Case-3: Apply an expression to the last calculation result.
+    Case-4: Apply an expression to the last calculation result.
+
+    Operator-first parts (e.g. "+ 10") continue from the running result;
+    complete expressions (e.g. "2 + 3") are evaluated on their own.
 
     Args:
         expr (str): Expression to evaluate.
@@ -86,13 +113,26 @@ def _calc_with_last_result(expr: str, intermediate_values: IntermediateValues) -
 
     ops: List[str] = [op.strip() for op in expr.split("and")]
     for op in ops:
-        new_expr: str = f"{result} {op}" if result else f"{op}"
-        result: CalcResultType = tools.evaluate(new_expr)
+        # Operator-first expressions continue from the running result; complete ones stand alone
+        if result and op.startswith(CHAIN_OPERATORS):
+            result: CalcResultType = tools.compile_step(op, " ")(result)
+        else:
+            result = tools.evaluate(f"{op}")
 
     intermediate_values["last_calc_result"] = result
     logger.info("handle_calc result: %s", result)
     return result
 
+def _reads_last_result(args: CalcArgs) -> bool:
+    """Whether an expression step continues from `last_calc_result` (see `_calc_with_last_result`)."""
+
+    return bool(args.expr) and not args.numbers and any(op.strip().startswith(CHAIN_OPERATORS) for op in args.expr.split("and"))
+
+@declares_state(
+    reads=lambda args: {"last_calc_result"} if _reads_last_result(args) else set(),
+    writes={"last_calc_result"},
+    updates=lambda args: {"temperature"} if args.expr and not args.numbers else set(),
+)
 @track_latency(__name__)
 @typechecked
 def handle_calc(args: CalcArgs, intermediate_values: IntermediateValues) -> CalcResultType:
@@ -100,6 +140,7 @@ def handle_calc(args: CalcArgs, intermediate_values: IntermediateValues) -> Calc
     Route calculation requests to the appropriate handler.
 
     Depending on the provided arguments, this function delegates to:
+      - `_calc_elementwise` for expressions applied to each number of a list,
       - `_calc_with_city_temperatures` for expressions on per-city temperatures,
       - `_calc_with_numbers` for operations on numeric lists,
       - `_calc_with_last_result` for expressions applied to the last result.
@@ -123,7 +164,9 @@ def handle_calc(args: CalcArgs, intermediate_values: IntermediateValues) -> Calc
         expr: Union[str, None] = args.expr
         temp_val_dict: Dict[str, float] = intermediate_values.get("temperature", {})
         
-        if expr and temp_val_dict:
+        if numbers and expr:
+            return _calc_elementwise(numbers, expr, intermediate_values)
+        elif expr and temp_val_dict:
             return _calc_with_city_temperatures(expr, temp_val_dict, intermediate_values)
         elif numbers and operation:
             return _calc_with_numbers(numbers, operation, intermediate_values)
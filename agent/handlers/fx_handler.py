@@ -1,13 +1,73 @@
-from typing import Dict
+import asyncio
+from typing import Dict, List, Optional, Union
 from .. import tools
 from utils.logger import get_logger
 from ..types.plan_types import FxResultType
 from ..types.tool_types import FXArgs, IntermediateValues
-from typeguard import typechecked
+from utils.type_checking import typechecked
 from utils.latency_tracker import track_latency
+from ..plan_graph import declares_state
 
 logger = get_logger(__name__)
 
+def _resolve_amount(args: FXArgs, intermediate_values: IntermediateValues) -> Optional[float]:
+    """
+    Return the amount to convert, falling back to `last_calc_result` when `amount` is not provided.
+
+    Args:
+        args (FXArgs): FX step arguments.
+        intermediate_values (IntermediateValues): Shared state across tool executions.
+
+    Returns:
+        Optional[float]: The amount, or None if neither source provides one.
+    """
+
+    amount: Optional[float] = args.amount
+
+    # Fallback to last_calc_result if amount not provided
+    if amount is None:
+        last_value = intermediate_values.get("last_calc_result")
+        if isinstance(last_value, (int, float)):
+            amount = float(last_value)
+        elif isinstance(last_value, dict):
+            # Take first value if last_calc_result is a dict
+            amount = next(iter(last_value.values()))
+        logger.info("Using last_calc_result as amount: %s", amount)
+
+    return amount
+
+
+def _convert_amounts(args: FXArgs, intermediate_values: IntermediateValues) -> FxResultType:
+    """
+    Convert every amount of a bulk step with one `fx_convert_many` call.
+
+    Args:
+        args (FXArgs): FX step arguments with `amounts` set.
+        intermediate_values (IntermediateValues): Shared state; the converted list is stored as 'last_fx_result'.
+
+    Returns:
+        FxResultType: The single result for one amount, otherwise the results joined as "9.1, 18.2".
+
+    Raises:
+        ValueError: If a currency is missing.
+    """
+
+    if args.from_currency is None or args.to_currency is None:
+        raise ValueError("Missing required FX parameters")
+
+    results: List[float] = tools.fx_convert_many(args.amounts, args.from_currency, args.to_currency, args.date)
+    intermediate_values["last_fx_result"] = results
+
+    logger.info("FX bulk conversion results: %s %s -> %s = %s", args.amounts, args.from_currency, args.to_currency, results)
+    if len(results) == 1:
+        return results[0]
+    return ", ".join(str(result) for result in results)
+
+
+@declares_state(
+    reads=lambda args: {"last_calc_result"} if args.amount is None and args.amounts is None else set(),
+    writes={"last_fx_result"},
+)
 @track_latency(__name__)
 @typechecked
 def handle_fx(args: FXArgs, intermediate_values: IntermediateValues) -> FxResultType:
@@ -16,14 +76,15 @@ def handle_fx(args: FXArgs, intermediate_values: IntermediateValues) -> FxResult
 
     If `amount` is not provided, the function attempts to use the last calculation
     result from `intermediate_values`. The result is stored in `intermediate_values`
-    under the key 'last_fx_result'.
+    under the key 'last_fx_result'. A bulk step (`amounts`) converts every amount
+    in one batched call instead. With a `date`, the rates as of that date are used.
 
     Args:
-        args (FXArgs): Input arguments containing 'amount', 'from_currency', and 'to_currency'.
+        args (FXArgs): Input arguments containing 'amount', 'from_currency', 'to_currency' and optionally 'date'.
         intermediate_values (IntermediateValues): Dictionary holding intermediate results from previous computations.
 
     Returns:
-        FxResultType: The converted amount as a float.
+        FxResultType: The converted amount as a float, or the converted amounts of a bulk step joined as "9.1, 18.2".
 
     Raises:
         ValueError: If required parameters (amount, from_currency, to_currency) are missing.
@@ -33,24 +94,17 @@ def handle_fx(args: FXArgs, intermediate_values: IntermediateValues) -> FxResult
     logger.info("handle_fx called with args: %s", args.model_dump())
 
     try:
-        amount: float | None = args.amount
+        if args.amounts is not None:
+            return _convert_amounts(args, intermediate_values)
+
+        amount: float | None = _resolve_amount(args, intermediate_values)
         from_currency: str | None = args.from_currency
         to_currency: str | None = args.to_currency
 
-        # Fallback to last_calc_result if amount not provided
-        if amount is None:
-            last_value = intermediate_values.get("last_calc_result")
-            if isinstance(last_value, (int, float)):
-                amount = float(last_value)
-            elif isinstance(last_value, dict):
-                # Take first value if last_calc_result is a dict
-                amount = next(iter(last_value.values()))
-            logger.info("Using last_calc_result as amount: %s", amount)
-
         if amount is None or from_currency is None or to_currency is None:
             raise ValueError("Missing required FX parameters")
 
-        result: float = tools.fx_convert(amount, from_currency, to_currency)
+        result: float = tools.fx_convert(amount, from_currency, to_currency, args.date)
         logger.info(
             "FX conversion result: %s %s -> %s = %s", amount, from_currency, to_currency, result
         )
@@ -65,3 +119,112 @@ def handle_fx(args: FXArgs, intermediate_values: IntermediateValues) -> FxResult
             intermediate_values,
         )
         raise
+
+
+@track_latency(__name__)
+@typechecked
+def handle_fx_many(args_list: List[FXArgs], intermediate_values_list: List[IntermediateValues]) -> List[Union[FxResultType, Exception]]:
+    """
+    Perform the FX conversions of a batch of steps with one `fx_convert_many` call.
+
+    Args:
+        args_list (List[FXArgs]): Args of each step.
+        intermediate_values_list (List[IntermediateValues]): Shared state of the plan each step belongs to.
+
+    Returns:
+        List[Union[FxResultType, Exception]]: What `handle_fx` returns for each step, in order,
+            or the ValueError it would have raised for missing parameters or an invalid
+            date. Steps are converted with one call per date; bulk steps with one call each.
+    """
+
+    logger.info("handle_fx_many called with %d steps", len(args_list))
+
+    results: List[Union[FxResultType, Exception]] = [0.0] * len(args_list)
+    # Steps to convert and their amounts, per rate date
+    pending: Dict[Optional[str], List[int]] = {}
+    amounts: Dict[Optional[str], List[float]] = {}
+
+    for i, args in enumerate(args_list):
+        if args.amounts is not None:
+            try:
+                results[i] = _convert_amounts(args, intermediate_values_list[i])
+            except ValueError as error:
+                logger.error("FX conversion failed for args: %s", args.model_dump())
+                results[i] = error
+            continue
+
+        amount: Optional[float] = _resolve_amount(args, intermediate_values_list[i])
+
+        if amount is None or args.from_currency is None or args.to_currency is None:
+            logger.error("Missing required FX parameters for args: %s", args.model_dump())
+            results[i] = ValueError("Missing required FX parameters")
+            continue
+
+        pending.setdefault(args.date, []).append(i)
+        amounts.setdefault(args.date, []).append(amount)
+
+    for on, indexes in pending.items():
+        try:
+            converted: List[float] = tools.fx_convert_many(
+                amounts[on],
+                [args_list[i].from_currency for i in indexes],
+                [args_list[i].to_currency for i in indexes],
+                on,
+            )
+        except ValueError as error:
+            logger.error("FX conversion failed for date %s", on)
+            for i in indexes:
+                results[i] = error
+            continue
+
+        for i, result in zip(indexes, converted):
+            intermediate_values_list[i]["last_fx_result"] = result
+            results[i] = result
+
+    return results
+
+
+@track_latency(__name__)
+@typechecked
+async def handle_fx_async(args: FXArgs, intermediate_values: IntermediateValues) -> FxResultType:
+    """
+    Async variant of `handle_fx`: the conversion runs in a worker thread.
+
+    Args:
+        args (FXArgs): Input arguments containing 'amount', 'from_currency', 'to_currency' and optionally 'date'.
+        intermediate_values (IntermediateValues): Dictionary holding intermediate results from previous computations.
+
+    Returns:
+        FxResultType: Same result as `handle_fx`.
+
+    Raises:
+        ValueError: If required parameters (amount, from_currency, to_currency) are missing.
+        Exception: Any exception raised by `tools.fx_convert` is propagated after logging.
+    """
+
+    logger.info("handle_fx_async called with args: %s", args.model_dump())
+
+    try:
+        if args.amounts is not None:
+            return await asyncio.to_thread(_convert_amounts, args, intermediate_values)
+
+        amount: float | None = _resolve_amount(args, intermediate_values)
+
+        if amount is None or args.from_currency is None or args.to_currency is None:
+            raise ValueError("Missing required FX parameters")
+
+        result: float = await asyncio.to_thread(tools.fx_convert, amount, args.from_currency, args.to_currency, args.date)
+        logger.info(
+            "FX conversion result: %s %s -> %s = %s", amount, args.from_currency, args.to_currency, result
+        )
+
+        intermediate_values["last_fx_result"] = result
+        return result
+
+    except Exception:
+        logger.exception(
+            "Error in handle_fx_async with args: %s and intermediate_values: %s",
+            args.model_dump(),
+            intermediate_values,
+        )
+        raise
@@ -1,20 +1,26 @@
-from typing import Optional
+import asyncio
+from typing import List, Optional
 from .. import tools
 from utils.logger import get_logger
 from ..types.tool_types import KBArgs, IntermediateValues
-from typeguard import typechecked
+from utils.type_checking import typechecked
 from utils.latency_tracker import track_latency
+from ..plan_graph import declares_state
 
 logger = get_logger(__name__)
 
+@declares_state(writes={"last_kb_result"})
 @track_latency(__name__)
 @typechecked
 def handle_kb(args: KBArgs, intermediate_values: IntermediateValues) -> Optional[str]:
     """
     Perform a knowledge-base lookup using the provided query.
 
+    With `search` set, the query is searched for in the entry summaries
+    instead of matched against the entry names.
+
     Args:
-        args (KBArgs): Model containing the query string `q`.
+        args (KBArgs): Model containing the query string `q` and the `search` flag.
         intermediate_values (IntermediateValues): Dictionary to store intermediate results.
 
     Returns:
@@ -33,7 +39,7 @@ def handle_kb(args: KBArgs, intermediate_values: IntermediateValues) -> Optional
             logger.warning("handle_kb called without 'q' argument")
             return None
 
-        result: str = tools.kb_lookup(q_text)
+        result: str = tools.kb_search(q_text) if args.search else tools.kb_lookup(q_text)
         logger.info("handle_kb result for query '%s': %s", q_text, result)
 
         intermediate_values["last_kb_result"] = result
@@ -44,3 +50,76 @@ def handle_kb(args: KBArgs, intermediate_values: IntermediateValues) -> Optional
             "Error in handle_kb with args: %s and intermediate_values: %s", args, intermediate_values
         )
         raise
+
+
+@track_latency(__name__)
+@typechecked
+def handle_kb_many(args_list: List[KBArgs], intermediate_values_list: List[IntermediateValues]) -> List[Optional[str]]:
+    """
+    Perform the knowledge-base lookups of a batch of steps with one `kb_lookup_many` call.
+
+    Full-text search steps are searched one by one.
+
+    Args:
+        args_list (List[KBArgs]): Args of each step.
+        intermediate_values_list (List[IntermediateValues]): Shared state of the plan each step belongs to.
+
+    Returns:
+        List[Optional[str]]: What `handle_kb` returns for each step, in order.
+    """
+
+    logger.info("handle_kb_many called with %d steps", len(args_list))
+
+    results: List[Optional[str]] = [None] * len(args_list)
+    pending: List[int] = [i for i, args in enumerate(args_list) if args.q]
+    if len(pending) < len(args_list):
+        logger.warning("handle_kb_many called with %d steps without 'q' argument", len(args_list) - len(pending))
+
+    searches: List[int] = [i for i in pending if args_list[i].search]
+    lookups: List[int] = [i for i in pending if not args_list[i].search]
+    summaries: List[str] = tools.kb_lookup_many([args_list[i].q for i in lookups])
+    summaries.extend(tools.kb_search(args_list[i].q) for i in searches)
+    for i, summary in zip(lookups + searches, summaries):
+        intermediate_values_list[i]["last_kb_result"] = summary
+        results[i] = summary
+
+    return results
+
+
+@track_latency(__name__)
+@typechecked
+async def handle_kb_async(args: KBArgs, intermediate_values: IntermediateValues) -> Optional[str]:
+    """
+    Async variant of `handle_kb`: the lookup runs in a worker thread.
+
+    Args:
+        args (KBArgs): Model containing the query string `q` and the `search` flag.
+        intermediate_values (IntermediateValues): Dictionary to store intermediate results.
+
+    Returns:
+        Optional[str]: Same result as `handle_kb`.
+
+    Raises:
+        Exception: Propagates any unexpected errors during lookup.
+    """
+
+    logger.info("handle_kb_async called with args: %s", args)
+
+    try:
+        q_text: str = args.q
+
+        if not q_text:
+            logger.warning("handle_kb_async called without 'q' argument")
+            return None
+
+        result: str = await asyncio.to_thread(tools.kb_search if args.search else tools.kb_lookup, q_text)
+        logger.info("handle_kb_async result for query '%s': %s", q_text, result)
+
+        intermediate_values["last_kb_result"] = result
+        return result
+
+    except Exception:
+        logger.exception(
+            "Error in handle_kb_async with args: %s and intermediate_values: %s", args, intermediate_values
+        )
+        raise
@@ -1,15 +1,54 @@
-import re
-from typing import Optional, List
+import asyncio
+from typing import Optional, List, Tuple, Union
 from .. import tools
 from utils.logger import get_logger
 from ..types.plan_types import TempResultType
 from constants.regex_constants import NUMERIC_TEMPERATURE_PATTERN
 from ..types.tool_types import TempArgs, IntermediateValues
-from typeguard import typechecked
+from utils.type_checking import typechecked
 from utils.latency_tracker import track_latency
+from ..plan_graph import declares_state
 
 logger = get_logger(__name__)
 
+def _record_temperature(result: TempResultType, intermediate_values: IntermediateValues) -> Optional[TempResultType]:
+    """
+    Store a temperature lookup result as numbers in the shared state.
+
+    Args:
+        result (TempResultType): Result of `tools.temp`.
+        intermediate_values (IntermediateValues): Shared state across tool executions.
+
+    Returns:
+        Optional[TempResultType]: The handler's return value for the result.
+    """
+
+    temperature: TempResultType
+
+    if isinstance(result, dict):
+        cleaned_result = {k: float(str(v).replace("°C", "")) for k, v in result.items()}
+        intermediate_values["temperature"] = cleaned_result
+
+        if len(result) == 1:
+            temperature = list(result.values())[0]
+            logger.info("handle_calc result: %s", temperature)
+            return f"{temperature}"
+
+    elif isinstance(result, str):
+        match = NUMERIC_TEMPERATURE_PATTERN.search(result)
+
+        if match:
+            temperature = float(match.group())
+        else:
+            temperature = None
+        intermediate_values["temperature"] = temperature
+    else:
+        intermediate_values["temperature"] = result
+
+    return result
+
+
+@declares_state(writes={"temperature"})
 @track_latency(__name__)
 @typechecked
 def handle_temp(
@@ -35,42 +74,18 @@ def handle_temp(
     try:
         cities: List[str] = args.cities
         operation: str = args.operation
-        temperature: TempResultType
 
         if not cities:
             logger.warning("handle_temp called with empty cities list")
             return None
 
         result: TempResultType = tools.temp(cities, operation)
-
-        if isinstance(result, dict):
-
-            cleaned_result = {k: float(str(v).replace("°C", "")) for k, v in result.items()}
-            intermediate_values["temperature"] = cleaned_result
-
-            if len(result) == 1:
-                temperature = list(result.values())[0]
-                logger.info("handle_calc result: %s", temperature)
-                return f"{temperature}"
-        
-            
-        elif isinstance(result, str):
-            match = re.search(NUMERIC_TEMPERATURE_PATTERN, result)
-
-            if match:
-                temperature = float(match.group())
-            else:
-                temperature = None
-            intermediate_values["temperature"] = temperature
-        else:
-            intermediate_values["temperature"] = result
-
         logger.info(
             "handle_temp result for cities %s with operation '%s': %s",
             cities, operation, result
         )
-        
-        return result
+
+        return _record_temperature(result, intermediate_values)
 
     except Exception:
         logger.exception(
@@ -78,3 +93,81 @@ def handle_temp(
             args.model_dump(), intermediate_values
         )
         raise
+
+
+@track_latency(__name__)
+@typechecked
+def handle_temp_many(args_list: List[TempArgs], intermediate_values_list: List[IntermediateValues]) -> List[Union[TempResultType, Exception]]:
+    """
+    Handle the temperature requests of a batch of steps with one `temp_many` call.
+
+    Args:
+        args_list (List[TempArgs]): Args of each step.
+        intermediate_values_list (List[IntermediateValues]): Shared state of the plan each step belongs to.
+
+    Returns:
+        List[Union[TempResultType, Exception]]: What `handle_temp` returns for each step, in order,
+            or the exception it would have raised.
+    """
+
+    logger.info("handle_temp_many called with %d steps", len(args_list))
+
+    results: List[Union[TempResultType, Exception]] = [None] * len(args_list)
+    pending: List[int] = [i for i, args in enumerate(args_list) if args.cities]
+    if len(pending) < len(args_list):
+        logger.warning("handle_temp_many called with %d empty cities lists", len(args_list) - len(pending))
+
+    requests: List[Tuple[List[str], str]] = [(args_list[i].cities, args_list[i].operation) for i in pending]
+    for i, result in zip(pending, tools.temp_many(requests)):
+        try:
+            results[i] = _record_temperature(result, intermediate_values_list[i])
+        except Exception as e:
+            logger.exception("Error in handle_temp_many for args: %s", args_list[i].model_dump())
+            results[i] = e
+
+    return results
+
+
+@track_latency(__name__)
+@typechecked
+async def handle_temp_async(
+    args: TempArgs,
+    intermediate_values: IntermediateValues
+) -> Optional[TempResultType]:
+    """
+    Async variant of `handle_temp`: the temperature lookup runs in a worker thread.
+
+    Args:
+        args (TempArgs): Contains the list of cities and the operation.
+        intermediate_values (IntermediateValues): Shared state across tool executions.
+
+    Returns:
+        Optional[TempResultType]: Same result as `handle_temp`.
+
+    Raises:
+        Exception: If the temperature lookup or processing fails.
+    """
+
+    logger.info("handle_temp_async called with args: %s", args.model_dump())
+
+    try:
+        cities: List[str] = args.cities
+
+        if not cities:
+            logger.warning("handle_temp_async called with empty cities list")
+            return None
+
+        result: TempResultType = await asyncio.to_thread(tools.temp, cities, args.operation)
+        logger.info(
+            "handle_temp_async result for cities %s with operation '%s': %s",
+            cities, args.operation, result
+        )
+
+        return _record_temperature(result, intermediate_values)
+
+    except Exception:
+        logger.exception(
+            "Error in handle_temp_async with args: %s and intermediate_values: %s",
+            args.model_dump(), intermediate_values
+        )
+        raise
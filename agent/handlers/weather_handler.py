@@ -1,13 +1,33 @@
+import asyncio
 from typing import Optional, Dict, List
 from .. import tools
 from utils.logger import get_logger
 from ..types.tool_types import WeatherArgs, IntermediateValues
 from ..types.plan_types import WeatherResultType
-from typeguard import typechecked
+from utils.type_checking import typechecked
 from utils.latency_tracker import track_latency
+from ..plan_graph import declares_state
 
 logger = get_logger(__name__)
 
+def _weather_result(cities: List[str], descriptions: List[str]) -> WeatherResultType:
+    """
+    Shape the descriptions of a step's cities into the handler result.
+
+    Args:
+        cities (List[str]): Cities of the step.
+        descriptions (List[str]): Description per city, in order.
+
+    Returns:
+        WeatherResultType: Single string for one city, otherwise a dict keyed by title-cased city.
+    """
+
+    if len(cities) == 1:
+        return descriptions[0]
+    return {city.title(): description for city, description in zip(cities, descriptions)}
+
+
+@declares_state(writes={"weather"})
 @track_latency(__name__)
 @typechecked
 def handle_weather(
@@ -37,10 +57,7 @@ def handle_weather(
             logger.warning("handle_weather called with empty cities list")
             return None
 
-        if len(cities) == 1:
-            result: str = tools.weather(cities[0])
-        else:
-            result: Dict[str, str] = {city.title(): tools.weather(city) for city in cities}
+        result: WeatherResultType = _weather_result(cities, [tools.weather(city) for city in cities])
 
         intermediate_values["weather"] = result
         logger.info("handle_weather result for cities %s: %s", cities, result)
@@ -53,3 +70,86 @@ def handle_weather(
             args.model_dump(), intermediate_values
         )
         raise
+
+
+@track_latency(__name__)
+@typechecked
+def handle_weather_many(args_list: List[WeatherArgs], intermediate_values_list: List[IntermediateValues]) -> List[Optional[WeatherResultType]]:
+    """
+    Handle the weather requests of a batch of steps with one `weather_many` call.
+
+    Args:
+        args_list (List[WeatherArgs]): Args of each step.
+        intermediate_values_list (List[IntermediateValues]): Shared state of the plan each step belongs to.
+
+    Returns:
+        List[Optional[WeatherResultType]]: What `handle_weather` returns for each step, in order.
+    """
+
+    logger.info("handle_weather_many called with %d steps", len(args_list))
+
+    pending: List[int] = [i for i, args in enumerate(args_list) if args.cities]
+    if len(pending) < len(args_list):
+        logger.warning("handle_weather_many called with %d empty cities lists", len(args_list) - len(pending))
+
+    # Flatten every city of the batch into one lookup, then split it back per step
+    descriptions: List[str] = tools.weather_many([city for i in pending for city in args_list[i].cities])
+    results: List[Optional[WeatherResultType]] = [None] * len(args_list)
+    offset: int = 0
+
+    for i in pending:
+        cities: List[str] = args_list[i].cities
+        result: WeatherResultType = _weather_result(cities, descriptions[offset:offset + len(cities)])
+        offset += len(cities)
+
+        intermediate_values_list[i]["weather"] = result
+        results[i] = result
+
+    return results
+
+
+@track_latency(__name__)
+@typechecked
+async def handle_weather_async(
+    args: WeatherArgs,
+    intermediate_values: IntermediateValues
+) -> Optional[WeatherResultType]:
+    """
+    Async variant of `handle_weather`: every city is looked up concurrently in a worker thread.
+
+    Args:
+        args (WeatherArgs): Arguments containing the 'cities' list.
+        intermediate_values (IntermediateValues): Dictionary for storing intermediate results.
+
+    Returns:
+        Optional[WeatherResultType]: Same result as `handle_weather`.
+
+    Raises:
+        Exception: Propagates any exception raised during weather lookup or processing.
+    """
+
+    logger.info("handle_weather_async called with args: %s", args.model_dump())
+
+    try:
+        cities: List[str] = args.cities
+
+        if not cities:
+            logger.warning("handle_weather_async called with empty cities list")
+            return None
+
+        descriptions: List[str] = list(
+            await asyncio.gather(*(asyncio.to_thread(tools.weather, city) for city in cities))
+        )
+        result: WeatherResultType = _weather_result(cities, descriptions)
+
+        intermediate_values["weather"] = result
+        logger.info("handle_weather_async result for cities %s: %s", cities, result)
+
+        return result
+
+    except Exception:
+        logger.exception(
+            "Error in handle_weather_async with args: %s and intermediate_values: %s",
+            args.model_dump(), intermediate_values
+        )
+        raise
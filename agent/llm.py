@@ -1,61 +1,70 @@
-from typing import List
-from pydantic import ValidationError
-from constants.miscellaneous_constants import FX_TOOL
-from constants.tool_constants import PARSERS, TOOL_MODELS
-from .types.plan_types import PlanStepModel
+from typing import Dict, List, Optional
+from constants.miscellaneous_constants import FX_TOOL, KB_TOOL
+from config.settings import PLAN_CACHE_MAX_ENTRIES, PLAN_CACHE_MAX_BYTES, PLAN_CACHE_TTL_SECONDS
+from constants.tool_constants import PARSERS, TOOL_MODELS, PARSER_TRIGGERS
+from .dispatcher import IntentDispatcher
+from .plan_cache import PlanCache, normalize_prompt
+from .plan_templates import PlanSkeleton, build_skeleton, fill_skeleton, mask_numbers
+from .types.plan_types import PlanStep, PlanStepsListType, plan_step
 from utils.logger import get_logger
-from typeguard import typechecked
+from utils.type_checking import typechecked
 from utils.latency_tracker import track_latency
 
 logger = get_logger(__name__)
 
+# Compiled once; decides which parsers can produce steps for a prompt
+DISPATCHER: IntentDispatcher = IntentDispatcher(PARSER_TRIGGERS)
 
-@track_latency(__name__)
-@typechecked
-def call_llm(prompt: str) -> List[PlanStepModel]:
+
+def _registry_version() -> tuple:
+    """Identity of the registered parsers and args models; cached plans are only valid for one version."""
+
+    return (
+        tuple((name, id(parser)) for name, parser in PARSERS.items()),
+        tuple((name, id(model)) for name, model in TOOL_MODELS.items()),
+    )
+
+
+# Validated plans keyed by normalized prompt
+PLAN_CACHE: PlanCache = PlanCache(
+    max_entries=PLAN_CACHE_MAX_ENTRIES,
+    max_bytes=PLAN_CACHE_MAX_BYTES,
+    ttl_seconds=PLAN_CACHE_TTL_SECONDS,
+    version=_registry_version,
+)
+
+# Plan skeletons keyed by prompt shape (digits of standalone numeric literals masked)
+TEMPLATE_CACHE: PlanCache = PlanCache(
+    max_entries=PLAN_CACHE_MAX_ENTRIES,
+    max_bytes=PLAN_CACHE_MAX_BYTES,
+    ttl_seconds=PLAN_CACHE_TTL_SECONDS,
+    version=_registry_version,
+)
+
+def _parse_plan(p: str) -> List[PlanStep]:
     """
-    Parse a prompt into a sequence of tool execution steps.
+    Run the triggered parsers over a normalized prompt and combine their steps.
 
-    The prompt is processed by multiple parsers, each producing candidate
-    tool steps. Parsed steps are validated against their Pydantic models 
-    and combined into a final plan.
+    A KB full-text search is kept only when it is the whole plan.
 
     Args:
-        prompt (str): Input query or instruction.
+        p (str): Normalized prompt.
 
     Returns:
-        List[PlanStepModel]: Validated plan steps ready for execution.
-
-    Raises:
-        ValueError: If a step has no corresponding args model.
-        ValidationError: If a step's arguments fail Pydantic validation.
-        Exception: If any parser fails unexpectedly.
+        List[PlanStep]: Plan steps as produced by the parsers.
     """
 
-    p: str = prompt.lower()
-    logger.info("Received LLM prompt: %s", p)
-
-    tools: List[PlanStepModel] = []
+    tools: List[PlanStep] = []
+    triggered = DISPATCHER.dispatch(p)
 
     for name, parser in PARSERS.items():
+        if name in PARSER_TRIGGERS and name not in triggered:
+            continue
+
         try:
-            result_dicts: List[dict] = parser(p)
-
-            # Converting dictionaries to Pydantic models with the correct args type
-            result: List[PlanStepModel] = []
-            for step_dict in result_dicts:
-                tool_name: str = step_dict["tool"]
-                args_model = TOOL_MODELS.get(tool_name)
-
-                if not args_model:
-                    raise ValueError(f"No args model defined for tool {tool_name}")
-            
-                try:
-                    parsed_args = args_model.model_validate(step_dict.get("args", {}))
-                    result.append(PlanStepModel(tool=tool_name, args=parsed_args))
-                except ValidationError as e:
-                    logger.error("ValidationError: %s", e)
-                
+            # Parsers hand back trusted steps whose args were validated on construction
+            result: PlanStepsListType = parser(p)
+
             if result:
                 # Currency parser replaces tools
                 if name == FX_TOOL:
@@ -67,5 +76,94 @@ def call_llm(prompt: str) -> List[PlanStepModel]:
         except Exception:
             logger.exception("Error parsing %s tools", name)
 
+    # KB full-text searches only answer questions that no other parser understood
+    others: List[PlanStep] = [step for step in tools if not (step.tool == KB_TOOL and step.args.search)]
+    if others and len(others) < len(tools):
+        logger.info("Dropped KB searches from a plan with other steps: %s", tools)
+        return others
+    return tools
+
+
+def _plan_from_template(masked: str, literals: List[str]) -> Optional[List[PlanStep]]:
+    """
+    Build a plan from the cached skeleton of the prompt's numeric shape.
+
+    Args:
+        masked (str): Prompt with its numeric literals masked.
+        literals (List[str]): The masked literals in order of appearance.
+
+    Returns:
+        Optional[List[PlanStep]]: The filled plan, or None if no template applies.
+    """
+
+    skeleton: Optional[PlanSkeleton] = TEMPLATE_CACHE.get(masked)
+    if skeleton is None:
+        return None
+
+    try:
+        return [
+            plan_step(tool_name, TOOL_MODELS[tool_name].model_validate(args))
+            for tool_name, args in fill_skeleton(skeleton, literals)
+        ]
+    except (KeyError, ValueError, IndexError):
+        logger.warning("Plan template for %r did not apply; falling back to parsers", masked, exc_info=True)
+        return None
+
+
+def plan_cache_stats() -> Dict[str, Dict[str, float]]:
+    """
+    Return the counters of the exact-prompt plan cache and the template cache.
+
+    Returns:
+        Dict[str, Dict[str, float]]: Stats keyed by "plans" and "templates".
+    """
+
+    return {"plans": PLAN_CACHE.stats(), "templates": TEMPLATE_CACHE.stats()}
+
+
+@track_latency(__name__)
+@typechecked
+def call_llm(prompt: str) -> List[PlanStep]:
+    """
+    Parse a prompt into a sequence of tool execution steps.
+
+    The prompt is normalized and looked up in the plan cache first. On a miss,
+    prompts that only differ in their numbers reuse the plan template of their
+    shape. Otherwise the prompt is scanned once by the intent dispatcher and
+    only the parsers whose trigger tokens occur in it are run, each producing
+    candidate tool steps. Parsers validate step args once when building them;
+    the steps are combined into the final plan without re-validation.
+
+    Args:
+        prompt (str): Input query or instruction.
+
+    Returns:
+        List[PlanStep]: Validated plan steps ready for execution.
+
+    Raises:
+        Exception: If any parser fails unexpectedly.
+    """
+
+    p: str = normalize_prompt(prompt)
+    logger.info("Received LLM prompt: %s", p)
+
+    cached_plan = PLAN_CACHE.get(p)
+    if cached_plan is not None:
+        logger.info("Plan cache hit: %s", cached_plan)
+        return list(cached_plan)
+
+    masked, literals = mask_numbers(p)
+    tools: Optional[List[PlanStep]] = _plan_from_template(masked, literals) if literals else None
+
+    if tools is not None:
+        logger.info("Plan template hit for %r", masked)
+    else:
+        tools = _parse_plan(p)
+        if literals:
+            skeleton: Optional[PlanSkeleton] = build_skeleton(tools, literals)
+            if skeleton is not None:
+                TEMPLATE_CACHE.put(masked, skeleton)
+
     logger.info("Final tools plan: %s", tools)
+    PLAN_CACHE.put(p, tuple(tools))
     return tools
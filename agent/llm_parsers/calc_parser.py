@@ -1,79 +1,291 @@
-import re
-from typing import List, Dict
+from typing import List, Optional, Tuple
 from utils.logger import get_logger
-from constants.regex_constants import BINARY_PATTERN, IMPERATIVE_PATTERN, PERCENT_PATTERN
-from constants.miscellaneous_constants import WORD_OPS, CALC_TOOL
-from ..types.plan_types import PlanStepsListType
+from constants.regex_constants import CALC_PROMPT_TOKEN_PATTERN
+from constants.miscellaneous_constants import (
+    CALC_TOOL, ELEMENTWISE_BY_OPS, ELEMENTWISE_OPS, ELEMENTWISE_PREPOSITIONS, ELEMENTWISE_QUANTIFIERS, WORD_OPS,
+)
+from ..types.plan_types import PlanStepsListType, plan_step
 from ..types.tool_types import CalcArgs
-from typeguard import typechecked
+from utils.type_checking import typechecked
 from utils.latency_tracker import track_latency
 
 logger = get_logger(__name__)
 
-def _parse_percent(prompt: str) -> List[Dict]:
+# Fields of a token: the whitespace before it, then exactly one non-empty text field
+_SPACE, _NUMBER, _OP, _WORD, _PERCENT, _SYMBOL, _OTHER = range(7)
+
+# A token as produced by the lexer: (space, number, op word, word, percent, symbol, other)
+Token = Tuple[str, str, str, str, str, str, str]
+
+
+def _tokenize(prompt: str) -> List[Token]:
     """
-    Parse percentage expressions like '10% of 50' in the prompt.
+    Split a prompt into number, operator word, word, percent, symbol and other tokens in one scan.
 
     Args:
-        prompt (str): The user input containing percentage expressions.
+        prompt (str): The user input.
 
     Returns:
-        List[Dict]: A list of tool steps for percentage calculations.
+        List[Token]: Tokens in order, each carrying the whitespace before it.
     """
 
-    tools: List[Dict] = []
+    return CALC_PROMPT_TOKEN_PATTERN.findall(prompt)
 
-    for num, val in re.findall(PERCENT_PATTERN, prompt):
-        expr = f"{num}% of {val}"
-        tools.append({"tool": CALC_TOOL, "args": CalcArgs(expr=expr).model_dump()})
-        logger.debug("Matched percent expression: %s", expr)
-    return tools
 
+class _CalcGrammar:
+    """
+    Recognizers for the calc phrases over a token stream.
 
-def _parse_binary(prompt: str) -> List[Dict]:
+    Each `match_*` method tries to read one phrase starting at a token index
+    and returns the calc expression (or args) with the index after the
+    phrase, or None. Operands are numbers with an optional unit glued to
+    them ("10usd"), read as far as they go.
     """
-    Parse binary expressions in the prompt, using either symbols (e.g., +, -, *, /)
-    or word operators (e.g., 'plus', 'minus').
 
-    Args:
-        prompt (str): The user input containing binary expressions.
+    def __init__(self, tokens: List[Token]):
+        self.tokens = tokens
+        self.size = len(tokens)
 
-    Returns:
-        List[Dict]: A list of tool steps for binary calculations.
-    """
-    
-    tools: List[Dict] = []
-
-    for n1, op, n2 in re.findall(BINARY_PATTERN, prompt, re.IGNORECASE):
-        expr_op = WORD_OPS.get(op.lower(), op)  # Converting word operator to symbol
-        expr = f"{n1} {expr_op} {n2}"
-        tools.append({"tool": CALC_TOOL, "args": CalcArgs(expr=expr).model_dump()})
-        logger.debug("Matched binary expression: %s", expr)
-    return tools
+    def word(self, i: int) -> str:
+        """Lowercased word at i, or "" if token i is not a word."""
+
+        if i >= self.size:
+            return ""
+        token: Token = self.tokens[i]
+        return (token[_OP] or token[_WORD]).lower()
+
+    def number(self, i: int) -> str:
+        return self.tokens[i][_NUMBER] if i < self.size else ""
+
+    def adjacent(self, i: int) -> bool:
+        """Whether token i directly follows token i - 1, with no whitespace between."""
+
+        return 0 < i < self.size and not self.tokens[i][_SPACE]
+
+    def spaced(self, start: int, end: int) -> bool:
+        """Whether tokens start..end - 1 each follow whitespace."""
+
+        return not any(self.adjacent(k) for k in range(start, min(end, self.size)))
+
+    def text(self, start: int, end: int) -> str:
+        """Text of the adjacent tokens start..end - 1."""
+
+        return "".join("".join(token[_NUMBER:]) for token in self.tokens[start:end])
+
+    def bounded(self, i: int) -> bool:
+        """Whether token i is a whole word (no word character touching it on either side)."""
+
+        if self.adjacent(i):
+            before: str = self.text(i - 1, i)[-1]
+            if before.isalnum() or before == "_":
+                return False
+        if self.adjacent(i + 1):
+            after: str = self.text(i + 1, i + 2)[0]
+            if after.isalnum() or after == "_":
+                return False
+        return True
+
+    def operand_end(self, i: int) -> int:
+        """End of the operand at token i (number plus glued unit), or 0 if there is none."""
+
+        if not self.number(i):
+            return 0
+        if self.adjacent(i + 1) and self.word(i + 1):
+            return i + 2
+        return i + 1
+
+    def match_percent(self, i: int) -> Optional[Tuple[str, int]]:
+        """'<operand> % of <value>', e.g. '12.5% of 243'; 'of' may be glued to a word value ("ofx")."""
+
+        end: int = self.operand_end(i)
+        if not end or end + 1 >= self.size or not self.tokens[end][_PERCENT] or not self.tokens[end + 1][_WORD].startswith("of"):
+            return None
+
+        value: str = self.tokens[end + 1][_WORD][2:]
+        value_end: int = end + 2
+        while value_end < self.size and (self.number(value_end) or self.word(value_end)) and (
+            self.adjacent(value_end) or not value and value_end == end + 2
+        ):
+            value += self.text(value_end, value_end + 1)
+            value_end += 1
+        if not value:
+            return None
+        return f"{self.text(i, end)}% of {value}", value_end
 
+    def match_binary(self, i: int) -> Optional[Tuple[str, int]]:
+        """
+        '<operand> <op> <operand>' with a symbol or operator word, e.g. '3 plus 1.5'.
 
-def _parse_imperative(prompt: str) -> List[Dict]:
+        An operator word may be glued to the end of the first operand's unit
+        ("10usdplus 5"); the longest unit followed by an operator wins.
+        """
+
+        if not self.number(i):
+            return None
+
+        # (first operand, index of the operator token, operator glued to the operand's unit)
+        readings: List[Tuple[str, int, str]] = [(self.tokens[i][_NUMBER], i + 1, "")]
+        if self.adjacent(i + 1) and self.word(i + 1):
+            unit: str = self.text(i + 1, i + 2)
+            readings = [(self.text(i, i + 2), i + 2, "")] + [
+                (self.tokens[i][_NUMBER] + unit[:cut], i + 2, unit[cut:].lower())
+                for cut in range(len(unit) - 1, -1, -1)
+                if unit[cut:].lower() in WORD_OPS
+            ]
+
+        for left, op_index, glued in readings:
+            if glued:
+                symbol: str = WORD_OPS[glued]
+                right: int = op_index
+            elif op_index < self.size and (self.tokens[op_index][_SYMBOL] or self.tokens[op_index][_OP]):
+                symbol = self.tokens[op_index][_SYMBOL] or WORD_OPS[self.word(op_index)]
+                right = op_index + 1
+            else:
+                continue
+            right_end: int = self.operand_end(right)
+            if right_end:
+                return f"{left} {symbol} {self.text(right, right_end)}", right_end
+        return None
+
+    def match_imperative(self, i: int) -> Optional[Tuple[str, int]]:
+        """'<op word> [by] <operand>', e.g. 'add 10' or 'divide by 2'."""
+
+        if not self.bounded(i):
+            return None
+        operand: int = i + 2 if self.word(i + 1) == "by" and self.operand_end(i + 2) else i + 1
+        end: int = self.operand_end(operand)
+        if not end:
+            return None
+        return f"{WORD_OPS[self.word(i)]} {self.text(operand, end)}", end
+
+    def match_number_list(self, i: int) -> Optional[Tuple[List[float], int]]:
+        """Numbers separated by commas and/or 'and', e.g. '1, 2 and 3'."""
+
+        if not self.number(i):
+            return None
+        texts: List[str] = [self.number(i)]
+        i += 1
+        while i < self.size:
+            j: int = i
+            if self.tokens[j][_OTHER] == ",":
+                j += 1
+                if self.word(j) == "and" and self.spaced(j + 1, j + 2):
+                    j += 1
+            elif self.word(j) == "and" and self.spaced(j, j + 2):
+                j += 1
+            if j == i or not self.number(j):
+                break
+            texts.append(self.number(j))
+            i = j + 1
+        try:
+            return [float(text) for text in texts], i
+        except ValueError:
+            return None
+
+    def match_elementwise(self, i: int) -> Optional[Tuple[CalcArgs, int]]:
+        """
+        Element-wise list operations: '<op> <n> to each of <numbers>' or
+        'multiply|divide [each of] <numbers> by <n>'.
+        """
+
+        op: str = self.word(i)
+        if op not in ELEMENTWISE_OPS or not self.bounded(i):
+            return None
+
+        if self.number(i + 1) and self.word(i + 2) in ELEMENTWISE_PREPOSITIONS and self.word(i + 3) in ELEMENTWISE_QUANTIFIERS:
+            start: int = i + 5 if self.word(i + 4) == "of" else i + 4
+            numbers = self.match_number_list(start) if self.spaced(i + 1, start + 1) else None
+            if numbers:
+                return CalcArgs(numbers=numbers[0], expr=f"{WORD_OPS[op]} {self.number(i + 1)}"), numbers[1]
+
+        if op in ELEMENTWISE_BY_OPS:
+            start = i + 3 if self.word(i + 1) == "each" and self.word(i + 2) == "of" else i + 1
+            numbers = self.match_number_list(start) if self.spaced(i + 1, start + 1) else None
+            if numbers and len(numbers[0]) > 1:
+                by: int = numbers[1]
+                if self.word(by) == "by" and self.number(by + 1) and self.spaced(by, by + 2):
+                    return CalcArgs(numbers=numbers[0], expr=f"{WORD_OPS[op]} {self.number(by + 1)}"), by + 2
+
+        return None
+
+
+def _parse_tokens(prompt: str) -> PlanStepsListType:
     """
-    Parse imperative expressions like 'add 5' in the prompt.
+    Build the calc steps of a prompt from its token stream.
+
+    The prompt is scanned once by the lexer; phrases are then matched only
+    at number and operator-word tokens, in linear time. Every phrase kind is matched independently (phrases of different kinds
+    may overlap), and within a kind matching resumes after the last match.
+    Element-wise list operations stand alone; otherwise percentage steps
+    come first, then binary steps, and imperative operations (joined into
+    one chained step) only when there is no binary expression.
 
     Args:
-        prompt (str): The user input containing imperative instructions.
+        prompt (str): The user input.
 
     Returns:
-        List[Dict]: A list of tool steps for imperative calculations.
+        PlanStepsListType: A list of calc tool steps.
     """
 
-    tools: List[Dict] = []
-    
-    expr_list: List[str] = []
-    for op, val in re.findall(IMPERATIVE_PATTERN, prompt, re.IGNORECASE):
-        expr_list.append(f"{WORD_OPS[op.lower()]} {val}")
-    if expr_list:
-        expr = " and ".join(expr_list)
-        tools.append({"tool": CALC_TOOL, "args": CalcArgs(expr=expr).model_dump()})
-        logger.debug("Matched imperative expression: %s", expr)
+    tokens: List[Token] = _tokenize(prompt)
+    grammar = _CalcGrammar(tokens)
+    last: int = len(tokens) - 1
+    numbers: List[int] = [i for i, token in enumerate(tokens) if token[_NUMBER]]
+    op_words: List[int] = [i for i, token in enumerate(tokens) if token[_OP]]
+
+    elementwise: PlanStepsListType = []
+    resume: int = 0
+    lowered: str = prompt.lower()
+    # Element-wise phrases need a quantifier ("each of") or "by"
+    list_ops: List[int] = op_words if any(word in lowered for word in ELEMENTWISE_QUANTIFIERS + ("by",)) else []
+    for i in list_ops:
+        # Both forms continue with a number or "each"
+        if i >= resume and i < last and (tokens[i + 1][_NUMBER] or tokens[i + 1][_WORD]):
+            match = grammar.match_elementwise(i)
+            if match:
+                elementwise.append(plan_step(CALC_TOOL, match[0]))
+                resume = match[1]
+    if elementwise:
+        logger.debug("Matched element-wise expressions: %s", elementwise)
+        return elementwise
+
+    tools: PlanStepsListType = []
+    binary: PlanStepsListType = []
+    percent_resume: int = 0
+    binary_resume: int = 0
+    for i in numbers:
+        if i == last:
+            break
+        following: Token = tokens[i + 1]
+        # A percent sign, operator or glued unit must follow the number
+        if i >= percent_resume and (following[_PERCENT] or ((following[_WORD] or following[_OP]) and not following[_SPACE])):
+            match = grammar.match_percent(i)
+            if match:
+                tools.append(plan_step(CALC_TOOL, CalcArgs(expr=match[0])))
+                percent_resume = match[1]
+        if i >= binary_resume and (following[_SYMBOL] or following[_OP] or (following[_WORD] and not following[_SPACE])):
+            match = grammar.match_binary(i)
+            if match:
+                binary.append(plan_step(CALC_TOOL, CalcArgs(expr=match[0])))
+                binary_resume = match[1]
+    tools.extend(binary)
+
+    if not binary:
+        imperative: List[str] = []
+        resume = 0
+        for i in op_words:
+            if i >= resume:
+                match = grammar.match_imperative(i)
+                if match:
+                    imperative.append(match[0])
+                    resume = match[1]
+        if imperative:
+            tools.append(plan_step(CALC_TOOL, CalcArgs(expr=" and ".join(imperative))))
+
+    logger.debug("Matched calc expressions: %s", tools)
     return tools
 
+
 @track_latency(__name__)
 @typechecked
 def parse_calc(prompt: str) -> PlanStepsListType:
@@ -84,7 +296,7 @@ def parse_calc(prompt: str) -> PlanStepsListType:
         prompt (str): User input containing arithmetic instructions.
 
     Returns:
-        PlanStepsListType: A list of dictionaries, each describing a calc tool step.
+        PlanStepsListType: A list of plan steps, each describing a calc tool step.
 
     Raises:
         Exception: If any unexpected error occurs during parsing.
@@ -92,17 +304,7 @@ def parse_calc(prompt: str) -> PlanStepsListType:
 
     logger.info("parse_calc called with prompt: %s", prompt)
     try:
-        tools: PlanStepsListType = []
-
-        tools.extend(_parse_percent(prompt)) # Parsing percentage expressions
-
-        
-        binary_tools = _parse_binary(prompt) # Parsing binary expressions (both words and symbols)
-        tools.extend(binary_tools)
-
-        if not binary_tools:
-            tools.extend(_parse_imperative(prompt)) # Parsing imperative expressions if no binary expression found
-
+        tools: PlanStepsListType = _parse_tokens(prompt)
         logger.info("parse_calc extracted tools: %s", tools)
         return tools
 
@@ -1,11 +1,10 @@
-import re
-from typing import List
+from typing import List, Optional
 from utils.logger import get_logger
 from constants.miscellaneous_constants import FX_TOOL, CALC_TOOL
-from constants.regex_constants import CURRENCY_OP_PATTERN
-from ..types.plan_types import PlanStepsListType
+from constants.regex_constants import AMOUNT_LITERAL_PATTERN, CURRENCY_OP_PATTERN, THOUSANDS_AMOUNT_PATTERN
+from ..types.plan_types import PlanStepsListType, plan_step
 from ..types.tool_types import CalcArgs, FXArgs
-from typeguard import typechecked
+from utils.type_checking import typechecked
 from utils.latency_tracker import track_latency
 
 logger = get_logger(__name__)
@@ -20,7 +19,7 @@ def parse_currency(prompt: str) -> PlanStepsListType:
         prompt (str): User input containing currency conversion instructions.
 
     Returns:
-        PlanStepsListType: A list of dictionaries, each describing a calc/fx tool step.
+        PlanStepsListType: A list of plan steps, each describing a calc/fx tool step.
 
     Raises:
         Exception: If any unexpected error occurs during parsing.
@@ -30,36 +29,34 @@ def parse_currency(prompt: str) -> PlanStepsListType:
     try:
         tools: PlanStepsListType = []
 
-        match = re.search(CURRENCY_OP_PATTERN, prompt, re.IGNORECASE)
-        if match:
+        match = CURRENCY_OP_PATTERN.search(prompt)
+        literals: List[str] = AMOUNT_LITERAL_PATTERN.findall(match.group(2)) if match else []
+        if any("," in n and THOUSANDS_AMOUNT_PATTERN.fullmatch(n) is None for n in literals):
+            # "1,0000" or "10,20": a comma between digits that is not a thousands separator is ambiguous
+            logger.warning("Ambiguous amounts in currency prompt: %s", prompt)
+        elif match:
             operation: str = match.group(1) or "single"
-            numbers_text: str = match.group(2)
-            numbers: List[float] = [float(n.replace(',', '')) for n in re.findall(r"\d+(?:\.\d+)?", numbers_text)]
+            numbers: List[float] = [float(n.replace(',', '')) for n in literals]
 
             from_currency: str = match.group(3).upper()
             to_currency: str = match.group(4).upper()
+            on: Optional[str] = match.group(5)
 
             logger.debug(
-                "Parsed operation: %s | Numbers: %s | From: %s | To: %s",
-                operation, numbers, from_currency, to_currency
+                "Parsed operation: %s | Numbers: %s | From: %s | To: %s | Date: %s",
+                operation, numbers, from_currency, to_currency, on
             )
 
-            if len(numbers) > 1:
+            if len(numbers) > 1 and operation == "single":
+                # Several amounts without an aggregation: convert each of them in one bulk step
+                tools.append(plan_step(FX_TOOL, FXArgs(amounts=numbers, from_currency=from_currency, to_currency=to_currency, date=on)))
+            elif len(numbers) > 1:
                 # For multiple numbers, first calculate the aggregation and then convert
-                tools.append({
-                    "tool": CALC_TOOL,
-                    "args": CalcArgs(numbers=numbers, operation=operation.lower()).model_dump()
-                })
-                tools.append({
-                    "tool": FX_TOOL,
-                    "args": FXArgs(amount=None, from_currency=from_currency, to_currency=to_currency).model_dump()
-                })
+                tools.append(plan_step(CALC_TOOL, CalcArgs(numbers=numbers, operation=operation.lower())))
+                tools.append(plan_step(FX_TOOL, FXArgs(amount=None, from_currency=from_currency, to_currency=to_currency, date=on)))
             else:
                 # Direct conversion for single number
-                tools.append({
-                    "tool": FX_TOOL,
-                    "args": FXArgs(amount=numbers[0], from_currency=from_currency, to_currency=to_currency).model_dump()
-                })
+                tools.append(plan_step(FX_TOOL, FXArgs(amount=numbers[0], from_currency=from_currency, to_currency=to_currency, date=on)))
 
             logger.debug("Matched currency conversion tools: %s", tools)
         else:
@@ -1,8 +1,9 @@
 from utils.logger import get_logger
 from constants.miscellaneous_constants import KB_TOOL
-from ..types.plan_types import PlanStepsListType
+from constants.regex_constants import KB_ABOUT_PATTERN, KB_WHO_PATTERN
+from ..types.plan_types import PlanStepsListType, plan_step
 from ..types.tool_types import KBArgs
-from typeguard import typechecked
+from utils.type_checking import typechecked
 from utils.latency_tracker import track_latency
 
 logger = get_logger(__name__)
@@ -17,13 +18,16 @@ def parse_kb(prompt: str) -> PlanStepsListType:
         prompt (str): User input containing a knowledge-base query.
 
     Returns:
-        PlanStepsListType: A list of dictionaries, each describing a kb tool step.
+        PlanStepsListType: A list of plan steps, each describing a kb tool step.
 
     Raises:
         Exception: If any unexpected error occurs during parsing.
         
     Notes:
-        - Supports prompts like "Who is <name>?".
+        - Supports prompts like "Who is <name>?" (name lookup).
+        - Supports "What/who ... about <topic>?" and "Who <did something>?" (full-text search),
+          e.g. "Who worked on the Analytical Engine?", when the question starts the prompt.
+          `call_llm` drops these searches when another parser understood the prompt.
     """
 
     logger.info("parse_kb called with prompt: %s", prompt)
@@ -35,14 +39,18 @@ def parse_kb(prompt: str) -> PlanStepsListType:
             name = prompt.lower().split("who is", 1)[1].strip().rstrip("?").strip()
             logger.debug("Extracted knowledge base query: %s", name)
             if name:
-                tools.append({
-                    "tool": KB_TOOL,
-                    "args": KBArgs(q=name).model_dump()
-                })
+                tools.append(plan_step(KB_TOOL, KBArgs(q=name)))
             else:
                 logger.warning("Found 'who is' pattern but no name extracted from prompt: %s", prompt)
         else:
-            logger.info("No knowledge base pattern matched for prompt: %s", prompt)
+            # For patterns: "What/who ... about <topic>?" and "Who <verb> ...?"
+            about = KB_ABOUT_PATTERN.search(prompt) or KB_WHO_PATTERN.search(prompt)
+            query = about.group(1).strip().rstrip(".").strip() if about else ""
+            if query:
+                logger.debug("Extracted knowledge base search: %s", query)
+                tools.append(plan_step(KB_TOOL, KBArgs(q=query, search=True)))
+            else:
+                logger.info("No knowledge base pattern matched for prompt: %s", prompt)
 
         logger.info("parse_kb extracted tools: %s", tools)
         return tools
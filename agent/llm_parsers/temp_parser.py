@@ -1,11 +1,10 @@
-import re
 from typing import List
 from utils.logger import get_logger
 from constants.regex_constants import TEMPERATURE_PATTERN, CITY_CLEAN_PATTERN, CITY_SPLIT_PATTERN
 from constants.miscellaneous_constants import SUPPORTED_CITIES, TEMPERATURE_TOOL
-from ..types.plan_types import PlanStepsListType
+from ..types.plan_types import PlanStepsListType, plan_step
 from ..types.tool_types import TempArgs
-from typeguard import typechecked
+from utils.type_checking import typechecked
 from utils.latency_tracker import track_latency
 
 logger = get_logger(__name__)
@@ -20,14 +19,14 @@ def parse_temperature(prompt: str) -> PlanStepsListType:
         prompt (str): User input containing a temperature query.
 
     Returns:
-        PlanStepsListType: A list of dictionaries, each describing a temperature tool step.
+        PlanStepsListType: A list of plan steps, each describing a temperature tool step.
 
     Raises:
         Exception: If any unexpected error occurs during parsing.
         
     Notes:
         - Supports queries like "What is the temperature in Paris and London?".
-        - Detects operations like average, total, maximum, minimum, etc.
+        - Detects operations like average, total, maximum, minimum, median, p90, p99, stddev.
         - Defaults to ["dhaka"] if no city is matched.
     """
 
@@ -40,15 +39,15 @@ def parse_temperature(prompt: str) -> PlanStepsListType:
             logger.info("Prompt does not contain 'temperature'; skipping parsing.")
             return tools
 
-        match = re.search(TEMPERATURE_PATTERN, prompt, re.IGNORECASE) # Regex to detect temperature queries
+        match = TEMPERATURE_PATTERN.search(prompt) # Regex to detect temperature queries
 
         cities: List[str] = []
         temp_operation: str = "single"
 
         if match:
             temp_op_text = match.group(1)
-            city_part = re.sub(CITY_CLEAN_PATTERN, "", match.group(2).lower())
-            words = re.split(CITY_SPLIT_PATTERN, city_part)
+            city_part = CITY_CLEAN_PATTERN.sub("", match.group(2).lower())
+            words = CITY_SPLIT_PATTERN.split(city_part)
 
             for city in SUPPORTED_CITIES:
                 if city in words and city not in cities:
@@ -65,10 +64,7 @@ def parse_temperature(prompt: str) -> PlanStepsListType:
             logger.info("No cities matched; defaulting to: %s", cities)
 
         # Append parsed tool step using Pydantic
-        tools.append({
-            "tool": TEMPERATURE_TOOL,
-            "args": TempArgs(cities=cities, operation=temp_operation).model_dump()
-        })
+        tools.append(plan_step(TEMPERATURE_TOOL, TempArgs(cities=cities, operation=temp_operation)))
 
         logger.info("Finished parse_temperature. Tools: %s", tools)
 
@@ -1,11 +1,10 @@
-import re
 from typing import List
 from utils.logger import get_logger
 from constants.regex_constants import WEATHER_PATTERN, CITY_CLEAN_PATTERN, CITY_SPLIT_PATTERN
 from constants.miscellaneous_constants import SUPPORTED_CITIES, WEATHER_TOOL
-from ..types.plan_types import PlanStepsListType
+from ..types.plan_types import PlanStepsListType, plan_step
 from ..types.tool_types import WeatherArgs
-from typeguard import typechecked
+from utils.type_checking import typechecked
 from utils.latency_tracker import track_latency
 
 logger = get_logger(__name__)
@@ -20,7 +19,7 @@ def parse_weather(prompt: str) -> PlanStepsListType:
         prompt (str): User input containing a weather query.
 
     Returns:
-        PlanStepsListType: A list of dictionaries, each describing a weather tool step.
+        PlanStepsListType: A list of plan steps, each describing a weather tool step.
     
     Raises:
         Exception: If any unexpected error occurs during parsing.
@@ -34,13 +33,13 @@ def parse_weather(prompt: str) -> PlanStepsListType:
             logger.info("Prompt does not contain 'weather'; skipping parsing.")
             return tools
 
-        match = re.search(WEATHER_PATTERN, prompt, re.IGNORECASE) # Regex to detect weather queries
+        match = WEATHER_PATTERN.search(prompt) # Regex to detect weather queries
 
         cities: List[str] = []
 
         if match:
-            after_weather = re.sub(CITY_CLEAN_PATTERN, "", match.group(1).lower())
-            words = re.split(CITY_SPLIT_PATTERN, after_weather)
+            after_weather = CITY_CLEAN_PATTERN.sub("", match.group(1).lower())
+            words = CITY_SPLIT_PATTERN.split(after_weather)
             for city in SUPPORTED_CITIES:
                 if city in words and city not in cities:
                     cities.append(city)
@@ -54,10 +53,7 @@ def parse_weather(prompt: str) -> PlanStepsListType:
             logger.info("No cities matched; defaulting to: %s", cities)
 
         # Append parsed tool step using Pydantic
-        tools.append({
-            "tool": WEATHER_TOOL,
-            "args": WeatherArgs(cities=cities).model_dump()
-        })
+        tools.append(plan_step(WEATHER_TOOL, WeatherArgs(cities=cities)))
 
         logger.info("Finished parse_weather. Tools: %s", tools)
 
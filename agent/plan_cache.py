@@ -0,0 +1,165 @@
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Callable, Dict, Hashable, Optional, Tuple
+from constants.miscellaneous_constants import QUOTE_TRANSLATION
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def normalize_prompt(prompt: str) -> str:
+    """
+    Normalize a prompt so near-identical prompts share one plan.
+
+    Curly quotes are folded to their ASCII form, the text is lowercased and
+    runs of whitespace are collapsed to single spaces.
+
+    Args:
+        prompt (str): Raw user prompt.
+
+    Returns:
+        str: Normalized prompt.
+    """
+
+    return " ".join(prompt.translate(QUOTE_TRANSLATION).lower().split())
+
+
+class PlanCache:
+    """
+    Thread-safe LRU cache with TTL expiry and a memory bound.
+
+    Entries are evicted least-recently-used first whenever either the entry
+    count or the estimated byte size goes over its limit. The whole cache is
+    dropped when the value returned by `version` changes, so registries the
+    cached values were derived from can invalidate it.
+    """
+
+    def __init__(
+        self,
+        max_entries: int,
+        max_bytes: int,
+        ttl_seconds: float = 0,
+        sizeof: Callable[[str, Any], int] = lambda key, value: len(key) + len(repr(value)),
+        version: Callable[[], Hashable] = lambda: None,
+    ):
+        """
+        Args:
+            max_entries (int): Maximum number of cached entries.
+            max_bytes (int): Maximum estimated size of all cached entries.
+            ttl_seconds (float): Lifetime of an entry; 0 disables expiry.
+            sizeof (Callable[[str, Any], int]): Estimates the size of an entry in bytes.
+            version (Callable[[], Hashable]): Returns a token that changes when cached values go stale.
+        """
+
+        self.max_entries: int = max_entries
+        self.max_bytes: int = max_bytes
+        self.ttl_seconds: float = ttl_seconds
+        self._sizeof = sizeof
+        self._version = version
+        self._lock = threading.Lock()
+        self._entries: "OrderedDict[str, Tuple[Any, float, int]]" = OrderedDict()
+        self._current_version: Hashable = version()
+        self._bytes: int = 0
+        self.hits: int = 0
+        self.misses: int = 0
+        self.evictions: int = 0
+
+    def _check_version(self) -> None:
+        """Drop every entry if the version token changed. Caller must hold the lock."""
+
+        version = self._version()
+        if version != self._current_version:
+            logger.info("Plan cache invalidated; dropping %d entries", len(self._entries))
+            self._entries.clear()
+            self._bytes = 0
+            self._current_version = version
+
+    def get(self, key: str) -> Optional[Any]:
+        """
+        Return the cached value for `key`, or None on a miss.
+
+        Args:
+            key (str): Cache key.
+
+        Returns:
+            Optional[Any]: Cached value, or None if absent or expired.
+        """
+
+        with self._lock:
+            self._check_version()
+            entry = self._entries.get(key)
+
+            if entry is None:
+                self.misses += 1
+                return None
+
+            value, expires_at, size = entry
+            if expires_at and expires_at <= time.monotonic():
+                del self._entries[key]
+                self._bytes -= size
+                self.misses += 1
+                return None
+
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def put(self, key: str, value: Any) -> None:
+        """
+        Store a value, evicting least-recently-used entries to stay within bounds.
+
+        Entries larger than the whole byte budget are not cached.
+
+        Args:
+            key (str): Cache key.
+            value (Any): Value to cache.
+        """
+
+        size: int = self._sizeof(key, value)
+        if size > self.max_bytes or self.max_entries <= 0:
+            logger.debug("Entry of %d bytes not cached", size)
+            return
+
+        expires_at: float = time.monotonic() + self.ttl_seconds if self.ttl_seconds else 0.0
+
+        with self._lock:
+            self._check_version()
+            previous = self._entries.pop(key, None)
+            if previous is not None:
+                self._bytes -= previous[2]
+
+            self._entries[key] = (value, expires_at, size)
+            self._bytes += size
+
+            while len(self._entries) > self.max_entries or self._bytes > self.max_bytes:
+                _, (_, _, evicted_size) = self._entries.popitem(last=False)
+                self._bytes -= evicted_size
+                self.evictions += 1
+
+    def clear(self) -> None:
+        """Remove every entry and reset the counters."""
+
+        with self._lock:
+            self._entries.clear()
+            self._bytes = 0
+            self.hits = self.misses = self.evictions = 0
+
+    def stats(self) -> Dict[str, float]:
+        """
+        Return cache counters.
+
+        Returns:
+            Dict[str, float]: Hits, misses, evictions, entry count, estimated bytes and hit rate.
+        """
+
+        with self._lock:
+            lookups: int = self.hits + self.misses
+            return {
+                "hits": self.hits,
+                "misses": self.misses,
+                "evictions": self.evictions,
+                "entries": len(self._entries),
+                "bytes": self._bytes,
+                "hit_rate": self.hits / lookups if lookups else 0.0,
+            }
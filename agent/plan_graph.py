@@ -0,0 +1,126 @@
+from typing import Callable, Dict, FrozenSet, Iterable, List, Tuple, Union
+from pydantic import BaseModel
+from .types.plan_types import PlanStep
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Keys a handler touches, either fixed or computed from the step's args
+StateKeys = Union[Iterable[str], Callable[[BaseModel], Iterable[str]]]
+
+
+def declares_state(reads: StateKeys = (), writes: StateKeys = (), updates: StateKeys = ()) -> Callable:
+    """
+    Decorator declaring which intermediate_values keys a handler reads and writes.
+
+    Declarations may over-approximate (a key that is only sometimes written
+    can be declared) but must never miss a key, or dependent steps could run
+    out of order. `updates` are keys the handler rewrites only when they are
+    already set, such as calc adjusting earlier temperatures; they count as
+    read and written where an earlier step may have set them.
+
+    Args:
+        reads (StateKeys): Keys read, or a function of the step args returning them.
+        writes (StateKeys): Keys written, or a function of the step args returning them.
+        updates (StateKeys): Keys read and rewritten if present, or a function of the step args returning them.
+
+    Returns:
+        Callable: Decorator attaching the declarations to the handler.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        func.state_reads = reads if callable(reads) else frozenset(reads)
+        func.state_writes = writes if callable(writes) else frozenset(writes)
+        func.state_updates = updates if callable(updates) else frozenset(updates)
+        return func
+
+    return decorator
+
+
+def _resolve_keys(keys: StateKeys, args: BaseModel) -> FrozenSet[str]:
+    """Evaluate a declaration for the given step args."""
+
+    return frozenset(keys(args)) if callable(keys) else keys
+
+
+def step_access(handler: Callable, args: BaseModel) -> Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str]]:
+    """
+    Return the keys a handler reads, writes and updates for one step.
+
+    Args:
+        handler (Callable): Handler decorated with `declares_state`.
+        args (BaseModel): Args of the step.
+
+    Returns:
+        Tuple[FrozenSet[str], FrozenSet[str], FrozenSet[str]]: Keys read, written and updated.
+
+    Raises:
+        ValueError: If the handler declares nothing.
+    """
+
+    if not hasattr(handler, "state_reads"):
+        raise ValueError(f"Handler {handler.__name__} does not declare its intermediate_values keys")
+    return (
+        _resolve_keys(handler.state_reads, args),
+        _resolve_keys(handler.state_writes, args),
+        _resolve_keys(handler.state_updates, args),
+    )
+
+
+def effective_access(
+    plan: List[PlanStep], handlers: Dict[str, Callable]
+) -> List[Tuple[FrozenSet[str], FrozenSet[str]]]:
+    """
+    Return the keys every step of a plan may read and write when run in order.
+
+    An updated key counts as read and written only if an earlier step may
+    have set it.
+
+    Args:
+        plan (List[PlanStep]): Plan steps in execution order.
+        handlers (Dict[str, Callable]): Handler per tool, carrying `declares_state` declarations.
+
+    Returns:
+        List[Tuple[FrozenSet[str], FrozenSet[str]]]: Keys read and keys written, per step.
+    """
+
+    access: List[Tuple[FrozenSet[str], FrozenSet[str]]] = []
+    available: FrozenSet[str] = frozenset()
+
+    for step in plan:
+        reads, writes, updates = step_access(handlers[step.tool], step.args)
+        updated: FrozenSet[str] = updates & available
+        access.append((reads | updated, writes | updated))
+        available |= writes
+
+    return access
+
+
+def step_dependencies(plan: List[PlanStep], handlers: Dict[str, Callable]) -> List[Tuple[int, ...]]:
+    """
+    Compute, for every step of a plan, the earlier steps it must wait for.
+
+    Step j depends on an earlier step i when one of them writes an
+    intermediate_values key the other reads or writes. Running every step
+    after its dependencies therefore gives the same state and results as
+    running the plan in order.
+
+    Args:
+        plan (List[PlanStep]): Plan steps in execution order.
+        handlers (Dict[str, Callable]): Handler per tool, carrying `declares_state` declarations.
+
+    Returns:
+        List[Tuple[int, ...]]: Indexes of the steps each step depends on.
+    """
+
+    access: List[Tuple[FrozenSet[str], FrozenSet[str]]] = effective_access(plan, handlers)
+    dependencies: List[Tuple[int, ...]] = []
+
+    for j, (reads, writes) in enumerate(access):
+        dependencies.append(tuple(
+            i for i, (earlier_reads, earlier_writes) in enumerate(access[:j])
+            if earlier_writes & (reads | writes) or earlier_reads & writes
+        ))
+
+    logger.debug("Step dependencies for plan %s: %s", plan, dependencies)
+    return dependencies
@@ -0,0 +1,100 @@
+from typing import Callable, Dict, FrozenSet, List, Set, Tuple
+from constants.miscellaneous_constants import CALC_TOOL
+from .plan_graph import effective_access
+from .types.plan_types import PlanStep, plan_step
+from .types.tool_types import CalcArgs
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+def eliminate_dead_steps(plan: List[PlanStep], handlers: Dict[str, Callable]) -> List[PlanStep]:
+    """
+    Drop steps whose results can reach neither the final result nor a later kept step.
+
+    Only the last step's result is returned, so an earlier step is kept only
+    if it may write an intermediate_values key that a kept step after it may
+    read. A dropped step is not run at all, so errors it would have raised
+    are no longer reported.
+
+    Args:
+        plan (List[PlanStep]): Plan steps in execution order.
+        handlers (Dict[str, Callable]): Handler per tool, carrying `declares_state` declarations.
+
+    Returns:
+        List[PlanStep]: The kept steps, in order.
+    """
+
+    access: List[Tuple[FrozenSet[str], FrozenSet[str]]] = effective_access(plan, handlers)
+    needed: Set[str] = set(access[-1][0])
+    kept: List[int] = [len(plan) - 1]
+
+    for index in range(len(plan) - 2, -1, -1):
+        reads, writes = access[index]
+        if writes & needed:
+            kept.append(index)
+            needed |= reads
+
+    return [plan[index] for index in reversed(kept)]
+
+
+def _is_expr_calc(step: PlanStep) -> bool:
+    """Whether a step is a calc step taking only an expression."""
+
+    return (
+        step.tool == CALC_TOOL
+        and bool(step.args.expr)
+        and step.args.numbers is None
+        and step.args.operation is None
+    )
+
+
+def fuse_calc_chains(plan: List[PlanStep]) -> List[PlanStep]:
+    """
+    Merge runs of consecutive expression-only calc steps into one step.
+
+    The calc handler applies the "and"-separated parts of an expression one
+    after the other, exactly as it applies consecutive steps, so the fused
+    step evaluates to the same result and leaves the same state behind.
+
+    Args:
+        plan (List[PlanStep]): Plan steps in execution order.
+
+    Returns:
+        List[PlanStep]: The plan with calc chains fused.
+    """
+
+    fused: List[PlanStep] = []
+
+    for step in plan:
+        if fused and _is_expr_calc(step) and _is_expr_calc(fused[-1]):
+            fused[-1] = plan_step(CALC_TOOL, CalcArgs(expr=f"{fused[-1].args.expr} and {step.args.expr}"))
+        else:
+            fused.append(step)
+
+    return fused
+
+
+def optimize_plan(plan: List[PlanStep], handlers: Dict[str, Callable]) -> List[PlanStep]:
+    """
+    Remove dead steps from a validated plan and fuse calc chains, without changing its result.
+
+    Args:
+        plan (List[PlanStep]): Plan steps in execution order.
+        handlers (Dict[str, Callable]): Handler per tool, carrying `declares_state` declarations.
+
+    Returns:
+        List[PlanStep]: The optimized plan (the input plan if nothing could be saved).
+    """
+
+    if len(plan) < 2 or any(step.tool not in handlers for step in plan):
+        return plan
+
+    optimized: List[PlanStep] = fuse_calc_chains(eliminate_dead_steps(plan, handlers))
+
+    if len(optimized) < len(plan):
+        logger.info(
+            "Optimized plan from %d to %d steps (%d saved): %s -> %s",
+            len(plan), len(optimized), len(plan) - len(optimized), plan, optimized,
+        )
+    return optimized
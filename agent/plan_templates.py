@@ -0,0 +1,157 @@
+from typing import Any, List, Optional, Tuple
+from constants.regex_constants import TEMPLATE_LITERAL_PATTERN
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+# Stands in for every digit of a numeric literal in a masked prompt
+NUMBER_PLACEHOLDER = "\x00"
+
+_MASK_DIGITS = str.maketrans("0123456789", NUMBER_PLACEHOLDER * 10)
+
+
+class _Slot:
+    """Numeric argument filled from the literal at `index`."""
+
+    __slots__ = ("index",)
+
+    def __init__(self, index: int):
+        self.index = index
+
+
+class _Format:
+    """String argument whose numeric literals are filled by `str.format`."""
+
+    __slots__ = ("template",)
+
+    def __init__(self, template: str):
+        self.template = template
+
+
+# A skeleton is a tuple of (tool name, args with _Slot/_Format placeholders)
+PlanSkeleton = Tuple[Tuple[str, Any], ...]
+
+
+def mask_numbers(prompt: str) -> Tuple[str, List[str]]:
+    """
+    Replace every digit of the standalone numeric literals in a prompt with a placeholder.
+
+    The masked prompt keeps each literal's shape (its number of digits and
+    decimal point), which parsers can depend on, e.g. to read "2025-08-22"
+    as a date but "12-3-4" as arithmetic. Digits inside words, as in "p90",
+    are left as they are.
+
+    Args:
+        prompt (str): Normalized prompt.
+
+    Returns:
+        Tuple[str, List[str]]: The masked prompt shape and the literals in order of appearance.
+    """
+
+    literals: List[str] = TEMPLATE_LITERAL_PATTERN.findall(prompt)
+    if not literals:
+        return prompt, literals
+    return TEMPLATE_LITERAL_PATTERN.sub(lambda match: match.group().translate(_MASK_DIGITS), prompt), literals
+
+
+class _NotTemplatable(Exception):
+    """Raised when a plan value cannot be traced back to exactly one literal."""
+
+
+def _skeletonize(value: Any, literals: List[str], values: List[float]) -> Any:
+    """
+    Replace values derived from prompt literals with placeholders.
+
+    Every number must come from exactly one literal; otherwise the plan does
+    not generalize to other numbers and `_NotTemplatable` is raised.
+    """
+
+    if isinstance(value, bool) or value is None:
+        return value
+
+    if isinstance(value, (int, float)):
+        matches = [i for i, literal_value in enumerate(values) if literal_value == value]
+        if len(matches) != 1:
+            raise _NotTemplatable(f"number {value} maps to {len(matches)} literals")
+        return _Slot(matches[0])
+
+    if isinstance(value, str):
+        pieces: List[str] = []
+        last: int = 0
+        for match in TEMPLATE_LITERAL_PATTERN.finditer(value):
+            matches = [i for i, literal in enumerate(literals) if literal == match.group()]
+            if len(matches) != 1:
+                raise _NotTemplatable(f"literal {match.group()!r} maps to {len(matches)} literals")
+            pieces.append(value[last:match.start()].replace("{", "{{").replace("}", "}}"))
+            pieces.append(f"{{{matches[0]}}}")
+            last = match.end()
+
+        if not pieces:
+            return value
+        pieces.append(value[last:].replace("{", "{{").replace("}", "}}"))
+        return _Format("".join(pieces))
+
+    if isinstance(value, list):
+        return [_skeletonize(item, literals, values) for item in value]
+
+    if isinstance(value, dict):
+        return {key: _skeletonize(item, literals, values) for key, item in value.items()}
+
+    raise _NotTemplatable(f"unsupported value type {type(value).__name__}")
+
+
+def build_skeleton(plan: List[Any], literals: List[str]) -> Optional[PlanSkeleton]:
+    """
+    Derive a reusable plan skeleton from a plan parsed from a prompt with the given literals.
+
+    Args:
+        plan (List[Any]): Validated plan steps (objects with `tool` and Pydantic `args`).
+        literals (List[str]): Numeric literals of the prompt the plan was parsed from.
+
+    Returns:
+        Optional[PlanSkeleton]: The skeleton, or None if the plan is empty or some
+            number in it cannot be traced back to exactly one literal.
+    """
+
+    # No parser understood the prompt; that says nothing of prompts of the same shape
+    if not plan:
+        return None
+
+    values: List[float] = [float(literal) for literal in literals]
+    try:
+        return tuple(
+            (step.tool, _skeletonize(step.args.model_dump(), literals, values))
+            for step in plan
+        )
+    except _NotTemplatable as e:
+        logger.debug("Plan not templatable: %s", e)
+        return None
+
+
+def _fill(value: Any, literals: List[str]) -> Any:
+    """Replace placeholders with the given literals."""
+
+    if isinstance(value, _Slot):
+        return float(literals[value.index])
+    if isinstance(value, _Format):
+        return value.template.format(*literals)
+    if isinstance(value, list):
+        return [_fill(item, literals) for item in value]
+    if isinstance(value, dict):
+        return {key: _fill(item, literals) for key, item in value.items()}
+    return value
+
+
+def fill_skeleton(skeleton: PlanSkeleton, literals: List[str]) -> List[Tuple[str, Any]]:
+    """
+    Fill a plan skeleton with the literals of a new prompt of the same shape.
+
+    Args:
+        skeleton (PlanSkeleton): Skeleton from `build_skeleton`.
+        literals (List[str]): Numeric literals of the new prompt.
+
+    Returns:
+        List[Tuple[str, Any]]: (tool name, raw args dict) pairs ready for validation.
+    """
+
+    return [(tool_name, _fill(args, literals)) for tool_name, args in skeleton]
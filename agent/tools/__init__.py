@@ -1,14 +1,24 @@
-from .calc_tools import evaluate, calc_numbers
-from .temp_tools import temp
-from .weather_tools import weather
-from .fx_tools import fx_convert
-from .kb_tools import kb_lookup
+from .calc_tools import evaluate, calc_numbers, calc_elementwise, compile_step, compile_chain
+from .temp_tools import temp, temp_many
+from .weather_tools import weather, weather_many
+from .fx_tools import fx_convert, fx_convert_many
+from .kb_tools import kb_lookup, kb_lookup_many, kb_lookup_prefix, kb_search, kb_search_names
 
 __all__ = [
     "evaluate",
     "calc_numbers",
+    "calc_elementwise",
+    "compile_step",
+    "compile_chain",
     "temp",
+    "temp_many",
     "weather",
+    "weather_many",
     "fx_convert",
+    "fx_convert_many",
     "kb_lookup",
+    "kb_lookup_many",
+    "kb_lookup_prefix",
+    "kb_search",
+    "kb_search_names",
 ]
@@ -0,0 +1,180 @@
+import operator
+from typing import Callable, Dict, List, Optional, Tuple, Union
+from constants.regex_constants import CALC_TOKEN_PATTERN
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+Number = Union[int, float, complex]
+
+# A compiled expression, called with the value of its variable (ignored if it has none)
+CompiledExpression = Callable[[Optional[float]], Number]
+
+# Integer powers beyond this exponent are refused instead of computed digit by digit
+MAX_INTEGER_EXPONENT = 10_000
+
+# Binding powers (left, right) of the infix operators; ** is right-associative
+_INFIX: Dict[str, Tuple[int, int, Optional[Callable[[Number, Number], Number]]]] = {
+    "+": (10, 11, operator.add),
+    "-": (10, 11, operator.sub),
+    "*": (20, 21, operator.mul),
+    "/": (20, 21, operator.truediv),
+    "//": (20, 21, operator.floordiv),
+    "%": (20, 21, operator.mod),
+    "**": (40, 39, None),
+}
+
+# Unary minus and plus bind looser than ** on their right: -2 ** 2 == -4
+_PREFIX_POWER = 30
+
+
+class CalcSyntaxError(ValueError):
+    """Raised when an expression is not valid arithmetic."""
+
+
+def _power(base: Number, exponent: Number) -> Number:
+    """`base ** exponent`, refusing integer powers too large to compute."""
+
+    if isinstance(base, int) and isinstance(exponent, int) and abs(exponent) > MAX_INTEGER_EXPONENT and abs(base) > 1:
+        raise OverflowError(f"Exponent {exponent} is too large")
+    return base ** exponent
+
+
+def _number(text: str) -> Number:
+    """Parse a numeric literal the way Python source does."""
+
+    if text.isdigit():
+        if len(text) > 1 and text[0] == "0" and text.strip("0"):
+            raise CalcSyntaxError(f"Leading zeros are not allowed in integer {text!r}")
+        return int(text)
+    return float(text)
+
+
+def _unknown_name(name: str) -> CompiledExpression:
+    """Node for an undefined name; like Python, it fails only when evaluation reaches it."""
+
+    def fail(x: Optional[float]) -> Number:
+        raise NameError(f"name {name!r} is not defined")
+
+    return fail
+
+
+def _tokenize(text: str) -> List[Tuple[str, str]]:
+    """Split an expression into (kind, text) tokens; kind is 'number', 'op' or 'name'."""
+
+    tokens: List[Tuple[str, str]] = []
+
+    # Every non-blank character starts a match, so the matches cover the whole text
+    for number, op, name, other in CALC_TOKEN_PATTERN.findall(text):
+        if other:
+            raise CalcSyntaxError(f"Unexpected character {other!r} in {text!r}")
+        if number:
+            tokens.append(("number", number))
+        elif op:
+            tokens.append(("op", op))
+        else:
+            tokens.append(("name", name))
+
+    return tokens
+
+
+class _Parser:
+    """Pratt parser turning tokens into nested closures."""
+
+    def __init__(self, tokens: List[Tuple[str, str]], variable: Optional[str]):
+        self.tokens = tokens
+        self.position = 0
+        self.variable = variable
+
+    def peek(self) -> Optional[Tuple[str, str]]:
+        return self.tokens[self.position] if self.position < len(self.tokens) else None
+
+    def next(self) -> Tuple[str, str]:
+        token = self.peek()
+        if token is None:
+            raise CalcSyntaxError("Unexpected end of expression")
+        self.position += 1
+        return token
+
+    def parse(self) -> CompiledExpression:
+        node = self.expression(0)
+        if self.peek() is not None:
+            raise CalcSyntaxError(f"Unexpected token {self.peek()[1]!r}")
+        return node
+
+    def prefix(self) -> CompiledExpression:
+        kind, text = self.next()
+
+        if kind == "number":
+            value: Number = _number(text)
+            return lambda x: value
+
+        if kind == "name":
+            if text == self.variable:
+                return lambda x: x
+            return _unknown_name(text)
+
+        if text == "(":
+            node = self.expression(0)
+            if self.next() != ("op", ")"):
+                raise CalcSyntaxError("Expected ')'")
+            return node
+
+        if text == "-":
+            operand = self.expression(_PREFIX_POWER)
+            return lambda x: -operand(x)
+
+        if text == "+":
+            operand = self.expression(_PREFIX_POWER)
+            return lambda x: +operand(x)
+
+        raise CalcSyntaxError(f"Unexpected operator {text!r}")
+
+    def expression(self, min_power: int) -> CompiledExpression:
+        left = self.prefix()
+
+        while True:
+            token = self.peek()
+            if token is None or token[0] != "op" or token[1] not in _INFIX:
+                if token is not None and token != ("op", ")"):
+                    raise CalcSyntaxError(f"Unexpected token {token[1]!r}")
+                return left
+
+            left_power, right_power, function = _INFIX[token[1]]
+            if left_power < min_power:
+                return left
+            self.position += 1
+
+            right = self.expression(right_power)
+            left = self._binary(function or _power, left, right)
+
+    @staticmethod
+    def _binary(function: Callable[[Number, Number], Number], left: CompiledExpression, right: CompiledExpression) -> CompiledExpression:
+        return lambda x: function(left(x), right(x))
+
+
+def compile_arithmetic(text: str, variable: Optional[str] = None) -> CompiledExpression:
+    """
+    Compile an arithmetic expression into a reusable evaluator, without `eval`.
+
+    The language is Python's numeric expression subset: int and float
+    literals, unary + and -, + - * / // % ** with Python's precedence and
+    associativity, and parentheses. Operators are applied to Python numbers,
+    left operand first, so results and errors (ZeroDivisionError, or
+    NameError for unknown names) are exactly what Python gives.
+
+    Args:
+        text (str): Lowercased expression, e.g. "3 + 1.5 * 2".
+        variable (Optional[str]): Name that stands for the evaluator's argument, e.g. "x".
+
+    Returns:
+        CompiledExpression: Function of the variable's value returning the expression's value.
+
+    Raises:
+        CalcSyntaxError: If the text is not a valid expression.
+    """
+
+    tokens: List[Tuple[str, str]] = _tokenize(text)
+    if not tokens:
+        raise CalcSyntaxError("Empty expression")
+    return _Parser(tokens, variable).parse()
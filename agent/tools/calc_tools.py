@@ -1,13 +1,38 @@
-import re
-from typing import List, Union
+import itertools
+import math
+from functools import lru_cache
+from typing import Callable, Dict, Iterable, Iterator, List, Optional, Sized, Union
 from ..types.plan_types import CalcResultType
 from constants.regex_constants import AVERAGE_PATTERN, CLEAN_EXPRESSION_PATTERN
-from constants.miscellaneous_constants import WORD_OPS
+from constants.miscellaneous_constants import QUANTILE_OPERATIONS, STDDEV_OPERATIONS, WORD_OPS
+from config.settings import CALC_EXPRESSION_CACHE_SIZE
+from .calc_engine import CalcSyntaxError, CompiledExpression, compile_arithmetic
 from utils.logger import get_logger
-from typeguard import typechecked
+from utils.streaming_stats import RunningStats, running_stats, streaming_quantile, streaming_stddev
+from utils.vector_ops import vector_max, vector_mean, vector_min, vector_sum
+from utils.type_checking import typechecked
 
 logger = get_logger(__name__)
 
+# Every calc_numbers operation; the reducers give the result of sum/average/max/min for a stream
+NUMERIC_OPERATIONS: Dict[str, Optional[Callable[[RunningStats], float]]] = {
+    "sum": lambda stats: stats.total,
+    "total": lambda stats: stats.total,
+    "average": lambda stats: stats.total / stats.count,
+    "avg": lambda stats: stats.total / stats.count,
+    "maximum": lambda stats: stats.maximum,
+    "max": lambda stats: stats.maximum,
+    "minimum": lambda stats: stats.minimum,
+    "min": lambda stats: stats.minimum,
+    **dict.fromkeys(QUANTILE_OPERATIONS),
+    **dict.fromkeys(STDDEV_OPERATIONS),
+}
+
+_NO_VALUE = object()
+
+# Stands for the running value when an operation is compiled once for many values
+VALUE_PLACEHOLDER = "__value__"
+
 def _percent_of(expr: str) -> CalcResultType:
     """
     Calculate percentage expressions of the form 'X % of Y'.
@@ -31,21 +56,72 @@ def _percent_of(expr: str) -> CalcResultType:
         logger.info("Percent calculation result: %s", result)
         return result
     except Exception:
-        logger.error("Failed percent calculation for expr: %s. Falling back to eval.", expr, exc_info=True)
+        logger.error("Failed percent calculation for expr: %s. Falling back to arithmetic.", expr, exc_info=True)
         try:
-            result: float = eval(expr)
-            logger.info("Eval fallback result: %s", result)
+            result: float = compile_arithmetic(expr)(None)
+            logger.info("Arithmetic fallback result: %s", result)
             return result
         except Exception:
-            logger.error("Eval fallback failed for expr: %s", expr, exc_info=True)
+            logger.error("Arithmetic fallback failed for expr: %s", expr, exc_info=True)
             return 0.0
 
+
+def _compile_expression(e: str) -> Optional[Callable[[Optional[float]], CalcResultType]]:
+    """
+    Preprocess a normalized expression and compile it into an evaluator.
+
+    Args:
+        e (str): Lowercased, whitespace-collapsed expression, possibly containing VALUE_PLACEHOLDER.
+
+    Returns:
+        Optional[Callable[[Optional[float]], CalcResultType]]: The evaluator, called with the
+            placeholder's value, or None if the text is not valid arithmetic.
+    """
+
+    e = e.replace("what is", "").strip()
+    e = CLEAN_EXPRESSION_PATTERN.sub("", e)
+
+    if "% of" in e:
+        result: CalcResultType = _percent_of(e)
+        return lambda x: result
+
+    # Replacing operator words like add, divide with corresponding symbols
+    for word, symbol in WORD_OPS.items():
+        e = e.replace(f"{word} ", symbol)
+
+    e = e.replace(" to the ", " + ")
+
+    match = AVERAGE_PATTERN.search(e)
+    if match:
+        a, b = match.groups()
+        e = str((int(a) + int(b)) / 2)
+        logger.info("Average computed: %s", e)
+
+    try:
+        compiled: CompiledExpression = compile_arithmetic(e, variable=VALUE_PLACEHOLDER)
+    except CalcSyntaxError:
+        logger.error("Invalid arithmetic expression: %s", e, exc_info=True)
+        return None
+
+    return lambda x: float(f"{compiled(x):.1f}")
+
+
+@lru_cache(maxsize=CALC_EXPRESSION_CACHE_SIZE)
+def _cached_expression(normalized: str) -> Optional[Callable[[Optional[float]], CalcResultType]]:
+    """`_compile_expression`, cached by normalized expression text."""
+
+    return _compile_expression(normalized)
+
+
 @typechecked
 def evaluate(expr: str) -> CalcResultType:
     """
     Evaluate mathematical expressions in string form.
 
-    Supports percentage, addition, average, and basic arithmetic.
+    Supports percentage, addition, average, and basic arithmetic. Each
+    distinct expression is compiled once by the safe arithmetic engine
+    (`compile_arithmetic`, never `eval`) and the evaluator is cached by the
+    lowercased, whitespace-collapsed text.
 
     Args:
         expr (str): The mathematical expression, e.g., "average of 10 and 20".
@@ -59,27 +135,14 @@ def evaluate(expr: str) -> CalcResultType:
 
     logger.info("Evaluating expression: %s", expr)
     try:
-        e: str = expr.lower().replace("what is", "").strip()
-        e = re.sub(CLEAN_EXPRESSION_PATTERN, "", e)
-
-        if "% of" in e:
-            return _percent_of(e)
-
-        # Replacing operator words like add, divide with corresponding symbols
-        for word, symbol in WORD_OPS.items():
-            e = e.replace(f"{word} ", symbol)
-
-        e = e.replace(" to the ", " + ")
+        compiled: Optional[Callable[[Optional[float]], CalcResultType]] = _cached_expression(" ".join(expr.lower().split()))
+        if compiled is None:
+            logger.error("Error evaluating expression: %s", expr)
+            return None
 
-        match = re.search(AVERAGE_PATTERN, e)
-        if match:
-            a, b = match.groups()
-            e = str((int(a) + int(b)) / 2)
-            logger.info("Average computed: %s", e)
-
-        result: float = eval(e)
+        result: CalcResultType = compiled(None)
         logger.info("Evaluated result: %s", result)
-        return float(f"{result:.1f}")
+        return result
     
     except ZeroDivisionError as zde:
         logger.error("Division by zero in expression: %s", expr, exc_info=True)
@@ -90,14 +153,121 @@ def evaluate(expr: str) -> CalcResultType:
         return None
 
 
+def _compiles_with_placeholder(text: str) -> bool:
+    """
+    Whether `<value><text>` evaluates the same with the value compiled in as a variable.
+
+    That holds when the text continues with an infix operator: it cannot merge
+    with the value's digits, bind tighter than the value's sign (**) or form a
+    percent expression.
+    """
+
+    cleaned: str = CLEAN_EXPRESSION_PATTERN.sub("", text.lower()).lstrip()
+    return "%" not in cleaned and cleaned[:1] in ("+", "-", "*", "/") and not cleaned.startswith("**")
+
+
 @typechecked
-def calc_numbers(numbers: List[Union[int, float]], operation: str) -> CalcResultType:
+def compile_step(op: str, separator: str = "") -> Callable[[CalcResultType], CalcResultType]:
     """
-    Perform numeric list operations: sum, average, max, min.
+    Compile an operation applied to a running value, e.g. "+ 10" or "* 2".
+
+    The returned function gives what `evaluate(f"{value}{separator}{op}")`
+    returns, but the operation is preprocessed and compiled once instead of
+    once per value.
 
     Args:
-        numbers (List[Union[int, float]]): List of numbers to operate on.
-        operation (str): Operation to perform - "sum", "average", "max", or "min".
+        op (str): Operation text following the value.
+        separator (str): Text placed between the value and the operation.
+
+    Returns:
+        Callable[[CalcResultType], CalcResultType]: Function of the running value.
+    """
+
+    compiled: Optional[Callable[[Optional[float]], CalcResultType]] = None
+    if _compiles_with_placeholder(f"{separator}{op}"):
+        compiled = _cached_expression(" ".join(f"{VALUE_PLACEHOLDER}{separator}{op}".lower().split()))
+
+    def step(value: CalcResultType) -> CalcResultType:
+        # Values without a plain numeric spelling (None, inf, nan) take the textual path
+        if compiled is None or isinstance(value, bool) or not isinstance(value, (int, float)) or not math.isfinite(value):
+            return evaluate(f"{value}{separator}{op}")
+        try:
+            return compiled(value)
+        except ZeroDivisionError:
+            logger.error("Division by zero applying '%s' to %s", op, value, exc_info=True)
+            raise
+        except Exception:
+            logger.error("Error applying '%s' to %s", op, value, exc_info=True)
+            return None
+
+    return step
+
+
+@typechecked
+def compile_chain(ops: List[str], separator: str = "") -> Callable[[CalcResultType], CalcResultType]:
+    """
+    Compile a chain of operations applied one after the other to a running value.
+
+    Args:
+        ops (List[str]): Operations, e.g. ["+ 10", "* 2"].
+        separator (str): Text placed between the value and each operation.
+
+    Returns:
+        Callable[[CalcResultType], CalcResultType]: Function giving what applying each op
+            with `evaluate` in turn gives.
+    """
+
+    steps: List[Callable[[CalcResultType], CalcResultType]] = [compile_step(op, separator) for op in ops]
+
+    def chain(value: CalcResultType) -> CalcResultType:
+        for step in steps:
+            value = step(value)
+        return value
+
+    return chain
+
+
+@typechecked
+def calc_elementwise(numbers: Iterable[Union[int, float]], ops: List[str]) -> List[CalcResultType]:
+    """
+    Apply a chain of operations to every number, e.g. ["+ 5"] to [1, 2, 3].
+
+    The chain is compiled once (see `compile_chain`) and applied in a single
+    pass, so each result is what evaluating the operations on that number in
+    turn gives, without preprocessing the text per element.
+
+    Args:
+        numbers (Iterable[Union[int, float]]): Numbers to operate on; generators are read once.
+        ops (List[str]): Operations following each number, e.g. ["* 1.5"].
+
+    Returns:
+        List[CalcResultType]: One result per number, in order.
+
+    Raises:
+        ZeroDivisionError: If an operation divides by zero.
+    """
+
+    chain: Callable[[CalcResultType], CalcResultType] = compile_chain(ops)
+    results: List[CalcResultType] = [chain(number) for number in numbers]
+    logger.info("Applied %s element-wise to %d numbers", ops, len(results))
+    return results
+
+
+@typechecked
+def calc_numbers(numbers: Iterable[Union[int, float]], operation: str) -> CalcResultType:
+    """
+    Perform numeric list operations: sum, average, max, min, median, p90, p99, stddev.
+
+    Large float arrays (array.array, NumPy arrays) are reduced with the
+    vectorized backend in `utils.vector_ops` when NumPy is installed.
+    Generators and other one-shot iterables are read once, without being
+    materialized; median/p90/p99 come from a bounded-memory quantile sketch
+    (exact below QUANTILE_SKETCH_SIZE values) and stddev (population) from
+    Welford's running variance, whatever the input type.
+
+    Args:
+        numbers (Iterable[Union[int, float]]): Numbers to operate on (list, tuple, numeric array or generator).
+        operation (str): Operation to perform - "sum", "average", "max", "min", "median", "p90", "p99" or "stddev".
 
     Returns:
         float: The result of the operation.
@@ -107,23 +277,41 @@ def calc_numbers(numbers: List[Union[int, float]], operation: str) -> CalcResult
         Exception: For any unexpected errors during calculation.
     """
 
-    logger.info("Calculating numbers: %s with operation: %s", numbers, operation)
+    sized: bool = isinstance(numbers, Sized)
+    logger.info("Calculating %s numbers with operation: %s", len(numbers) if sized else "streamed", operation)
     try:
-        if not numbers:
+        op: str = operation.lower()
+        if op not in NUMERIC_OPERATIONS:
+            raise ValueError(f"Unsupported operation: {operation}")
+
+        if sized:
+            empty: bool = len(numbers) == 0
+        else:
+            # Peek one value so an empty stream is detected without reading it twice
+            iterator: Iterator[Union[int, float]] = iter(numbers)
+            first = next(iterator, _NO_VALUE)
+            empty = first is _NO_VALUE
+            numbers = itertools.chain((first,), iterator)
+
+        if empty:
             logger.info("Empty numbers list provided. Returning 0.")
             return 0.0
 
-        op: str = operation.lower()
-        if op in ["sum", "total"]:
-            result: float = sum(numbers)
+        if op in QUANTILE_OPERATIONS:
+            result: float = streaming_quantile(numbers, QUANTILE_OPERATIONS[op])
+        elif op in STDDEV_OPERATIONS:
+            result = streaming_stddev(numbers)
+        elif not sized:
+            stats: RunningStats = running_stats(numbers)
+            result = NUMERIC_OPERATIONS[op](stats)
+        elif op in ["sum", "total"]:
+            result = vector_sum(numbers)
         elif op in ["average", "avg"]:
-            result = sum(numbers) / len(numbers)
+            result = vector_mean(numbers)
         elif op in ["maximum", "max"]:
-            result = max(numbers)
-        elif op in ["minimum", "min"]:
-            result = min(numbers)
+            result = vector_max(numbers)
         else:
-            raise ValueError(f"Unsupported operation: {operation}")
+            result = vector_min(numbers)
 
         logger.info("Result of %s operation: %s", operation, result)
         return float(result)
@@ -0,0 +1,245 @@
+import threading
+from array import array
+from bisect import bisect_right
+from datetime import date
+from functools import lru_cache
+from typing import Dict, Iterable, Iterator, List, Optional, Set, Tuple
+from config.settings import FX_HISTORY_FILE_PATH, FX_HISTORY_MATRIX_CACHE_SIZE
+from constants.miscellaneous_constants import VALID_CURRENCIES
+from utils.logger import get_logger
+from .fx_rates import RateMatrix
+
+logger = get_logger(__name__)
+
+# A pair's history: day ordinals in ascending order and the rate quoted on each day
+PairHistory = Tuple[array, array]
+
+# A quoted pair as (source, target) lowercased codes
+Pair = Tuple[str, str]
+
+
+class RateHistory:
+    """
+    Historical FX quotes with as-of lookups.
+
+    Each quoted pair (("usd", "eur") for "usd_to_eur") keeps two parallel typed arrays, the days
+    (as `date.toordinal()` integers) in ascending order and the rates, so
+    years of daily quotes cost 12 bytes per row and a lookup is one
+    bisection. The rate as of a day is the latest quote on or before it.
+    Pairs that are not quoted directly or inversely are converted through
+    a route of quoted pairs (shortest, found once per pair of codes), one
+    bisection per hop; when a hop has no quote yet on that day, through the
+    cross-rate matrix of that day's quotes, built once per day and cached
+    (FX_HISTORY_MATRIX_CACHE_SIZE days).
+    """
+
+    def __init__(self, pairs: Dict[Pair, PairHistory]):
+        self.pairs: Dict[Pair, PairHistory] = pairs
+        self.routes: Dict[Pair, Optional[List[Tuple[Pair, bool]]]] = {}
+        self.matrix_on = lru_cache(maxsize=FX_HISTORY_MATRIX_CACHE_SIZE)(self._matrix_on)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Tuple[str, str, float]]) -> "RateHistory":
+        """
+        Build the history from (ISO date, pair, rate) rows in any order.
+
+        When a pair is quoted twice on the same day, the later row wins.
+
+        Args:
+            rows (Iterable[Tuple[str, str, float]]): Rows such as ("2025-08-22", "usd_to_eur", 0.8547).
+
+        Returns:
+            RateHistory: The loaded history.
+
+        Raises:
+            ValueError: If a date is not an ISO date or a pair is not "<from>_to_<to>".
+        """
+
+        ordinals: Dict[str, int] = {}
+        keys: Dict[str, Pair] = {}
+        columns: Dict[Pair, PairHistory] = {}
+        for day, pair, rate in rows:
+            ordinal: Optional[int] = ordinals.get(day)
+            if ordinal is None:
+                ordinal = ordinals[day] = date.fromisoformat(day).toordinal()
+            key: Optional[Pair] = keys.get(pair)
+            if key is None:
+                source, separator, target = pair.lower().partition("_to_")
+                if not separator or not source or not target:
+                    raise ValueError(f"FX pair must look like 'usd_to_eur', got {pair!r}")
+                key = keys[pair] = (source, target)
+            days, rates = columns.setdefault(key, (array("i"), array("d")))
+            days.append(ordinal)
+            rates.append(rate)
+
+        for pair, (days, rates) in columns.items():
+            if any(days[i] > days[i + 1] for i in range(len(days) - 1)):
+                # Stable sort: a later row for the same day stays after the earlier one
+                order: List[int] = sorted(range(len(days)), key=days.__getitem__)
+                columns[pair] = (array("i", (days[i] for i in order)), array("d", (rates[i] for i in order)))
+
+        return cls(columns)
+
+    @classmethod
+    def load(cls, path: str) -> "RateHistory":
+        """
+        Load the history from a CSV file of date,pair,rate rows with a header line.
+
+        Malformed rows are skipped with a warning.
+
+        Args:
+            path (str): Path to the file.
+
+        Returns:
+            RateHistory: The loaded history.
+
+        Raises:
+            OSError: If the file cannot be read.
+        """
+
+        valid_days: Set[str] = set()
+        skipped: int = 0
+        loaded: int = 0
+
+        def rows(f) -> Iterator[Tuple[str, str, float]]:
+            # Streamed into the typed arrays, so no row objects are kept around
+            nonlocal skipped, loaded
+            next(f, None)
+            for line in f:
+                if not line.strip():
+                    continue
+                try:
+                    day, pair, rate = line.strip().split(",")
+                    if day not in valid_days:
+                        date.fromisoformat(day)
+                        valid_days.add(day)
+                    if pair.count("_to_") != 1:
+                        raise ValueError(pair)
+                    value: float = float(rate)
+                except ValueError:
+                    skipped += 1
+                    continue
+                loaded += 1
+                yield day, pair, value
+
+        with open(path, "r", encoding="utf-8") as f:
+            history: RateHistory = cls.from_rows(rows(f))
+
+        if skipped:
+            logger.warning("Skipped %d malformed FX history rows in %s", skipped, path)
+        logger.info("Loaded %d FX history rows for %d pairs from %s", loaded, len(history.pairs), path)
+        return history
+
+    def quote(self, pair: Pair, day: int) -> Optional[float]:
+        """Rate of a quoted pair as of a day ordinal, or None if it has no quote on or before that day."""
+
+        history: Optional[PairHistory] = self.pairs.get(pair)
+        if history is None:
+            return None
+        position: int = bisect_right(history[0], day)
+        return history[1][position - 1] if position else None
+
+    def _route(self, source: str, target: str) -> Optional[List[Tuple[Pair, bool]]]:
+        """Fewest quoted pairs leading from source to target, each flagged if used inversely, or None."""
+
+        neighbours: Dict[str, List[Tuple[str, Pair, bool]]] = {}
+        for pair in self.pairs:
+            neighbours.setdefault(pair[0], []).append((pair[1], pair, False))
+            neighbours.setdefault(pair[1], []).append((pair[0], pair, True))
+
+        previous: Dict[str, Tuple[str, Pair, bool]] = {}
+        frontier: List[str] = [source]
+        while frontier and target not in previous:
+            following: List[str] = []
+            for code in frontier:
+                for neighbour, pair, inverse in neighbours.get(code, ()):
+                    if neighbour != source and neighbour not in previous:
+                        previous[neighbour] = (code, pair, inverse)
+                        following.append(neighbour)
+            frontier = following
+
+        if target not in previous:
+            return None
+        route: List[Tuple[Pair, bool]] = []
+        code: str = target
+        while code != source:
+            code, pair, inverse = previous[code]
+            route.append((pair, inverse))
+        return route[::-1]
+
+    def _matrix_on(self, day: int) -> RateMatrix:
+        quotes: Dict[str, float] = {}
+        for pair in self.pairs:
+            rate: Optional[float] = self.quote(pair, day)
+            if rate is not None:
+                quotes["_to_".join(pair)] = rate
+        return RateMatrix(quotes, VALID_CURRENCIES)
+
+    def rate(self, from_currency: str, to_currency: str, on: str) -> Optional[float]:
+        """
+        Look up the rate between two currency codes as of a date.
+
+        Args:
+            from_currency (str): Source currency, e.g. "USD".
+            to_currency (str): Target currency.
+            on (str): ISO date, e.g. "2025-08-22".
+
+        Returns:
+            Optional[float]: The rate, 1.0 for the same code, or None if no quotes
+                on or before the date connect the two currencies.
+
+        Raises:
+            ValueError: If `on` is not an ISO date.
+        """
+
+        day: int = date.fromisoformat(on).toordinal()
+        source: str = from_currency.lower()
+        target: str = to_currency.lower()
+        if source == target:
+            return 1.0
+
+        rate: Optional[float] = self.quote((source, target), day)
+        if rate is not None:
+            return rate
+        rate = self.quote((target, source), day)
+        if rate is not None:
+            return 1 / rate
+
+        key: Pair = (source, target)
+        if key not in self.routes:
+            self.routes[key] = self._route(source, target)
+        route: Optional[List[Tuple[Pair, bool]]] = self.routes[key]
+        if route is None:
+            return None
+        product: float = 1.0
+        for pair, inverse in route:
+            rate = self.quote(pair, day)
+            if rate is None:
+                # A hop was not quoted yet; other pairs may still connect the codes on that day
+                return self.matrix_on(day).rate(source, target)
+            product = product / rate if inverse else product * rate
+        return product
+
+
+_HISTORY: Optional[RateHistory] = None
+_HISTORY_LOCK = threading.Lock()
+
+
+def fx_history() -> RateHistory:
+    """
+    The history loaded from FX_HISTORY_FILE_PATH, read on first use so that startup does not pay for it.
+
+    Returns:
+        RateHistory: The shared history (empty if the file cannot be read).
+    """
+
+    global _HISTORY
+    if _HISTORY is None:
+        with _HISTORY_LOCK:
+            if _HISTORY is None:
+                try:
+                    _HISTORY = RateHistory.load(FX_HISTORY_FILE_PATH)
+                except OSError as e:
+                    logger.error("Failed to load FX history from %s: %s", FX_HISTORY_FILE_PATH, e)
+                    _HISTORY = RateHistory({})
+    return _HISTORY
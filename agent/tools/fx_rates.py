@@ -0,0 +1,81 @@
+from collections import deque
+from typing import Deque, Dict, Iterable, List, Mapping, Optional, Tuple
+from constants.miscellaneous_constants import FX_RATES, VALID_CURRENCIES
+from utils.logger import get_logger
+
+logger = get_logger(__name__)
+
+
+class RateMatrix:
+    """
+    All-pairs FX rates over a fixed set of currencies, built once from quoted rates.
+
+    Quotes ("usd_to_eur": 0.91) form a graph whose edges go both ways, the
+    reverse edge carrying the inverse rate. The rate of every other pair is
+    the product along the path with the fewest hops (so a pair quoted
+    against a common pivot is triangulated through it). Rates are stored in
+    a list of rows indexed by currency position, so a lookup is two list
+    indexings; codes are indexed in upper and lower case to spare callers
+    the case folding.
+    """
+
+    __slots__ = ("currencies", "index", "rates")
+
+    def __init__(self, quotes: Mapping[str, float], currencies: Iterable[str] = ()):
+        edges: Dict[str, List[Tuple[str, float]]] = {}
+        for currency in currencies:
+            edges.setdefault(currency.lower(), [])
+        for key, rate in quotes.items():
+            source, target = key.lower().split("_to_")
+            edges.setdefault(source, []).append((target, rate))
+            edges.setdefault(target, []).append((source, 1 / rate))
+
+        self.currencies: List[str] = list(edges)
+        self.index: Dict[str, int] = {}
+        for position, currency in enumerate(self.currencies):
+            self.index[currency] = self.index[currency.upper()] = position
+        self.rates: List[List[Optional[float]]] = [self._rates_from(currency, edges) for currency in self.currencies]
+        logger.debug("Built FX rate matrix over %d currencies from %d quotes", len(self.currencies), len(quotes))
+
+    def _rates_from(self, source: str, edges: Dict[str, List[Tuple[str, float]]]) -> List[Optional[float]]:
+        """Rates from `source` to every currency, by breadth-first search over the quotes."""
+
+        row: List[Optional[float]] = [None] * len(self.currencies)
+        row[self.index[source]] = 1.0
+        queue: Deque[str] = deque([source])
+        while queue:
+            currency: str = queue.popleft()
+            rate: float = row[self.index[currency]]
+            for target, edge_rate in edges[currency]:
+                if row[self.index[target]] is None:
+                    row[self.index[target]] = rate * edge_rate
+                    queue.append(target)
+        return row
+
+    def rate(self, from_currency: str, to_currency: str) -> Optional[float]:
+        """
+        Look up the rate between two currency codes.
+
+        Args:
+            from_currency (str): Source currency, e.g. "USD" or "usd".
+            to_currency (str): Target currency.
+
+        Returns:
+            Optional[float]: The rate, 1.0 for the same code, or None if either
+                currency is unknown or no chain of quotes connects them.
+        """
+
+        from_index: Optional[int] = self.index.get(from_currency)
+        if from_index is None:
+            from_index = self.index.get(from_currency.lower())
+        to_index: Optional[int] = self.index.get(to_currency)
+        if to_index is None:
+            to_index = self.index.get(to_currency.lower())
+
+        if from_index is None or to_index is None:
+            return 1.0 if from_currency.lower() == to_currency.lower() else None
+        return self.rates[from_index][to_index]
+
+
+# Built once at import from the quoted rates
+FX_MATRIX: RateMatrix = RateMatrix(FX_RATES, VALID_CURRENCIES)
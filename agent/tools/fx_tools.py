@@ -1,48 +1,54 @@
-from constants.miscellaneous_constants import FX_RATES
+import itertools
+from typing import Any, Collection, Dict, Iterable, List, Optional, Tuple, Union
+from config.settings import VECTOR_MIN_SIZE
 from utils.logger import get_logger
-from typeguard import typechecked
+from .fx_history import fx_history
+from .fx_rates import FX_MATRIX
+from utils.type_checking import typechecked
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python path covers every input
+    np = None
 
 logger = get_logger(__name__)
 
 @typechecked
-def fx_convert(amount: float, from_currency: str, to_currency: str) -> float:
+def fx_convert(amount: float, from_currency: str, to_currency: str, on: Optional[str] = None) -> float:
     """
     Convert an amount from one currency to another using predefined FX rates.
 
+    Pairs without a quoted rate are converted through the precomputed
+    cross rates of `FX_MATRIX`. With a date, the historical rates as of
+    that date are used instead.
+
     Args:
         amount (float): The amount of money to convert.
         from_currency (str): The source currency (e.g., "USD").
         to_currency (str): The target currency (e.g., "EUR").
+        on (Optional[str]): ISO date (e.g., "2025-08-22") of the rate to use; today's rates if None.
 
     Returns:
         float: The converted amount, rounded to 2 decimal places.
                Returns 0.0 if no exchange rate is found.
 
     Raises:
+        ValueError: If `on` is not an ISO date.
         Exception: For unexpected errors during conversion.
     """
 
-    logger.info("Starting FX conversion: %s %s -> %s", amount, from_currency, to_currency)
+    logger.info("Starting FX conversion: %s %s -> %s (as of %s)", amount, from_currency, to_currency, on or "today")
     try:
-        from_currency: str = from_currency.lower()
-        to_currency: str = to_currency.lower()
-
-        if from_currency == to_currency:
-            logger.info("From and to currencies are the same. Returning amount: %s", amount)
-            return round(amount, 2)
-
-        key: str = f"{from_currency}_to_{to_currency}"
-        inverse_key: str = f"{to_currency}_to_{from_currency}"
-
-        if key in FX_RATES:
-            rate: float = FX_RATES[key]
-            logger.info("Using direct FX rate for %s: %s", key, rate)
-        elif inverse_key in FX_RATES:
-            rate = 1 / FX_RATES[inverse_key]
-            logger.info("Using inverse FX rate for %s: %s", inverse_key, rate)
+        rate: Optional[float]
+        if on is None:
+            rate = FX_MATRIX.rate(from_currency, to_currency)
         else:
+            rate = fx_history().rate(from_currency, to_currency, on)
+
+        if rate is None:
             logger.error("FX rate not found for %s -> %s. Returning 0.0", from_currency, to_currency)
             return 0.0
+        logger.info("Using FX rate for %s -> %s: %s", from_currency, to_currency, rate)
 
         result: float = round(amount * rate, 2)
         logger.info("FX conversion result: %s", result)
@@ -51,3 +57,140 @@ def fx_convert(amount: float, from_currency: str, to_currency: str) -> float:
     except Exception:
         logger.error("Error during FX conversion for %s %s -> %s", amount, from_currency, to_currency, exc_info=True)
         raise
+
+
+def _rate_table() -> Any:
+    """FX_MATRIX rates as a NumPy array, with a trailing row and column of NaN for unknown codes (position -1)."""
+
+    size: int = len(FX_MATRIX.currencies)
+    table = np.full((size + 1, size + 1), np.nan)
+    for i, row in enumerate(FX_MATRIX.rates):
+        table[i, :size] = [np.nan if rate is None else rate for rate in row]
+    return table
+
+
+# Gathered from by the NumPy path of fx_convert_many
+_RATE_TABLE = _rate_table() if np is not None else None
+
+
+def _code_positions(codes: Union[str, Collection[str]], size: int) -> Any:
+    """Position in FX_MATRIX of each amount's currency code, -1 where the code is not indexed (NumPy path)."""
+
+    index: Dict[str, int] = FX_MATRIX.index
+    if isinstance(codes, str):
+        return np.full(size, index.get(codes, index.get(codes.lower(), -1)), dtype=np.intp)
+    if isinstance(codes, np.ndarray) and codes.dtype.kind == "U":
+        # One vectorized comparison per indexed code, without creating a Python string per amount
+        positions = np.full(size, -1, dtype=np.intp)
+        for code, position in index.items():
+            positions[codes == code] = position
+        return positions
+    return np.fromiter(map(index.get, codes, itertools.repeat(-1)), dtype=np.intp, count=size)
+
+
+def _code_at(codes: Union[str, Collection[str]], k: int) -> str:
+    return codes if isinstance(codes, str) else str(codes[k])
+
+
+def _convert_vectorized(
+    amounts: Collection[float], from_currencies: Union[str, Collection[str]], to_currencies: Union[str, Collection[str]]
+) -> Optional[List[float]]:
+    """
+    Convert an array of amounts with NumPy, or return None to use the Python path.
+
+    Only NumPy arrays and buffer-protocol objects of at least VECTOR_MIN_SIZE
+    amounts qualify. Codes are mapped to their FX_MATRIX positions and every
+    amount's rate is gathered from the rate table in one indexing step.
+    Products are rounded with `rint` after scaling by 100; where the scaled
+    product is within rounding error of a tie, too large for its fraction
+    to be exact, or has no table rate (a code in another case, or unknown),
+    the result is recomputed as the scalar path does, so that every result
+    is exactly what `fx_convert` returns.
+    """
+
+    if np is None or isinstance(amounts, (list, tuple)) or len(amounts) < VECTOR_MIN_SIZE:
+        return None
+    try:
+        values = np.asarray(amounts, dtype=np.float64).reshape(-1)
+    except (TypeError, ValueError):
+        return None
+
+    rates = _RATE_TABLE[_code_positions(from_currencies, len(values)), _code_positions(to_currencies, len(values))]
+    products = values * rates
+    scaled = products * 100.0
+    results = np.rint(scaled) / 100.0
+
+    distance_to_tie = np.abs(scaled - np.floor(scaled) - 0.5)
+    unsure = np.flatnonzero(~(distance_to_tie > np.abs(scaled) * 1e-15) | ~(np.abs(scaled) < 2.0 ** 50))
+    missing: Dict[Tuple[str, str], Optional[float]] = {}
+    for k in unsure.tolist():
+        if not np.isnan(rates[k]):
+            results[k] = round(float(products[k]), 2)
+            continue
+        pair: Tuple[str, str] = (_code_at(from_currencies, k), _code_at(to_currencies, k))
+        if pair not in missing:
+            missing[pair] = FX_MATRIX.rate(*pair)
+            if missing[pair] is None:
+                logger.error("FX rate not found for %s -> %s. Returning 0.0", *pair)
+        rate: Optional[float] = missing[pair]
+        results[k] = round(float(values[k]) * rate, 2) if rate is not None else 0.0
+    return results.tolist()
+
+
+@typechecked
+def fx_convert_many(
+    amounts: Collection[float],
+    from_currencies: Union[str, Collection[str]],
+    to_currencies: Union[str, Collection[str]],
+    on: Optional[str] = None,
+) -> List[float]:
+    """
+    Convert a batch of amounts, looking each currency pair's rate up once.
+
+    Every result is what `fx_convert(amount, from_currency, to_currency, on)`
+    returns for the same inputs. Large NumPy or buffer arrays of amounts are
+    converted at today's rates in a few vectorized steps when NumPy is
+    installed; other inputs run one multiply and round per amount in a
+    comprehension.
+
+    Args:
+        amounts (Collection[float]): Amounts of money to convert (list, tuple, array.array, memoryview or NumPy array).
+        from_currencies (Union[str, Collection[str]]): Source currency per amount, or one code for all of them.
+        to_currencies (Union[str, Collection[str]]): Target currency per amount, or one code for all of them.
+        on (Optional[str]): ISO date of the rates to use for every amount; today's rates if None.
+
+    Returns:
+        List[float]: Converted amounts rounded to 2 decimal places (0.0 where no rate is known).
+
+    Raises:
+        ValueError: If the amounts and the currency collections differ in length, or `on` is not an ISO date.
+    """
+
+    size: int = len(amounts)
+    if any(not isinstance(codes, str) and len(codes) != size for codes in (from_currencies, to_currencies)):
+        raise ValueError("amounts, from_currencies and to_currencies must have the same length")
+
+    logger.info("Starting batched FX conversion of %d amounts", size)
+
+    results: Optional[List[float]] = _convert_vectorized(amounts, from_currencies, to_currencies) if on is None else None
+    if results is not None:
+        logger.info("Finished vectorized FX conversion of %d amounts", size)
+        return results
+
+    sources: Iterable[str] = itertools.repeat(from_currencies) if isinstance(from_currencies, str) else from_currencies
+    targets: Iterable[str] = itertools.repeat(to_currencies) if isinstance(to_currencies, str) else to_currencies
+    pairs: List[Tuple[str, str]] = list(itertools.islice(zip(sources, targets), size))
+
+    rates: Dict[Tuple[str, str], Optional[float]] = {
+        pair: FX_MATRIX.rate(*pair) if on is None else fx_history().rate(*pair, on) for pair in set(pairs)
+    }
+    for (from_currency, to_currency), rate in rates.items():
+        if rate is None:
+            logger.error("FX rate not found for %s -> %s. Returning 0.0", from_currency, to_currency)
+
+    results = [
+        round(amount * rate, 2) if (rate := rates[pair]) is not None else 0.0
+        for amount, pair in zip(amounts, pairs)
+    ]
+    logger.info("Finished batched FX conversion over %d currency pairs", len(rates))
+    return results
@@ -0,0 +1,212 @@
+from array import array
+from bisect import bisect_left, insort
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+# A raw knowledge-base entry as loaded from the KB file ({"name": ..., "summary": ...})
+KBItem = Dict[str, Any]
+
+# Length of the character n-grams of the fuzzy index
+GRAM_SIZE = 3
+
+
+def _grams(key: str) -> Set[str]:
+    return {key[i:i + GRAM_SIZE] for i in range(len(key) - GRAM_SIZE + 1)}
+
+
+def edit_distance(a: str, b: str, bound: int) -> int:
+    """
+    Levenshtein distance between two strings, or bound + 1 once it is known to exceed bound.
+
+    Only the diagonal band of width 2 * bound + 1 is computed.
+    """
+
+    if abs(len(a) - len(b)) > bound:
+        return bound + 1
+    if len(a) > len(b):
+        a, b = b, a
+
+    over: int = bound + 1
+    previous: List[int] = list(range(len(b) + 1))
+    for i in range(1, len(a) + 1):
+        low: int = max(1, i - bound)
+        high: int = min(len(b), i + bound)
+        current: List[int] = [over] * (len(b) + 1)
+        current[0] = i if i <= bound else over
+        char: str = a[i - 1]
+        for j in range(low, high + 1):
+            cost: int = previous[j - 1] + (char != b[j - 1])
+            if previous[j] + 1 < cost:
+                cost = previous[j] + 1
+            if current[j - 1] + 1 < cost:
+                cost = current[j - 1] + 1
+            current[j] = cost if cost < over else over
+        if min(current[low - 1:high + 1]) > bound:
+            return over
+        previous = current
+    return previous[len(b)]
+
+
+class KBIndex:
+    """
+    Name index over the knowledge-base entries, built once when the KB loads.
+
+    Exact lookups go through a hash map of casefolded names; prefix lookups
+    bisect a sorted array of the same keys and read the run of keys that
+    start with the prefix. When two entries share a name, the first one
+    wins, as with the linear scan this index replaces.
+
+    Fuzzy lookups go through an inverted index of the names' character
+    trigrams. Split the query into k + 1 pieces: k edits leave at least one
+    piece untouched, so a name within edit distance k contains that piece
+    within k characters of its place in the query. For each piece only the
+    names in the postings of its rarest trigram are checked for the piece,
+    and the few candidates left are checked with a bounded edit distance.
+
+    `updated` follows a version of the KB that adds or removes a few names
+    without a rebuild: the trigram postings of removed names are left in
+    place and skipped, and only the postings of the added names' trigrams
+    are copied.
+    """
+
+    __slots__ = ("by_name", "keys", "names", "postings")
+
+    def __init__(self, entries: Iterable[KBItem]):
+        self.by_name: Dict[str, KBItem] = {}
+        for item in entries:
+            self.by_name.setdefault(item.get("name", "").casefold(), item)
+        self.keys: List[str] = sorted(self.by_name)
+        # Names by id in the trigram postings: `keys` at first, then the names added by `updated`
+        self.names: List[str] = self.keys
+
+        # Ids of the names containing each trigram, ascending
+        self.postings: Dict[str, array] = {}
+        for position, key in enumerate(self.names):
+            for gram in _grams(key):
+                postings: Optional[array] = self.postings.get(gram)
+                if postings is None:
+                    postings = self.postings[gram] = array("i")
+                postings.append(position)
+
+    def __len__(self) -> int:
+        return len(self.by_name)
+
+    def updated(self, entries: Iterable[KBItem], max_changes: int) -> Optional["KBIndex"]:
+        """
+        Index of a new version of the KB that reuses this one, which is left unchanged.
+
+        Args:
+            entries (Iterable[KBItem]): Every entry of the new version, in KB order.
+            max_changes (int): Most names added or removed since the last full build.
+
+        Returns:
+            Optional[KBIndex]: The new index, or None when more names changed.
+        """
+
+        by_name: Dict[str, KBItem] = {}
+        for item in entries:
+            by_name.setdefault(item.get("name", "").casefold(), item)
+        added: List[str] = sorted(by_name.keys() - self.by_name.keys())
+        removed: Set[str] = self.by_name.keys() - by_name.keys()
+        # Ids of names removed since the last full build stay in `names`, unused
+        if len(self.names) - len(self.by_name) + len(removed) + len(added) > max_changes:
+            return None
+
+        index: KBIndex = KBIndex.__new__(KBIndex)
+        index.by_name = by_name
+        index.keys = [key for key in self.keys if key not in removed] if removed else list(self.keys)
+        for key in added:
+            insort(index.keys, key)
+        index.names = self.names + added
+        index.postings = dict(self.postings)
+        copied: Set[str] = set()
+        for position, key in enumerate(added, len(self.names)):
+            for gram in _grams(key):
+                if gram not in copied:
+                    copied.add(gram)
+                    index.postings[gram] = array("i", self.postings.get(gram, ()))
+                index.postings[gram].append(position)
+        return index
+
+    def get(self, name: str) -> Optional[KBItem]:
+        """Entry whose name equals `name` ignoring case, or None."""
+
+        return self.by_name.get(name.casefold())
+
+    def get_many(self, names: Iterable[str]) -> List[Optional[KBItem]]:
+        """What `get` returns for each name, in order."""
+
+        by_name: Dict[str, KBItem] = self.by_name
+        return [by_name.get(name.casefold()) for name in names]
+
+    def with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[KBItem]:
+        """
+        Entries whose name starts with `prefix` ignoring case, in name order.
+
+        Args:
+            prefix (str): Start of the name; "" matches every entry.
+            limit (Optional[int]): Maximum number of entries to return; all of them if None.
+
+        Returns:
+            List[KBItem]: The matching entries.
+        """
+
+        key: str = prefix.casefold()
+        keys: List[str] = self.keys
+        start: int = bisect_left(keys, key)
+        end: int = start
+        stop: int = len(keys) if limit is None else min(len(keys), start + limit)
+        while end < stop and keys[end].startswith(key):
+            end += 1
+        return [self.by_name[name] for name in keys[start:end]]
+
+    def search(self, name: str, max_distance: int, limit: Optional[int] = None) -> List[Tuple[int, KBItem]]:
+        """
+        Entries whose name is within an edit distance of `name` ignoring case, closest first.
+
+        Short names are matched with a smaller distance, so that every piece
+        of the query still holds a trigram: names under 2 * GRAM_SIZE
+        characters only match exactly.
+
+        Args:
+            name (str): The possibly misspelled name.
+            max_distance (int): Largest edit distance (insertions, deletions, substitutions) of a match.
+            limit (Optional[int]): Maximum number of entries to return; all of them if None.
+
+        Returns:
+            List[Tuple[int, KBItem]]: (distance, entry) pairs ranked by distance, then by name.
+        """
+
+        key: str = name.casefold()
+        distance: int = min(max_distance, len(key) // GRAM_SIZE - 1)
+        if distance <= 0:
+            item: Optional[KBItem] = self.by_name.get(key)
+            return [(0, item)] if item is not None and limit != 0 else []
+
+        matches: List[Tuple[int, str]] = []
+        for candidate in {self.names[position] for position in self.candidates(key, distance)} & self.by_name.keys():
+            found: int = edit_distance(key, candidate, distance)
+            if found <= distance:
+                matches.append((found, candidate))
+        matches.sort()
+        return [(found, self.by_name[candidate]) for found, candidate in matches[:limit]]
+
+    def candidates(self, key: str, distance: int) -> Set[int]:
+        """
+        Ids of the names that contain one of distance + 1 pieces of `key` near its place.
+
+        Every name within `distance` edits of `key` is among them. `key` must
+        be casefolded and at least (distance + 1) * GRAM_SIZE characters long.
+        """
+
+        empty: array = array("i")
+        names: List[str] = self.names
+        found: Set[int] = set()
+        pieces: int = distance + 1
+        for i in range(pieces):
+            start: int = len(key) * i // pieces
+            piece: str = key[start:len(key) * (i + 1) // pieces]
+            postings: array = min((self.postings.get(gram, empty) for gram in _grams(piece)), key=len)
+            low: int = max(0, start - distance)
+            high: int = start + len(piece) + distance
+            found.update(position for position in postings if names[position].find(piece, low, high) >= 0)
+        return found
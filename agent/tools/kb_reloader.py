@@ -0,0 +1,155 @@
+import os
+import threading
+from typing import Callable, List, Optional, Sequence, Tuple, Union
+from utils.logger import get_logger
+from .kb_index import KBIndex, KBItem
+from .kb_store import KBStore
+from .kb_text_index import SummaryIndex
+
+logger = get_logger(__name__)
+
+# A watched file as last seen: (modification time in ns, size), or None while it does not exist
+Stamp = Optional[Tuple[int, int]]
+
+
+def _stamp(path: str) -> Stamp:
+    try:
+        stat: os.stat_result = os.stat(path)
+    except OSError:
+        return None
+    return stat.st_mtime_ns, stat.st_size
+
+
+class KBSnapshot:
+    """
+    One version of the KB and its indexes, replaced as a whole when the KB is reloaded.
+
+    Readers take the current snapshot once per lookup and use it without
+    locks: nothing in it changes once built, except that the full-text
+    index of a KB store is built on first use.
+    """
+
+    __slots__ = ("index", "store", "_summaries", "_lock")
+
+    def __init__(self, index: Union[KBIndex, KBStore], summaries: Optional[SummaryIndex], store: Optional[KBStore] = None):
+        self.index: Union[KBIndex, KBStore] = index
+        self.store: Optional[KBStore] = store
+        self._summaries: Optional[SummaryIndex] = summaries
+        self._lock = threading.Lock()
+
+    @classmethod
+    def from_entries(cls, entries: List[KBItem], previous: Optional["KBSnapshot"] = None, max_changes: int = 0) -> "KBSnapshot":
+        """
+        Index KB entries, updating the indexes of the previous version when few entries changed.
+
+        Args:
+            entries (List[KBItem]): Every entry of the KB, in order.
+            previous (Optional[KBSnapshot]): The version being replaced, if any.
+            max_changes (int): Most entries changed since the last full build for an index to be updated.
+
+        Returns:
+            KBSnapshot: The new version.
+        """
+
+        index: Optional[KBIndex] = None
+        summaries: Optional[SummaryIndex] = None
+        if previous is not None and previous.store is None:
+            index = previous.index.updated(entries, max_changes)
+            summaries = previous.summaries().updated(entries, max_changes)
+        logger.info(
+            "Indexed %d KB entries (name index %s, full-text index %s)", len(entries),
+            "updated" if index is not None else "rebuilt", "updated" if summaries is not None else "rebuilt",
+        )
+        return cls(
+            index if index is not None else KBIndex(entries),
+            summaries if summaries is not None else SummaryIndex(entries),
+        )
+
+    @classmethod
+    def from_store(cls, store: KBStore) -> "KBSnapshot":
+        """The KB of an on-disk store, whose full-text index is built on first use."""
+
+        return cls(store, None, store)
+
+    def summaries(self) -> SummaryIndex:
+        """The full-text index over the summaries."""
+
+        if self._summaries is None:
+            with self._lock:
+                if self._summaries is None:
+                    logger.info("Building the full-text index of the KB store at %s", self.store.directory)
+                    self._summaries = SummaryIndex(self.store.entries() if self.store is not None else [])
+        return self._summaries
+
+
+class KBReloader:
+    """
+    Keeps a KB snapshot in step with the files it is loaded from.
+
+    Once started, a daemon thread compares the files' modification time and
+    size every `interval` seconds. When they change, it loads and indexes the new
+    version off the request path, then rebinds `snapshot` in one step:
+    readers never wait for a reload nor see a partly built index. A
+    version that fails to load is logged and the current snapshot kept.
+    """
+
+    def __init__(self, paths: Sequence[str], load: Callable[[Optional[KBSnapshot]], KBSnapshot], interval: float):
+        """
+        Args:
+            paths (Sequence[str]): Files whose changes trigger a reload.
+            load (Callable[[Optional[KBSnapshot]], KBSnapshot]): Loads the KB given the snapshot it replaces (None at first).
+            interval (float): Seconds between checks of the files; 0 never checks.
+        """
+
+        self.paths: List[str] = list(paths)
+        self.load: Callable[[Optional[KBSnapshot]], KBSnapshot] = load
+        self.interval: float = interval
+        self.stamps: List[Stamp] = [_stamp(path) for path in self.paths]
+        self.snapshot: KBSnapshot = load(None)
+        self._check_lock = threading.Lock()
+        self._stopped = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def check(self) -> bool:
+        """
+        Reload the KB if its files changed since the last check.
+
+        Returns:
+            bool: Whether a new snapshot was swapped in.
+        """
+
+        with self._check_lock:
+            stamps: List[Stamp] = [_stamp(path) for path in self.paths]
+            if stamps == self.stamps:
+                return False
+            changed: List[str] = [path for path, old, new in zip(self.paths, self.stamps, stamps) if old != new]
+            # A version that fails to load is not retried until the files change again
+            self.stamps = stamps
+            try:
+                snapshot: KBSnapshot = self.load(self.snapshot)
+            except Exception as e:
+                logger.error("Failed to reload the KB, keeping the current version: %s", e, exc_info=True)
+                return False
+            self.snapshot = snapshot
+            logger.info("Reloaded the KB after a change to %s", ", ".join(changed))
+            return True
+
+    def start(self) -> None:
+        """Start checking the files in a daemon thread, unless the interval is 0."""
+
+        if self._thread is None and self.interval > 0:
+            self._stopped.clear()
+            self._thread = threading.Thread(target=self._run, name="kb-reloader", daemon=True)
+            self._thread.start()
+
+    def stop(self) -> None:
+        """Stop the checking thread."""
+
+        self._stopped.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def _run(self) -> None:
+        while not self._stopped.wait(self.interval):
+            self.check()
@@ -0,0 +1,254 @@
+import json
+import mmap
+import os
+import struct
+import threading
+from array import array
+from bisect import bisect_left
+from typing import Dict, Iterable, Iterator, List, Optional, Tuple, Union
+from config.settings import KB_FILE_PATH, KB_STORE_PATH
+from utils.logger import get_logger
+from .kb_index import KBIndex, KBItem
+
+logger = get_logger(__name__)
+
+# Files of a store directory; the manifest is written last, so a store without one is incomplete
+MANIFEST_FILE = "manifest.json"
+NAMES_FILE = "names.bin"
+INDEX_FILE = "index.bin"
+SHARD_FILE = "shard-{:05d}.jsonl"
+STORE_VERSION = 1
+
+# Entries per shard file written by `write_store`
+SHARD_SIZE = 1_000_000
+
+# One record of the offset index, in name order: offset and length of the casefolded name in
+# NAMES_FILE, then the shard number, offset and length of the entry's line in that shard
+RECORD = struct.Struct("<QIIQI")
+_NAME = struct.Struct("<QI")
+
+# Every FENCE_STEP-th name of the offset index is kept in memory to narrow the bisection of the files
+FENCE_STEP = 64
+
+
+def write_store(entries: Iterable[KBItem], directory: str, shard_size: int = SHARD_SIZE) -> int:
+    """
+    Write KB entries as an on-disk store that `KBStore` opens.
+
+    Entries are written one JSON object per line, in order, to shards of
+    `shard_size` lines. The offset index holds one record per distinct
+    casefolded name, sorted, and points at the first entry of that name,
+    as `KBIndex` keeps the first of duplicate names. Every file is written
+    under a temporary name and moved into place, so a store that is open
+    elsewhere keeps reading the files it mapped.
+
+    Args:
+        entries (Iterable[KBItem]): The entries, e.g. the "entries" of the KB JSON file.
+        directory (str): Store directory, created if needed.
+        shard_size (int): Maximum number of entries per shard file.
+
+    Returns:
+        int: Number of entries written.
+    """
+
+    if shard_size <= 0:
+        raise ValueError(f"shard_size must be positive, got {shard_size}")
+    os.makedirs(directory, exist_ok=True)
+
+    keys: List[str] = []
+    shards: array = array("I")
+    offsets: array = array("Q")
+    lengths: array = array("I")
+    shard_files: List[str] = []
+    out = None
+    offset: int = 0
+    try:
+        for number, item in enumerate(entries):
+            if number % shard_size == 0:
+                if out is not None:
+                    out.close()
+                shard_files.append(SHARD_FILE.format(len(shard_files)))
+                out = open(os.path.join(directory, shard_files[-1] + ".tmp"), "wb")
+                offset = 0
+            line: bytes = json.dumps(item, ensure_ascii=False).encode("utf-8")
+            out.write(line + b"\n")
+            keys.append(item.get("name", "").casefold())
+            shards.append(len(shard_files) - 1)
+            offsets.append(offset)
+            lengths.append(len(line))
+            offset += len(line) + 1
+    finally:
+        if out is not None:
+            out.close()
+
+    # A stable sort keeps duplicate names in KB order, so the first one is indexed
+    order: List[int] = sorted(range(len(keys)), key=keys.__getitem__)
+    with open(os.path.join(directory, NAMES_FILE + ".tmp"), "wb") as names, \
+            open(os.path.join(directory, INDEX_FILE + ".tmp"), "wb") as index:
+        previous: Optional[str] = None
+        position: int = 0
+        for i in order:
+            if keys[i] == previous:
+                continue
+            previous = keys[i]
+            key: bytes = keys[i].encode("utf-8")
+            index.write(RECORD.pack(position, len(key), shards[i], offsets[i], lengths[i]))
+            names.write(key)
+            position += len(key)
+
+    with open(os.path.join(directory, MANIFEST_FILE + ".tmp"), "w", encoding="utf-8") as f:
+        json.dump({"version": STORE_VERSION, "entries": len(keys), "shards": shard_files}, f)
+    for name in shard_files + [NAMES_FILE, INDEX_FILE, MANIFEST_FILE]:
+        os.replace(os.path.join(directory, name + ".tmp"), os.path.join(directory, name))
+
+    logger.info("Wrote KB store at %s: %d entries in %d shards", directory, len(keys), len(shard_files))
+    return len(keys)
+
+
+def convert(kb_file: str = KB_FILE_PATH, directory: str = KB_STORE_PATH, shard_size: int = SHARD_SIZE) -> int:
+    """
+    Convert a KB JSON file ({"entries": [{"name": ..., "summary": ...}, ...]}) to an on-disk store.
+
+    `make kb-store` converts KB_FILE_PATH to KB_STORE_PATH, which `kb_tools` then reads instead.
+
+    Returns:
+        int: Number of entries written.
+    """
+
+    with open(kb_file, "r", encoding="utf-8") as f:
+        entries: List[KBItem] = json.load(f).get("entries", [])
+    return write_store(entries, directory, shard_size)
+
+
+def _map(path: str) -> Union[mmap.mmap, bytes]:
+    with open(path, "rb") as f:
+        if os.fstat(f.fileno()).st_size == 0:
+            return b""
+        # The map keeps its own handle on the file, which can be closed
+        return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+
+
+class KBStore:
+    """
+    Read-only KB opened from a store directory written by `write_store`.
+
+    The shards, the sorted names and the fixed-width offset index are
+    memory-mapped, so opening a store reads only its manifest and every
+    FENCE_STEP-th name, and the OS pages in the parts of the files that
+    lookups touch. An exact or prefix lookup bisects those names in memory,
+    then the FENCE_STEP records between two of them, comparing UTF-8 names
+    (whose byte order is their code point order), and decodes only the
+    entries it returns.
+
+    Offers the lookups of `KBIndex`. The trigram index of fuzzy lookups is
+    built over the names (not the summaries) on the first fuzzy lookup.
+    """
+
+    __slots__ = ("directory", "names", "index", "shards", "size", "fence", "_fuzzy", "_lock")
+
+    def __init__(self, directory: str):
+        with open(os.path.join(directory, MANIFEST_FILE), "r", encoding="utf-8") as f:
+            manifest: Dict = json.load(f)
+        if manifest.get("version") != STORE_VERSION:
+            raise ValueError(f"Unsupported KB store version {manifest.get('version')!r} in {directory}")
+
+        self.directory: str = directory
+        self.names: Union[mmap.mmap, bytes] = _map(os.path.join(directory, NAMES_FILE))
+        self.index: Union[mmap.mmap, bytes] = _map(os.path.join(directory, INDEX_FILE))
+        self.shards: List[Union[mmap.mmap, bytes]] = [
+            _map(os.path.join(directory, name)) for name in manifest.get("shards", [])
+        ]
+        self.size: int = len(self.index) // RECORD.size
+        self.fence: List[bytes] = [self._key(i) for i in range(0, self.size, FENCE_STEP)]
+        self._fuzzy: Optional[KBIndex] = None
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return self.size
+
+    def close(self) -> None:
+        """Unmap the store's files."""
+
+        for data in [self.names, self.index] + self.shards:
+            if isinstance(data, mmap.mmap):
+                data.close()
+
+    def _key(self, i: int) -> bytes:
+        offset, length = _NAME.unpack_from(self.index, i * RECORD.size)
+        return self.names[offset:offset + length]
+
+    def _position(self, key: bytes) -> int:
+        """Position in the offset index of the first name not below `key`."""
+
+        # fence[block - 1] < key <= fence[block], and fence[block] is the name at block * FENCE_STEP
+        block: int = bisect_left(self.fence, key)
+        low: int = (block - 1) * FENCE_STEP + 1 if block else 0
+        return bisect_left(range(self.size), key, low, min(self.size, block * FENCE_STEP), key=self._key)
+
+    def _entry(self, i: int) -> KBItem:
+        shard, offset, length = RECORD.unpack_from(self.index, i * RECORD.size)[2:]
+        return json.loads(self.shards[shard][offset:offset + length])
+
+    def get(self, name: str) -> Optional[KBItem]:
+        """Entry whose name equals `name` ignoring case, or None."""
+
+        key: bytes = name.casefold().encode("utf-8")
+        i: int = self._position(key)
+        return self._entry(i) if i < self.size and self._key(i) == key else None
+
+    def get_many(self, names: Iterable[str]) -> List[Optional[KBItem]]:
+        """What `get` returns for each name, in order."""
+
+        return [self.get(name) for name in names]
+
+    def with_prefix(self, prefix: str, limit: Optional[int] = None) -> List[KBItem]:
+        """
+        Entries whose name starts with `prefix` ignoring case, in name order.
+
+        Args:
+            prefix (str): Start of the name; "" matches every entry.
+            limit (Optional[int]): Maximum number of entries to return; all of them if None.
+
+        Returns:
+            List[KBItem]: The matching entries.
+        """
+
+        key: bytes = prefix.casefold().encode("utf-8")
+        i: int = self._position(key)
+        stop: int = self.size if limit is None else min(self.size, i + limit)
+        items: List[KBItem] = []
+        while i < stop and self._key(i).startswith(key):
+            items.append(self._entry(i))
+            i += 1
+        return items
+
+    def search(self, name: str, max_distance: int, limit: Optional[int] = None) -> List[Tuple[int, KBItem]]:
+        """What `KBIndex.search` returns for the store's entries."""
+
+        if self._fuzzy is None:
+            with self._lock:
+                if self._fuzzy is None:
+                    logger.info("Building the fuzzy name index of the KB store at %s", self.directory)
+                    self._fuzzy = KBIndex({"name": key.decode("utf-8")} for key in self.keys())
+        return [
+            (distance, self.get(item["name"]))
+            for distance, item in self._fuzzy.search(name, max_distance, limit)
+        ]
+
+    def keys(self) -> Iterator[bytes]:
+        """Casefolded UTF-8 names of the entries, in name order."""
+
+        names: Union[mmap.mmap, bytes] = self.names
+        for offset, length, _, _, _ in RECORD.iter_unpack(self.index):
+            yield names[offset:offset + length]
+
+    def entries(self) -> Iterator[KBItem]:
+        """Every entry, duplicates included, in the order of the KB it was written from."""
+
+        for data in self.shards:
+            start: int = 0
+            while start < len(data):
+                end: int = data.find(b"\n", start)
+                yield json.loads(data[start:end])
+                start = end + 1
+
@@ -0,0 +1,272 @@
+import heapq
+from array import array
+from bisect import bisect_left
+from collections import Counter
+from itertools import chain
+from math import log
+from typing import Dict, FrozenSet, Iterable, Iterator, List, Optional, Tuple
+from constants.miscellaneous_constants import KB_BM25_B, KB_BM25_K1, KB_STOPWORDS
+from constants.regex_constants import KB_TERM_PATTERN
+from .kb_index import KBItem
+
+# A term's postings: ascending document ids, the term's frequency in each, and, for each
+# frequency above 1, the indexes of the postings with that frequency (ascending)
+Postings = Tuple[array, array, Tuple[array, ...]]
+
+_NO_POSTINGS: Postings = (array("i"), array("i"), ())
+
+# Relative margin over the bound on unseen scores: a score sums its terms in another order than the bound,
+# so it can exceed it by a rounding error
+_BOUND_SLACK = 1 + 1e-9
+
+
+def terms(text: str) -> List[str]:
+    """Casefolded words of a text, without stopwords."""
+
+    return [term for term in KB_TERM_PATTERN.findall(text.casefold()) if term not in KB_STOPWORDS]
+
+
+def _identity(item: KBItem) -> str:
+    # A string rather than a (name, summary) tuple, which the garbage collector would track;
+    # the name's length keeps the two apart
+    name: str = item.get("name", "")
+    return f"{len(name)}:{name}{item.get('summary', '')}"
+
+
+class SummaryIndex:
+    """
+    Inverted index over the KB summaries with BM25 ranking, built once when the KB loads.
+
+    Entries get document ids in order of increasing summary length, and each
+    term keeps typed arrays of the ids of the summaries holding it and of
+    its frequency there. A term's impact on a summary (its BM25 score
+    before the idf) only falls as the summary gets longer, so the postings
+    of any one frequency, read in id order, come by decreasing impact; a
+    query merges those with a frequency of 1 with the few runs of higher
+    frequencies.
+
+    A query reads its terms' postings by decreasing impact, round-robin, and
+    scores every new summary in full by bisecting the other terms' postings
+    (Fagin's threshold algorithm). It stops once the k-th best score
+    exceeds the most that any summary not yet seen could score, which for
+    queries of frequent words is long before their postings run out.
+
+    `updated` follows a version of the KB that differs in a few entries
+    without a rebuild: the postings are shared, the summaries removed are
+    skipped, and the ones added get small postings of their own, scored in
+    full by every query.
+    """
+
+    __slots__ = ("items", "positions", "lengths", "total", "base", "postings", "removed", "dropped", "extra")
+
+    def __init__(self, entries: Iterable[KBItem]):
+        items: List[KBItem] = list(entries)
+        lengths: List[int] = [len(terms(item.get("summary", ""))) for item in items]
+
+        # Document id -> position in the KB, shortest summaries first (ties in KB order)
+        self.positions: array = array("i", sorted(range(len(items)), key=lengths.__getitem__))
+        self.items: List[KBItem] = [items[position] for position in self.positions]
+        self.lengths: array = array("i", (lengths[position] for position in self.positions))
+        self.total: int = sum(lengths)
+        # Documents in `postings`; the ones after them were added by `updated`
+        self.base: int = len(items)
+
+        runs: Dict[str, Dict[int, array]] = {}
+        self.postings: Dict[str, Postings] = {}
+        for document, item in enumerate(self.items):
+            for term, count in Counter(terms(item.get("summary", ""))).items():
+                postings: Optional[Postings] = self.postings.get(term)
+                if postings is None:
+                    postings = self.postings[term] = (array("i"), array("i"), ())
+                if count > 1:
+                    runs.setdefault(term, {}).setdefault(count, array("i")).append(len(postings[0]))
+                postings[0].append(document)
+                postings[1].append(count)
+        for term, by_count in runs.items():
+            documents, counts, _ = self.postings[term]
+            self.postings[term] = (documents, counts, tuple(by_count.values()))
+
+        # Documents removed by `updated`, and how many of them hold each term
+        self.removed: FrozenSet[int] = frozenset()
+        self.dropped: Dict[str, int] = {}
+        # Postings of the documents added by `updated`
+        self.extra: Dict[str, Postings] = {}
+
+    def __len__(self) -> int:
+        return len(self.items) - len(self.removed)
+
+    def updated(self, entries: List[KBItem], max_changes: int) -> Optional["SummaryIndex"]:
+        """
+        Index of a new version of the KB that reuses this one, which is left unchanged.
+
+        Entries are matched by name and summary; the new index ranks as one
+        built from scratch would.
+
+        Args:
+            entries (List[KBItem]): Every entry of the new version, in KB order.
+            max_changes (int): Most summaries removed or added since the last full build.
+
+        Returns:
+            Optional[SummaryIndex]: The new index, or None when more entries changed.
+        """
+
+        base: int = self.base
+        # Live documents by identity, and the others of identities that several documents share
+        pool: Dict[str, int] = {}
+        duplicates: Dict[str, List[int]] = {}
+        for document, item in enumerate(self.items):
+            if document not in self.removed:
+                identity: str = _identity(item)
+                if identity in pool:
+                    duplicates.setdefault(identity, []).append(document)
+                else:
+                    pool[identity] = document
+
+        # Old document id -> position in the new version (-1 once removed)
+        positions: array = array("i", [-1]) * len(self.items)
+        added: List[Tuple[int, KBItem]] = []
+        for position, item in enumerate(entries):
+            identity = _identity(item)
+            document: int = pool.pop(identity, -1)
+            if document < 0 and duplicates.get(identity):
+                document = duplicates[identity].pop()
+            if document >= 0:
+                positions[document] = position
+            else:
+                added.append((position, item))
+                if len(self.removed) + len(added) > max_changes:
+                    return None
+
+        removed: FrozenSet[int] = self.removed.union(
+            document for document in chain(pool.values(), *duplicates.values()) if document < base
+        )
+        kept: List[int] = [document for document in range(base, len(self.items)) if positions[document] >= 0]
+        if len(removed) + len(kept) + len(added) > max_changes:
+            return None
+
+        index: SummaryIndex = SummaryIndex.__new__(SummaryIndex)
+        index.base = base
+        index.postings = self.postings
+        index.removed = removed
+        index.dropped = dict(Counter(
+            term for document in removed for term in set(terms(self.items[document].get("summary", "")))
+        ))
+        index.items = self.items[:base] + [self.items[document] for document in kept] + [item for _, item in added]
+        index.positions = positions[:base]
+        index.positions.extend(positions[document] for document in kept)
+        index.positions.extend(position for position, _ in added)
+        index.lengths = self.lengths[:base]
+        index.lengths.extend(self.lengths[document] for document in kept)
+        index.lengths.extend(len(terms(item.get("summary", ""))) for _, item in added)
+        index.total = sum(index.lengths) - sum(self.lengths[document] for document in removed)
+        index.extra = {}
+        for document in range(base, len(index.items)):
+            for term, count in Counter(terms(index.items[document].get("summary", ""))).items():
+                postings: Postings = index.extra.setdefault(term, (array("i"), array("i"), ()))
+                postings[0].append(document)
+                postings[1].append(count)
+        return index
+
+    def _by_impact(self, postings: Postings, norm: float, scale: float) -> Iterator[Tuple[float, int]]:
+        """(impact, document id) of a term's postings, by decreasing impact."""
+
+        documents, counts, runs = postings
+        lengths: array = self.lengths
+
+        def impact(i: int) -> float:
+            return counts[i] / (counts[i] + norm + scale * lengths[documents[i]])
+
+        # Next posting of each run of frequencies above 1, as (-impact, run, index in the run)
+        heads: List[Tuple[float, int, int]] = [(-impact(run[0]), r, 0) for r, run in enumerate(runs)]
+        heapq.heapify(heads)
+        for i, document in enumerate(documents):
+            if counts[i] > 1:
+                continue
+            current: float = 1 / (1 + norm + scale * lengths[document])
+            while heads and -heads[0][0] >= current:
+                negative, r, k = heads[0]
+                yield -negative, documents[runs[r][k]]
+                if k + 1 < len(runs[r]):
+                    heapq.heapreplace(heads, (-impact(runs[r][k + 1]), r, k + 1))
+                else:
+                    heapq.heappop(heads)
+            yield current, document
+        while heads:
+            negative, r, k = heapq.heappop(heads)
+            yield -negative, documents[runs[r][k]]
+            if k + 1 < len(runs[r]):
+                heapq.heappush(heads, (-impact(runs[r][k + 1]), r, k + 1))
+
+    def search(self, query: str, k: int) -> List[Tuple[float, KBItem]]:
+        """
+        Entries whose summary best matches a query under BM25.
+
+        Args:
+            query (str): Free text, e.g. "who worked on the Analytical Engine".
+            k (int): Number of entries to return.
+
+        Returns:
+            List[Tuple[float, KBItem]]: Up to k (score, entry) pairs, best first (ties in KB order).
+        """
+
+        size: int = len(self)
+        weighted: List[Tuple[float, Postings, Postings]] = []
+        for term in set(terms(query)):
+            postings: Postings = self.postings.get(term, _NO_POSTINGS)
+            extra: Postings = self.extra.get(term, _NO_POSTINGS)
+            df: int = len(postings[0]) - self.dropped.get(term, 0) + len(extra[0])
+            if df > 0:
+                weighted.append((log(1 + (size - df + 0.5) / (df + 0.5)) * (KB_BM25_K1 + 1), postings, extra))
+        if not weighted or k <= 0:
+            return []
+
+        # Length normalization of BM25, k1 * (1 - b + b * length / average length), as norm + scale * length
+        norm: float = KB_BM25_K1 * (1 - KB_BM25_B)
+        scale: float = KB_BM25_K1 * KB_BM25_B * size / self.total
+        lengths: array = self.lengths
+        positions: array = self.positions
+        removed: FrozenSet[int] = self.removed
+
+        # The best k as (score, -position in the KB, document id); the worst on top
+        best: List[Tuple[float, int, int]] = []
+
+        def offer(score: float, document: int) -> None:
+            entry: Tuple[float, int, int] = (score, -positions[document], document)
+            if len(best) < k:
+                heapq.heappush(best, entry)
+            elif entry > best[0]:
+                heapq.heapreplace(best, entry)
+
+        # Added documents are few: score them all
+        added: Dict[int, float] = {}
+        for weight, _, (documents, counts, _) in weighted:
+            for document, count in zip(documents, counts):
+                added[document] = added.get(document, 0.0) + weight * count / (count + norm + scale * lengths[document])
+        for document, score in added.items():
+            offer(score, document)
+
+        def score(document: int) -> float:
+            total: float = 0.0
+            for weight, (documents, counts, _), _ in weighted:
+                found: int = bisect_left(documents, document)
+                if found < len(documents) and documents[found] == document:
+                    total += weight * counts[found] / (counts[found] + norm + scale * lengths[document])
+            return total
+
+        seen: set = set()
+        streams: List[Iterator[Tuple[float, int]]] = [self._by_impact(postings, norm, scale) for _, postings, _ in weighted]
+        # Most that an unread posting of each term adds to a score: its weight times the last impact read
+        bounds: List[float] = [weight for weight, _, _ in weighted]
+        # A summary not yet seen can still tie the k-th best score and come earlier in the KB
+        while any(bounds) and (len(best) < k or best[0][0] <= sum(bounds) * _BOUND_SLACK):
+            for t, stream in enumerate(streams):
+                if not bounds[t]:
+                    continue
+                impact, document = next(stream, (0.0, -1))
+                bounds[t] = weighted[t][0] * impact
+                if document < 0 or document in seen or document in removed:
+                    continue
+                seen.add(document)
+                offer(score(document), document)
+
+        return [(found, self.items[document]) for found, _, document in sorted(best, reverse=True)]
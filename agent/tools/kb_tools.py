@@ -1,25 +1,92 @@
 import json
-from typing import Any, Dict
-from config.settings import KB_FILE_PATH
+import os
+from typing import List, Optional, Union
+from config.settings import (
+    KB_FILE_PATH, KB_FUZZY_MAX_DISTANCE, KB_RELOAD_INTERVAL_SECONDS, KB_RELOAD_MAX_CHANGES, KB_SEARCH_TOP_K, KB_STORE_PATH
+)
 from ..types.tool_types import KBData
+from .kb_index import KBIndex, KBItem
+from .kb_reloader import KBReloader, KBSnapshot
+from .kb_store import MANIFEST_FILE, KBStore
 from utils.logger import get_logger
-from typeguard import typechecked
+from utils.type_checking import typechecked
 
 logger = get_logger(__name__)
 
-# Loading KB File once at module load
-try:
-    with open(KB_FILE_PATH, "r", encoding="utf-8") as f:
-        KB_DATA: KBData = json.load(f)
-        logger.info("Loaded KB data with %d entries", len(KB_DATA.get("entries", [])))
-except Exception as e:
-    logger.error("Failed to load KB data from %s: %s", KB_FILE_PATH, e)
-    KB_DATA: KBData = {"entries": []}
+
+def _load(previous: Optional[KBSnapshot]) -> KBSnapshot:
+    """
+    Load the KB: the on-disk store when KB_FILE_PATH was converted to one, else KB_FILE_PATH.
+
+    The indexes of `previous` are updated rather than rebuilt when at most
+    KB_RELOAD_MAX_CHANGES entries changed.
+    """
+
+    if os.path.exists(os.path.join(KB_STORE_PATH, MANIFEST_FILE)):
+        try:
+            store: KBStore = KBStore(KB_STORE_PATH)
+            logger.info("Opened KB store at %s with %d names", KB_STORE_PATH, len(store))
+            return KBSnapshot.from_store(store)
+        except Exception as e:
+            logger.error("Failed to open KB store at %s: %s", KB_STORE_PATH, e)
+
+    try:
+        with open(KB_FILE_PATH, "r", encoding="utf-8") as f:
+            data: KBData = json.load(f)
+            logger.info("Loaded KB data with %d entries", len(data.get("entries", [])))
+    except Exception as e:
+        logger.error("Failed to load KB data from %s: %s", KB_FILE_PATH, e)
+        if previous is not None:
+            raise
+        data = {"entries": []}
+    return KBSnapshot.from_entries(data.get("entries", []), previous, KB_RELOAD_MAX_CHANGES)
+
+
+# Loading the KB once at module load, then again whenever KB_FILE_PATH or the store changes once
+# `start_kb_reloader` was called: name index (exact lookups by casefolded name, prefix lookups by bisection,
+# fuzzy lookups through a trigram index) and full-text index over the summaries, ranked with BM25
+KB_RELOADER: KBReloader = KBReloader(
+    [KB_FILE_PATH, os.path.join(KB_STORE_PATH, MANIFEST_FILE)], _load, KB_RELOAD_INTERVAL_SECONDS
+)
+
+
+def start_kb_reloader() -> None:
+    """
+    Reload the KB in a background thread whenever KB_FILE_PATH or the store changes.
+
+    Meant for long-running hosts; the files are checked every
+    KB_RELOAD_INTERVAL_SECONDS (never if 0). Until this is called the KB
+    loaded at import is kept.
+    """
+
+    KB_RELOADER.start()
+
+
+def stop_kb_reloader() -> None:
+    """Stop the background reloading started by `start_kb_reloader`."""
+
+    KB_RELOADER.stop()
+
+
+def _find(index: Union[KBIndex, KBStore], q: str) -> Optional[KBItem]:
+    """Entry named `q` ignoring case, else the closest name within KB_FUZZY_MAX_DISTANCE edits."""
+
+    item: Optional[KBItem] = index.get(q)
+    if item is None and KB_FUZZY_MAX_DISTANCE > 0:
+        matches = index.search(q, KB_FUZZY_MAX_DISTANCE, limit=1)
+        if matches:
+            distance, item = matches[0]
+            logger.info("Matched KB query '%s' to '%s' (edit distance %d)", q, item.get("name", ""), distance)
+    return item
+
 
 @typechecked
 def kb_lookup(q: str) -> str:
     """
-    Lookup a query in the knowledge base (KB) JSON file.
+    Lookup a query in the knowledge base (KB) JSON file or store.
+
+    Names match ignoring case; a misspelled name ("alan turin") matches the
+    closest entry name within KB_FUZZY_MAX_DISTANCE edits.
 
     Args:
         q (str): The query string to search for in the KB.
@@ -33,11 +100,11 @@ def kb_lookup(q: str) -> str:
 
     logger.info("Starting KB lookup for query: '%s'", q)
     try:
-        for item in KB_DATA.get("entries", []):
-            if q.lower() == item.get("name", "").lower():
-                summary: str = item["summary"]
-                logger.info("Found KB entry for '%s': %s", q, summary)
-                return summary
+        item: Optional[KBItem] = _find(KB_RELOADER.snapshot.index, q)
+        if item is not None:
+            summary: str = item["summary"]
+            logger.info("Found KB entry for '%s': %s", q, summary)
+            return summary
 
         logger.info("No KB entry found for query: '%s'", q)
         return "No entry found."
@@ -45,3 +112,103 @@ def kb_lookup(q: str) -> str:
     except Exception as e:
         logger.error("Error during KB lookup for query '%s': %s", q, e, exc_info=True)
         return f"KB error: {e}"
+
+
+@typechecked
+def kb_lookup_many(queries: List[str]) -> List[str]:
+    """
+    Lookup a batch of queries in the knowledge base with one index probe per query.
+
+    Every result is what `kb_lookup(q)` returns for the same query.
+
+    Args:
+        queries (List[str]): Query strings to search for in the KB.
+
+    Returns:
+        List[str]: One summary (or "No entry found.") per query, in order.
+    """
+
+    logger.info("Starting batched KB lookup for %d queries", len(queries))
+    try:
+        index: Union[KBIndex, KBStore] = KB_RELOADER.snapshot.index
+        items: List[Optional[KBItem]] = index.get_many(queries)
+        items = [item if item is not None else _find(index, q) for q, item in zip(queries, items)]
+        logger.info("Batched KB lookup matched %d of %d queries", sum(item is not None for item in items), len(queries))
+        return [item["summary"] if item is not None else "No entry found." for item in items]
+
+    except Exception as e:
+        logger.error("Error during batched KB lookup: %s", e, exc_info=True)
+        return [f"KB error: {e}"] * len(queries)
+
+
+@typechecked
+def kb_lookup_prefix(prefix: str, limit: Optional[int] = None) -> List[str]:
+    """
+    List the names of the knowledge-base entries that start with a prefix, ignoring case.
+
+    Args:
+        prefix (str): Start of the name, e.g. "ada".
+        limit (Optional[int]): Maximum number of names to return; all of them if None.
+
+    Returns:
+        List[str]: Matching names in alphabetical order (empty if none match).
+    """
+
+    logger.info("Starting KB prefix lookup for '%s'", prefix)
+    names: List[str] = [item.get("name", "") for item in KB_RELOADER.snapshot.index.with_prefix(prefix, limit)]
+    logger.info("KB prefix lookup for '%s' matched %d entries", prefix, len(names))
+    return names
+
+
+@typechecked
+def kb_search_names(q: str, max_distance: Optional[int] = None, limit: int = 5) -> List[str]:
+    """
+    Rank the knowledge-base entry names closest to a possibly misspelled query.
+
+    Args:
+        q (str): The query, e.g. "ada lovelac".
+        max_distance (Optional[int]): Largest edit distance of a match; KB_FUZZY_MAX_DISTANCE if None.
+        limit (int): Maximum number of names to return.
+
+    Returns:
+        List[str]: Matching names, closest first (ties in alphabetical order).
+    """
+
+    distance: int = KB_FUZZY_MAX_DISTANCE if max_distance is None else max_distance
+    logger.info("Starting KB name search for '%s' within %d edits", q, distance)
+    names: List[str] = [item.get("name", "") for _, item in KB_RELOADER.snapshot.index.search(q, distance, limit)]
+    logger.info("KB name search for '%s' matched %d entries", q, len(names))
+    return names
+
+
+@typechecked
+def kb_search(query: str, k: Optional[int] = None) -> str:
+    """
+    Search the knowledge-base summaries for free text, e.g. "worked on the Analytical Engine".
+
+    Args:
+        query (str): The words to search for.
+        k (Optional[int]): Number of summaries to return; KB_SEARCH_TOP_K if None.
+
+    Returns:
+        str: The best matching summaries (BM25), one per line and best first.
+             Returns "No entry found." if no summary holds any of the query's words.
+
+    Raises:
+        Exception: For unexpected errors during the search.
+    """
+
+    top: int = KB_SEARCH_TOP_K if k is None else k
+    logger.info("Starting KB search for query: '%s' (top %d)", query, top)
+    try:
+        summaries: List[str] = [item["summary"] for _, item in KB_RELOADER.snapshot.summaries().search(query, top)]
+        if not summaries:
+            logger.info("No KB entry found for search: '%s'", query)
+            return "No entry found."
+
+        logger.info("KB search for '%s' matched %d entries", query, len(summaries))
+        return "\n".join(summaries)
+
+    except Exception as e:
+        logger.error("Error during KB search for query '%s': %s", query, e, exc_info=True)
+        return f"KB error: {e}"
@@ -1,10 +1,49 @@
-from typing import List, Dict, Union
+from typing import Dict, List, Optional, Tuple, Union
 from constants.miscellaneous_constants import CITY_TEMPS, DEFAULT_CITY, AGGREGATE_FUNCTIONS
 from utils.logger import get_logger
-from typeguard import typechecked
+from utils.type_checking import typechecked
 
 logger = get_logger(__name__)
 
+def _temp(cities: List[str], operation: str, city_temps: Dict[str, Optional[float]]) -> Union[str, Dict[str, str]]:
+    """
+    Format the temperatures of a request; shared by `temp` and `temp_many`.
+
+    Args:
+        cities (List[str]): List of city names.
+        operation (str): "single" or a key of AGGREGATE_FUNCTIONS.
+        city_temps (Dict[str, Optional[float]]): Temperature of each of the cities (None if unknown).
+
+    Returns:
+        Union[str, Dict[str, str]]: Default-city message, per-city temperatures or the aggregate.
+
+    Raises:
+        ValueError: If an unsupported operation is provided.
+    """
+
+    temps: List[float] = []
+
+    for city in cities:
+        temp = city_temps[city]
+
+        if temp:
+            temps.append(temp)
+        elif len(cities) == 1:
+            temp = CITY_TEMPS.get(DEFAULT_CITY.lower())
+            return f"Temperature data unavailable. Default for {DEFAULT_CITY.capitalize()}: {temp}°C"
+
+    op: str = operation.lower()
+
+    if op == "single":
+        return {city.title(): f"{temp_val}°C" for city, temp_val in zip(cities, temps)}
+
+    if op in AGGREGATE_FUNCTIONS:
+        result: Union[int, float] = AGGREGATE_FUNCTIONS[op](temps)
+        return {op.capitalize(): f"{int(result)}°C"}
+
+    raise ValueError(f"Unknown operation: {operation}")
+
+
 @typechecked
 def temp(cities: List[str], operation: str = "single") -> Union[str, Dict[str, str]]:
     """
@@ -18,6 +57,8 @@ def temp(cities: List[str], operation: str = "single") -> Union[str, Dict[str, s
             - "total" / "sum": Return the total temperature sum.  
             - "maximum" / "max": Return the maximum temperature.  
             - "minimum" / "min": Return the minimum temperature.  
+            - "median" / "p90" / "p99": Return that percentile of the temperatures.  
+            - "stddev" / "std": Return the standard deviation of the temperatures.  
 
     Returns:
         Dict[str, str]: Dictionary with city names and temperatures (or aggregated result).
@@ -30,34 +71,51 @@ def temp(cities: List[str], operation: str = "single") -> Union[str, Dict[str, s
     logger.info("Starting temperature retrieval for cities: %s with operation: %s", cities, operation)
 
     try:
-        temps: List[float] = []
-
+        result: Union[str, Dict[str, str]] = _temp(cities, operation, {city: CITY_TEMPS.get(city.lower()) for city in cities})
+        logger.info("Temperature result for operation '%s': %s", operation, result)
+        return result
 
-        for city in cities:
-            temp = CITY_TEMPS.get(city.lower())
-
-            if temp:
-                temps.append(temp)
-            elif len(cities) == 1:
-                temp = CITY_TEMPS.get(DEFAULT_CITY.lower())
-                return f"Temperature data unavailable. Default for {DEFAULT_CITY.capitalize()}: {temp}°C"
+    except Exception:
+        logger.error("Error retrieving temperatures for cities: %s with operation: %s", cities, operation, exc_info=True)
+        return {}
 
-        logger.info("Fetched temperatures: %s", dict(zip(cities, temps)))
 
-        op: str = operation.lower()
+@typechecked
+def temp_many(requests: List[Tuple[List[str], str]]) -> List[Union[str, Dict[str, str]]]:
+    """
+    Retrieve temperatures for a batch of (cities, operation) requests in one call.
 
-        if op == "single":
-            result: Dict[str, str] = {city.title(): f"{temp_val}°C" for city, temp_val in zip(cities, temps)}
-            logger.info("Returning single temperatures: %s", result)
-            return result
+    Each city is looked up once and each distinct request computed once
+    however often they occur; every result is what `temp(cities, operation)`
+    returns for the same request (repeated results are copies).
 
-        if op in AGGREGATE_FUNCTIONS:
-            result: Union[int, float] = AGGREGATE_FUNCTIONS[op](temps)
-            logger.info("Aggregated result for operation '%s': %s", op, result)
-            return {op.capitalize(): f"{int(result)}°C"}
+    Args:
+        requests (List[Tuple[List[str], str]]): Pairs of city lists and operations.
 
-        raise ValueError(f"Unknown operation: {operation}")
+    Returns:
+        List[Union[str, Dict[str, str]]]: One result per request, in order.
+    """
 
-    except Exception:
-        logger.error("Error retrieving temperatures for cities: %s with operation: %s", cities, operation, exc_info=True)
-        return {}
+    logger.info("Starting batched temperature retrieval for %d requests", len(requests))
+    city_temps: Dict[str, Optional[float]] = {}
+    computed: Dict[Tuple[Tuple[str, ...], str], Union[str, Dict[str, str]]] = {}
+    results: List[Union[str, Dict[str, str]]] = []
+
+    for cities, operation in requests:
+        key: Tuple[Tuple[str, ...], str] = (tuple(cities), operation)
+        result: Optional[Union[str, Dict[str, str]]] = computed.get(key)
+        if result is None:
+            for city in cities:
+                if city not in city_temps:
+                    city_temps[city] = CITY_TEMPS.get(city.lower())
+            try:
+                result = computed[key] = _temp(cities, operation, city_temps)
+            except Exception:
+                logger.error("Error retrieving temperatures for cities: %s with operation: %s", cities, operation, exc_info=True)
+                result = computed[key] = {}
+        else:
+            result = dict(result) if isinstance(result, dict) else result
+        results.append(result)
+
+    logger.info("Finished batched temperature retrieval for %d distinct requests", len(computed))
+    return results
@@ -1,7 +1,7 @@
-from typing import Optional
+from typing import Dict, List, Optional
 from constants.miscellaneous_constants import WEATHER_DESCRIPTIONS
 from utils.logger import get_logger
-from typeguard import typechecked
+from utils.type_checking import typechecked
 
 logger = get_logger(__name__)
 
@@ -33,4 +33,31 @@ def weather(city: str) -> str:
         return description
     except Exception:
         logger.error("Error retrieving weather for city: '%s'", city, exc_info=True)
-        return "Weather data unavailable."
\ No newline at end of file
+        return "Weather data unavailable."
+
+@typechecked
+def weather_many(cities: List[str]) -> List[str]:
+    """
+    Retrieve weather descriptions for a batch of cities in one call.
+
+    Each city is looked up once however often it occurs; every result is what
+    `weather(city)` returns for the same city.
+
+    Args:
+        cities (List[str]): City names.
+
+    Returns:
+        List[str]: One description per city, in order.
+    """
+
+    logger.info("Starting batched weather lookup for %d cities", len(cities))
+    default_city: str = "dhaka"
+    default_description: str = f"Weather data unavailable. Default for {default_city.capitalize()}: {WEATHER_DESCRIPTIONS.get(default_city)}"
+
+    descriptions: Dict[str, str] = {}
+    for city in cities:
+        if city not in descriptions:
+            descriptions[city] = WEATHER_DESCRIPTIONS.get((city or "").strip().lower(), default_description)
+
+    logger.info("Finished batched weather lookup for %d distinct cities", len(descriptions))
+    return [descriptions[city] for city in cities]
@@ -1,15 +1,87 @@
-from typing import Dict, Union, List
-from pydantic import BaseModel
-from .tool_types import CalcArgs, FXArgs, KBArgs, TempArgs, WeatherArgs
+from typing import Annotated, Any, Dict, Literal, Type, Union, List
+from pydantic import BaseModel, Field, TypeAdapter, create_model
 
 class PlanStepModel(BaseModel):
+    """Schema of one raw plan step; `build_plan_step_adapter` narrows it per tool."""
+
     tool: str
-    args: Union[CalcArgs, FXArgs, KBArgs, TempArgs, WeatherArgs]
+    args: BaseModel
+
+
+def build_plan_step_adapter(tool_models: Dict[str, Type[BaseModel]]) -> TypeAdapter:
+    """
+    Build a validator for raw plan steps that is discriminated on `tool`.
+
+    One step model with a literal `tool` and the tool's own args model is
+    created per registered tool. Validation reads `tool` first and goes
+    straight to the matching args model, so its cost does not grow with the
+    number of tools and args can never coerce into another tool's model.
+
+    Args:
+        tool_models (Dict[str, Type[BaseModel]]): Mapping of tool names to their args models.
+
+    Returns:
+        TypeAdapter: Validator turning a raw step dict into a per-tool `PlanStepModel`.
+    """
+
+    step_models = tuple(
+        create_model(
+            f"{name.title()}PlanStepModel",
+            __base__=PlanStepModel,
+            tool=(Literal[name], ...),
+            args=(args_model, ...),
+        )
+        for name, args_model in tool_models.items()
+    )
+    if len(step_models) == 1:
+        return TypeAdapter(step_models[0])
+    return TypeAdapter(Annotated[Union[step_models], Field(discriminator="tool")])
+
+
+class PlanStep:
+    """
+    Trusted plan step handed from the planner to the executor.
+
+    Args are already validated, so a step is a plain two-slot object rather
+    than a Pydantic model.
+    """
+
+    __slots__ = ("tool", "args")
+
+    def __init__(self, tool: str, args: BaseModel):
+        self.tool = tool
+        self.args = args
+
+    def __eq__(self, other: Any) -> bool:
+        if not isinstance(other, PlanStep):
+            return NotImplemented
+        return self.tool == other.tool and self.args == other.args
+
+    def __repr__(self) -> str:
+        return f"PlanStep(tool={self.tool!r}, args={self.args!r})"
+
+
+def plan_step(tool: str, args: BaseModel) -> PlanStep:
+    """
+    Build a trusted plan step from an already-validated args model.
+
+    Args are validated once, when the parser constructs them; wrapping them
+    in a step and handing the step on does not validate them again.
+
+    Args:
+        tool (str): Tool name.
+        args (BaseModel): Validated args model instance for the tool.
+
+    Returns:
+        PlanStep: Plan step built without re-validation.
+    """
+
+    return PlanStep(tool, args)
 
 AnswerResultType = Union[str, Dict[str, str], float, None]
 CalcResultType = Union[str, Dict[str, str], float, None]
-FxResultType = Union[float, None]
+FxResultType = Union[str, float, None]
 TempResultType = Union[str, float, Dict[str, str], None]
 WeatherResultType = Union[str, Dict[str, str], None]
 PlanStepDictType = Dict[str, Union[str, Dict[str, str]]]  
-PlanStepsListType = List[PlanStepDictType]
+PlanStepsListType = List[PlanStep]
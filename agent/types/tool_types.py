@@ -8,8 +8,10 @@ class CalcArgs(BaseModel):
 
 class FXArgs(BaseModel):
     amount: Optional[float] = None
+    amounts: Optional[list[float]] = None
     from_currency: str = None
     to_currency: str = None
+    date: Optional[str] = None
 
 class TempArgs(BaseModel):
     cities: List[str]
@@ -20,6 +22,7 @@ class WeatherArgs(BaseModel):
 
 class KBArgs(BaseModel):
     q: str = None
+    search: bool = False
     
 class KBEntry(BaseModel):
     name: str
@@ -28,4 +31,4 @@ class KBEntry(BaseModel):
 class KBData(BaseModel):
     entries: List[KBEntry]
 
-IntermediateValues = Dict[str, Union[str, float, Dict]]
+IntermediateValues = Dict[str, Union[str, float, Dict, List]]
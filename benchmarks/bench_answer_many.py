@@ -0,0 +1,44 @@
+"""
+Benchmark: `answer_many` against calling `answer` once per query.
+
+The batch mixes every tool and repeats queries, the way traffic from many
+users asking about a few cities tends to look.
+
+Usage:
+    python -m benchmarks.bench_answer_many
+"""
+
+import logging
+import timeit
+from agent.agent import answer, answer_many
+
+QUERIES = [
+    "Who is Ada Lovelace?",
+    "What is 12.5% of 243?",
+    "Convert the average of 10 and 20 USD into EUR.",
+    "Add 10 to the average temperature in Paris and London right now.",
+    "Temperature in Paris and Mumbai?",
+    "Weather in Paris and London?",
+    "Convert 10 USD to EUR",
+]
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    repeats = 20
+
+    print(f"{'queries':>8} | {'answer() loop ms':>17} | {'answer_many ms':>15}")
+    print("-" * 47)
+    for copies in (1, 10, 100):
+        queries = QUERIES * copies
+        answer_many(queries)  # warm the plan cache
+
+        loop = timeit.timeit(lambda: [answer(q) for q in queries], number=repeats)
+        batch = timeit.timeit(lambda: answer_many(queries), number=repeats)
+
+        per_run = 1e3 / repeats
+        print(f"{len(queries):>8} | {loop * per_run:>17.2f} | {batch * per_run:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,62 @@
+"""
+Benchmark: `tools.evaluate` against the legacy regex + `eval` path.
+
+Repeated expressions hit the compiled-expression cache; unique expressions
+pay for preprocessing and compilation every time. Runtime type checks cost
+more than either path, so they are off unless TYPECHECK_MODE is set.
+
+Usage:
+    python -m benchmarks.bench_calc_engine
+"""
+
+import os
+
+os.environ.setdefault("TYPECHECK_MODE", "off")
+
+import logging
+import random
+import timeit
+from typing import List, Optional
+from agent.tools import evaluate
+from constants.miscellaneous_constants import WORD_OPS
+from constants.regex_constants import AVERAGE_PATTERN, CLEAN_EXPRESSION_PATTERN
+
+REPEATED = ["what is 2 + 3", "3 plus 1.5", "18.0+ 10", "36.0* 2", "12.5 / 2.5 - 1"]
+
+
+def legacy_evaluate(expr: str) -> Optional[float]:
+    """The evaluate path before the compiled engine (percent expressions omitted)."""
+
+    e = expr.lower().replace("what is", "").strip()
+    e = CLEAN_EXPRESSION_PATTERN.sub("", e)
+    for word, symbol in WORD_OPS.items():
+        e = e.replace(f"{word} ", symbol)
+    e = e.replace(" to the ", " + ")
+    match = AVERAGE_PATTERN.search(e)
+    if match:
+        a, b = match.groups()
+        e = str((int(a) + int(b)) / 2)
+    return float(f"{eval(e):.1f}")
+
+
+def _unique(count: int) -> List[str]:
+    rng = random.Random(0)
+    return [f"{rng.uniform(0, 1000):.3f} {rng.choice('+-*/')} {rng.uniform(1, 1000):.3f}" for _ in range(count)]
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    count = 20000
+    repeated = REPEATED * (count // len(REPEATED))
+
+    print(f"{'workload':>10} | {'legacy us/expr':>15} | {'engine us/expr':>15}")
+    print("-" * 46)
+    for name, expressions in (("repeated", repeated), ("unique", _unique(count))):
+        legacy = timeit.timeit(lambda: [legacy_evaluate(e) for e in expressions], number=1)
+        engine = timeit.timeit(lambda: [evaluate(e) for e in expressions], number=1)
+        per_expr = 1e6 / len(expressions)
+        print(f"{name:>10} | {legacy * per_expr:>15.2f} | {engine * per_expr:>15.2f}")
+
+
+if __name__ == "__main__":
+    main()
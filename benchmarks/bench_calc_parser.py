@@ -0,0 +1,64 @@
+"""
+Benchmark: calc prompt parsing, single-pass tokenizer vs. the three regex scans.
+
+The legacy parser ran PERCENT, BINARY and then IMPERATIVE patterns over the
+whole prompt (reproduced below); `parse_calc` now tokenizes the prompt once
+and matches every phrase kind over the token stream. Prompts grow by
+repeating a sentence, and a digit-heavy prompt shows how the scans' per
+position backtracking compares.
+
+Usage:
+    python -m benchmarks.bench_calc_parser
+"""
+
+import logging
+import os
+import re
+import timeit
+from typing import List
+
+os.environ.setdefault("TYPECHECK_MODE", "off")
+
+from agent.llm_parsers.calc_parser import _parse_tokens  # noqa: E402
+from agent.types.plan_types import plan_step  # noqa: E402
+from agent.types.tool_types import CalcArgs  # noqa: E402
+from constants.miscellaneous_constants import CALC_TOOL, WORD_OPS  # noqa: E402
+
+LEGACY_BINARY = r"([\d\.]+[a-zA-Z]*)\s*(add|plus|sum|subtract|minus|multiply|times|divide|divided|[\+\-\*/])\s*([\d\.]+[a-zA-Z]*)"
+LEGACY_PERCENT = r"([\d\.]+[a-zA-Z]*)\s*%\s*of\s*([\d\.a-zA-Z]+)"
+LEGACY_IMPERATIVE = r"\b(add|plus|sum|subtract|minus|multiply|times|divide|divided)\b\s*(?:by\s*)?([\d\.]+[a-zA-Z]*)"
+
+SENTENCE = "Add 10 and multiply by 2 to the average temperature in Paris, then take 12.5% of 243 and 31 plus 5. "
+
+
+def _legacy_parse(prompt: str) -> List:
+    tools = [plan_step(CALC_TOOL, CalcArgs(expr=f"{n}% of {v}")) for n, v in re.findall(LEGACY_PERCENT, prompt)]
+    binary = [
+        plan_step(CALC_TOOL, CalcArgs(expr=f"{a} {WORD_OPS.get(op.lower(), op)} {b}"))
+        for a, op, b in re.findall(LEGACY_BINARY, prompt, re.IGNORECASE)
+    ]
+    tools.extend(binary)
+    if not binary:
+        ops = [f"{WORD_OPS[op.lower()]} {v}" for op, v in re.findall(LEGACY_IMPERATIVE, prompt, re.IGNORECASE)]
+        if ops:
+            tools.append(plan_step(CALC_TOOL, CalcArgs(expr=" and ".join(ops))))
+    return tools
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    print(f"{'prompt':>22} | {'chars':>8} | {'regex scans ms':>14} | {'tokenizer ms':>12}")
+    print("-" * 66)
+
+    cases = [(f"sentence x{n}", SENTENCE * n) for n in (1, 10, 100, 1000)]
+    cases += [(f"digits x{n}", "7" * n + " apples") for n in (1000, 10000)]
+
+    for label, prompt in cases:
+        repeats = max(1, 20000 // len(prompt))
+        legacy = timeit.timeit(lambda: _legacy_parse(prompt), number=repeats) / repeats
+        tokens = timeit.timeit(lambda: _parse_tokens(prompt), number=repeats) / repeats
+        print(f"{label:>22} | {len(prompt):>8} | {legacy * 1e3:>14.3f} | {tokens * 1e3:>12.3f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,72 @@
+"""
+Benchmark: per-prompt trigger scanning cost as more tools are registered.
+
+Compares the single-pass `IntentDispatcher` against scanning the prompt once
+per tool (what running every parser's own substring/regex check amounts to).
+
+Usage:
+    python -m benchmarks.bench_dispatcher
+"""
+
+import logging
+import random
+import re
+import string
+import timeit
+from typing import Dict, List
+from agent.dispatcher import IntentDispatcher
+from constants.tool_constants import PARSER_TRIGGERS
+
+PROMPTS: List[str] = [
+    "what is 12.5% of 243?",
+    "convert the average of 10 and 20 usd into eur.",
+    "summarize today's weather in paris in 3 words.",
+    "add 10 to the average temperature in paris and london right now.",
+    "who is ada lovelace?",
+    "tell me something nice about the city and the people who live there, thanks",
+]
+
+
+def _synthetic_triggers(tool_count: int, seed: int = 7) -> Dict[str, List[str]]:
+    """Registry with the real triggers plus `tool_count` synthetic tools of 3 triggers each."""
+
+    rng = random.Random(seed)
+    triggers: Dict[str, List[str]] = dict(PARSER_TRIGGERS)
+    for i in range(tool_count):
+        triggers[f"tool_{i}"] = [
+            "".join(rng.choices(string.ascii_lowercase, k=rng.randint(5, 10))) for _ in range(3)
+        ]
+    return triggers
+
+
+def _per_tool_scan(triggers: Dict[str, List[str]]):
+    """Baseline: one compiled regex per tool, each run over the whole prompt."""
+
+    patterns = [re.compile("|".join(map(re.escape, tokens))) for tokens in triggers.values()]
+
+    def scan(prompt: str) -> int:
+        return sum(1 for pattern in patterns if pattern.search(prompt))
+
+    return scan
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    repeats = 2000
+
+    print(f"{'tools':>6} | {'dispatcher us/prompt':>21} | {'per-tool scan us/prompt':>24}")
+    print("-" * 58)
+    for extra_tools in (0, 10, 50, 200, 1000):
+        triggers = _synthetic_triggers(extra_tools)
+        dispatcher = IntentDispatcher(triggers)
+        baseline = _per_tool_scan(triggers)
+
+        dispatch_time = timeit.timeit(lambda: [dispatcher.dispatch(p) for p in PROMPTS], number=repeats)
+        baseline_time = timeit.timeit(lambda: [baseline(p) for p in PROMPTS], number=repeats)
+
+        per_prompt = 1e6 / (repeats * len(PROMPTS))
+        print(f"{len(triggers):>6} | {dispatch_time * per_prompt:>21.2f} | {baseline_time * per_prompt:>24.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,76 @@
+"""
+Benchmark: loading historical FX rates and as-of lookups.
+
+Writes a temporary CSV of daily quotes for the five quoted pairs over
+YEARS years, then times `RateHistory.load` and its peak allocation
+(tracemalloc), and one million as-of lookups on random dates for quoted
+pairs (one bisection), inverse pairs and cross pairs (cached per-day
+matrix).
+
+Usage:
+    python -m benchmarks.bench_fx_history
+"""
+
+import datetime
+import logging
+import os
+import random
+import tempfile
+import timeit
+import tracemalloc
+
+from agent.tools.fx_history import RateHistory
+
+YEARS = [1, 10, 40]
+# Synthetic quotes reaching every currency (the production table only quotes USD/EUR)
+QUOTES = {"usd_to_eur": 0.91, "eur_to_gbp": 0.86, "usd_to_jpy": 147.5, "usd_to_cad": 1.37, "cad_to_aud": 1.11}
+LOOKUPS = 1_000_000
+
+
+def _write_history(path: str, years: int) -> int:
+    rng = random.Random(years)
+    start = datetime.date(2025, 1, 1) - datetime.timedelta(days=365 * years)
+    rows = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.write("date,pair,rate\n")
+        for offset in range(365 * years):
+            day = (start + datetime.timedelta(days=offset)).isoformat()
+            for pair, rate in QUOTES.items():
+                f.write(f"{day},{pair},{rate * rng.uniform(0.9, 1.1):.6f}\n")
+                rows += 1
+    return rows
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    print(f"{'years':>5} | {'rows':>9} | {'load ms':>8} | {'peak MiB':>8} | {'direct ns':>9} | {'inverse ns':>10} | {'cross ns':>8}")
+    print("-" * 78)
+
+    with tempfile.TemporaryDirectory() as directory:
+        for years in YEARS:
+            path = os.path.join(directory, f"fx_{years}.csv")
+            rows = _write_history(path, years)
+
+            load = min(timeit.repeat(lambda: RateHistory.load(path), number=1, repeat=3))
+            tracemalloc.start()
+            history = RateHistory.load(path)
+            peak = tracemalloc.get_traced_memory()[1]
+            tracemalloc.stop()
+
+            rng = random.Random(0)
+            first = datetime.date(2025, 1, 1) - datetime.timedelta(days=365 * years)
+            dates = [(first + datetime.timedelta(days=rng.randrange(365 * years))).isoformat() for _ in range(LOOKUPS)]
+            timings = []
+            for source, target in [("USD", "EUR"), ("EUR", "USD"), ("GBP", "AUD")]:
+                rate = history.rate
+                elapsed = timeit.timeit(lambda: [rate(source, target, on) for on in dates], number=1)
+                timings.append(elapsed / LOOKUPS * 1e9)
+
+            print(
+                f"{years:>5} | {rows:>9} | {load * 1e3:>8.1f} | {peak / 2**20:>8.2f} | "
+                f"{timings[0]:>9.0f} | {timings[1]:>10.0f} | {timings[2]:>8.0f}"
+            )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,87 @@
+"""
+Benchmark: FX rate lookups and batch conversion.
+
+The legacy lookup (reproduced below) lowercased both codes and built the
+direct and inverse "x_to_y" keys on every call, and knew only quoted
+pairs. `FX_MATRIX.rate` resolves both codes to positions and reads the
+precomputed cross rate; callers that already hold positions index the
+rows directly.
+
+Batch conversion compares one `fx_convert` call per amount (with its
+logging and type checks) against one `fx_convert_many` call over lists,
+and over NumPy arrays when NumPy is installed.
+
+Usage:
+    python -m benchmarks.bench_fx_rates
+"""
+
+import itertools
+import logging
+import random
+import timeit
+from typing import Optional
+
+from agent.tools import fx_convert, fx_convert_many
+from agent.tools.fx_rates import FX_MATRIX
+from utils.vector_ops import np, vectorized_available
+from constants.miscellaneous_constants import FX_RATES, VALID_CURRENCIES
+
+LOOKUPS = 1_000_000
+BATCH_SIZES = [1_000, 100_000, 1_000_000]
+
+
+def _legacy_rate(from_currency: str, to_currency: str) -> Optional[float]:
+    from_currency, to_currency = from_currency.lower(), to_currency.lower()
+    if from_currency == to_currency:
+        return 1.0
+    key = f"{from_currency}_to_{to_currency}"
+    inverse_key = f"{to_currency}_to_{from_currency}"
+    if key in FX_RATES:
+        return FX_RATES[key]
+    if inverse_key in FX_RATES:
+        return 1 / FX_RATES[inverse_key]
+    return None
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    pairs = list(itertools.product(VALID_CURRENCIES, repeat=2))
+    workload = list(itertools.islice(itertools.cycle(pairs), LOOKUPS))
+    positions = [(FX_MATRIX.index[a], FX_MATRIX.index[b]) for a, b in workload]
+    rates = FX_MATRIX.rates
+
+    legacy_known = sum(_legacy_rate(a, b) is not None for a, b in pairs)
+    matrix_known = sum(FX_MATRIX.rate(a, b) is not None for a, b in pairs)
+    print(f"pairs with a rate: legacy {legacy_known}/{len(pairs)}, matrix {matrix_known}/{len(pairs)}")
+    print(f"{'lookup':>22} | {'ns per lookup':>13}")
+    print("-" * 40)
+
+    timings = {
+        "legacy string keys": lambda: [_legacy_rate(a, b) for a, b in workload],
+        "matrix by code": lambda: [FX_MATRIX.rate(a, b) for a, b in workload],
+        "matrix by position": lambda: [rates[i][j] for i, j in positions],
+    }
+    for label, run in timings.items():
+        elapsed = min(timeit.repeat(run, number=1, repeat=3))
+        print(f"{label:>22} | {elapsed / LOOKUPS * 1e9:>13.1f}")
+
+    rng = random.Random(0)
+    print()
+    print(f"{'amounts':>10} | {'fx_convert loop ms':>18} | {'many (lists) ms':>15} | {'many (NumPy) ms':>15}")
+    print("-" * 68)
+    for size in BATCH_SIZES:
+        amounts = [round(rng.uniform(0, 10_000), 2) for _ in range(size)]
+        sources = [rng.choice(VALID_CURRENCIES) for _ in range(size)]
+        targets = [rng.choice(VALID_CURRENCIES) for _ in range(size)]
+
+        loop = timeit.timeit(lambda: [fx_convert(*args) for args in zip(amounts, sources, targets)], number=1)
+        many = timeit.timeit(lambda: fx_convert_many(amounts, sources, targets), number=1)
+        vectorized = "n/a"
+        if vectorized_available():
+            arrays = (np.array(amounts), np.array(sources), np.array(targets))
+            vectorized = f"{timeit.timeit(lambda: fx_convert_many(*arrays), number=1) * 1e3:.1f}"
+        print(f"{size:>10} | {loop * 1e3:>18.1f} | {many * 1e3:>15.1f} | {vectorized:>15}")
+
+
+if __name__ == "__main__":
+    main()
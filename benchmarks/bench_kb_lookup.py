@@ -0,0 +1,118 @@
+"""
+Benchmark: knowledge-base name lookups at 1K, 100K and 1M entries.
+
+The legacy lookup (reproduced below) scanned every entry and lowercased
+its name on each call, so its cost grows with the KB. `KBIndex` probes a
+hash map of casefolded names for exact lookups and bisects a sorted key
+array for prefix lookups. Each size reports the index build time, the
+latency of hits and misses, a batched `get_many`, and a prefix lookup
+returning up to 10 names.
+
+Fuzzy lookups misspell a name by one or two edits. The naive approach
+(reproduced below) computes the edit distance to every name; the trigram
+index only checks the names holding one of the query's pieces, reported
+as the average candidate count.
+
+Usage:
+    python -m benchmarks.bench_kb_lookup
+"""
+
+import logging
+import random
+import timeit
+from typing import List, Optional
+
+from agent.tools.kb_index import KBIndex, KBItem, edit_distance, GRAM_SIZE
+
+SIZES = [1_000, 100_000, 1_000_000]
+LOOKUPS = 100_000
+LEGACY_LOOKUPS = 20
+FUZZY_LOOKUPS = 1_000
+MAX_DISTANCE = 2
+SYLLABLES = [consonant + vowel for consonant in "bcdfghjklmnprstvwz" for vowel in "aeiou"]
+
+
+def _legacy_lookup(entries: List[KBItem], q: str) -> Optional[str]:
+    for item in entries:
+        if q.lower() == item.get("name", "").lower():
+            return item["summary"]
+    return None
+
+
+def _naive_search(names: List[str], q: str) -> List[str]:
+    return sorted(name for name in names if edit_distance(q, name, MAX_DISTANCE) <= MAX_DISTANCE)
+
+
+def _name(rng: random.Random) -> str:
+    first = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 3)))
+    last = "".join(rng.choice(SYLLABLES) for _ in range(rng.randint(2, 4)))
+    return f"{first.title()} {last.title()}"
+
+
+def _entries(size: int) -> List[KBItem]:
+    rng = random.Random(size)
+    return [{"name": _name(rng), "summary": f"Summary of person {i}."} for i in range(size)]
+
+
+def _misspell(rng: random.Random, name: str) -> str:
+    for _ in range(rng.randint(1, MAX_DISTANCE)):
+        i = rng.randrange(len(name))
+        name = rng.choice([name[:i] + name[i + 1:], name[:i] + "x" + name[i + 1:], name[:i] + "e" + name[i:]])
+    return name
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(0)
+    print(
+        f"{'entries':>9} | {'build ms':>8} | {'legacy us':>10} | {'hit ns':>7} | {'miss ns':>7} | "
+        f"{'many ns/q':>9} | {'prefix ns':>9}"
+    )
+    print("-" * 82)
+
+    indexes = {}
+    for size in SIZES:
+        entries = _entries(size)
+        build = min(timeit.repeat(lambda: KBIndex(entries), number=1, repeat=3))
+        index = KBIndex(entries)
+
+        hits = [entries[rng.randrange(size)]["name"].upper() for _ in range(LOOKUPS)]
+        misses = [f"Nobody {i}" for i in range(LOOKUPS)]
+        prefixes = [entries[rng.randrange(size)]["name"][:6] for _ in range(LOOKUPS)]
+
+        legacy = timeit.timeit(lambda: [_legacy_lookup(entries, q) for q in hits[:LEGACY_LOOKUPS]], number=1)
+        hit = min(timeit.repeat(lambda: [index.get(q) for q in hits], number=1, repeat=3))
+        miss = min(timeit.repeat(lambda: [index.get(q) for q in misses], number=1, repeat=3))
+        many = min(timeit.repeat(lambda: index.get_many(hits), number=1, repeat=3))
+        prefix = min(timeit.repeat(lambda: [index.with_prefix(p, 10) for p in prefixes], number=1, repeat=3))
+
+        print(
+            f"{size:>9} | {build * 1e3:>8.1f} | {legacy / LEGACY_LOOKUPS * 1e6:>10.1f} | {hit / LOOKUPS * 1e9:>7.0f} | "
+            f"{miss / LOOKUPS * 1e9:>7.0f} | {many / LOOKUPS * 1e9:>9.0f} | {prefix / LOOKUPS * 1e9:>9.0f}"
+        )
+        indexes[size] = (entries, index)
+
+    print()
+    print(f"{'entries':>9} | {'naive fuzzy ms':>14} | {'indexed fuzzy us':>16} | {'candidates':>10} | {'found':>5}")
+    print("-" * 68)
+    for size, (entries, index) in indexes.items():
+        queries = [_misspell(rng, entries[rng.randrange(size)]["name"]).casefold() for _ in range(FUZZY_LOOKUPS)]
+        names = index.keys
+
+        naive = timeit.timeit(lambda: [_naive_search(names, q) for q in queries[:LEGACY_LOOKUPS]], number=1)
+        fuzzy = min(timeit.repeat(lambda: [index.search(q, MAX_DISTANCE) for q in queries], number=1, repeat=3))
+        found = sum(bool(index.search(q, MAX_DISTANCE)) for q in queries)
+        candidates = sum(
+            len(index.candidates(q, distance))
+            for q in queries
+            if (distance := min(MAX_DISTANCE, len(q) // GRAM_SIZE - 1)) > 0
+        )
+
+        print(
+            f"{size:>9} | {naive / LEGACY_LOOKUPS * 1e3:>14.1f} | {fuzzy / FUZZY_LOOKUPS * 1e6:>16.1f} | "
+            f"{candidates / FUZZY_LOOKUPS:>10.0f} | {found / FUZZY_LOOKUPS:>5.0%}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,98 @@
+"""
+Benchmark: reloading the KB after an edit, full rebuild against diff update.
+
+For 100K and 1M synthetic entries, reports the time to parse the KB JSON
+file (paid by every reload), to build the name and full-text indexes from
+scratch, and to update the previous version's indexes when 10, 100 or
+1000 entries changed (half of them edited summaries, half new entries).
+While a full rebuild runs in a background thread, as in `KBReloader`, the
+main thread keeps looking names up in the current snapshot; the p99 and
+worst latency of those lookups are reported next to the idle ones.
+
+Usage:
+    python -m benchmarks.bench_kb_reload
+"""
+
+import json
+import logging
+import random
+import threading
+import time
+from typing import List
+
+from agent.tools.kb_index import KBItem
+from agent.tools.kb_reloader import KBSnapshot
+
+SIZES = [100_000, 1_000_000]
+CHANGES = [10, 100, 1_000]
+WORDS = [f"w{rank}" for rank in range(5_000)]
+
+
+def _summary(rng: random.Random) -> str:
+    return " ".join(rng.choice(WORDS[:rng.choice((50, 500, 5_000))]) for _ in range(rng.randint(8, 30)))
+
+
+def _lookups(snapshot: KBSnapshot, names: List[str], done: threading.Event) -> List[float]:
+    latencies: List[float] = []
+    for name in names:
+        start = time.perf_counter()
+        snapshot.index.get(name)
+        latencies.append(time.perf_counter() - start)
+        if done.is_set():
+            break
+    latencies.sort()
+    return latencies
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(0)
+    print(
+        f"{'entries':>9} | {'parse s':>7} | {'rebuild s':>9} | "
+        + " | ".join(f"{f'update {n} s':>13}" for n in CHANGES)
+        + f" | {'lookup p99/max us idle':>22} | {'during rebuild':>14}"
+    )
+    print("-" * 132)
+
+    for size in SIZES:
+        entries: List[KBItem] = [{"name": f"Entry {i}", "summary": _summary(rng)} for i in range(size)]
+        text = json.dumps({"entries": entries})
+        start = time.perf_counter()
+        json.loads(text)
+        parse = time.perf_counter() - start
+        del text
+
+        start = time.perf_counter()
+        snapshot = KBSnapshot.from_entries(entries)
+        rebuild = time.perf_counter() - start
+
+        updates = []
+        for changes in CHANGES:
+            edited = list(entries)
+            for i in rng.sample(range(size), changes // 2):
+                edited[i] = {"name": edited[i]["name"], "summary": _summary(rng)}
+            edited.extend({"name": f"New entry {i}", "summary": _summary(rng)} for i in range(changes - changes // 2))
+            start = time.perf_counter()
+            KBSnapshot.from_entries(edited, snapshot, max_changes=max(CHANGES) * 2)
+            updates.append(time.perf_counter() - start)
+
+        names = [f"Entry {i}" for i in rng.choices(range(size), k=200_000)]
+        idle = _lookups(snapshot, names[:20_000], threading.Event())
+        done = threading.Event()
+        builder = threading.Thread(target=lambda: (KBSnapshot.from_entries(entries), done.set()))
+        builder.start()
+        busy = _lookups(snapshot, names, done)
+        builder.join()
+
+        def tail(latencies: List[float]) -> str:
+            return f"{latencies[int(len(latencies) * 0.99)] * 1e6:.1f}/{latencies[-1] * 1e6:.0f}"
+
+        print(
+            f"{size:>9} | {parse:>7.2f} | {rebuild:>9.2f} | "
+            + " | ".join(f"{update:>13.2f}" for update in updates)
+            + f" | {tail(idle):>22} | {tail(busy):>14}"
+        )
+
+
+if __name__ == "__main__":
+    main()
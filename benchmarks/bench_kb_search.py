@@ -0,0 +1,93 @@
+"""
+Benchmark: BM25 full-text search over KB summaries.
+
+Builds a `SummaryIndex` over synthetic summaries of 8-30 words drawn from
+a Zipf-distributed vocabulary (so a few words are in most summaries and
+most words are rare, as in real text), at 10K, 100K and 1M entries. Each
+size reports the build time, the memory the index allocates (tracemalloc
+peak, entries excluded), and the mean and p99 latency of top-5 queries of
+2-4 words taken from random summaries: queries of frequent words only (the
+hard case, where many summaries score close to each other), and queries
+holding one rarer word, as in "who worked on the Analytical Engine".
+
+Usage:
+    python -m benchmarks.bench_kb_search
+"""
+
+import itertools
+import logging
+import random
+import time
+import tracemalloc
+from typing import List
+
+from agent.tools.kb_index import KBItem
+from agent.tools.kb_text_index import SummaryIndex
+
+SIZES = [10_000, 100_000, 1_000_000]
+VOCABULARY = 50_000
+QUERIES = 1_000
+TOP_K = 5
+# Words ranked below this are "frequent" (each in over ~1% of the summaries)
+FREQUENT_WORDS = 200
+
+
+def _entries(size: int, rng: random.Random) -> List[KBItem]:
+    words = [f"w{rank}" for rank in range(VOCABULARY)]
+    weights = list(itertools.accumulate(1 / (rank + 1) for rank in range(VOCABULARY)))
+    return [
+        {"name": f"Entry {i}", "summary": " ".join(rng.choices(words, cum_weights=weights, k=rng.randint(8, 30)))}
+        for i in range(size)
+    ]
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(0)
+    print(
+        f"{'entries':>9} | {'build s':>7} | {'index MiB':>9} | {'terms':>7} | "
+        f"{'common mean':>11} | {'common p99':>10} | {'rare mean':>9} | {'rare p99':>8}"
+    )
+    print("-" * 94)
+
+    for size in SIZES:
+        entries = _entries(size, rng)
+
+        start = time.perf_counter()
+        index = SummaryIndex(entries)
+        build = time.perf_counter() - start
+        del index
+
+        tracemalloc.start()
+        index = SummaryIndex(entries)
+        peak = tracemalloc.get_traced_memory()[1]
+        tracemalloc.stop()
+
+        summaries = [entry["summary"].split() for entry in rng.sample(entries, min(size, QUERIES * 5))]
+        frequent = [[word for word in words if int(word[1:]) < FREQUENT_WORDS] for words in summaries]
+        common_queries = [" ".join(rng.sample(words, rng.randint(2, 4))) for words in frequent if len(words) >= 4][:QUERIES]
+        rare_queries = [
+            " ".join(rng.sample(words, rng.randint(1, 3)) + [rng.choice(rare)])
+            for words, rare in zip(frequent, ([word for word in words if int(word[1:]) >= FREQUENT_WORDS] for words in summaries))
+            if len(words) >= 3 and rare
+        ][:QUERIES]
+
+        timings = []
+        for queries in (common_queries, rare_queries):
+            latencies = []
+            for query in queries:
+                start = time.perf_counter()
+                index.search(query, TOP_K)
+                latencies.append(time.perf_counter() - start)
+            latencies.sort()
+            timings.append((sum(latencies) / len(latencies) * 1e3, latencies[int(len(latencies) * 0.99)] * 1e3))
+
+        (common_mean, common_p99), (rare_mean, rare_p99) = timings
+        print(
+            f"{size:>9} | {build:>7.1f} | {peak / 2**20:>9.1f} | {len(index.postings):>7} | "
+            f"{common_mean:>11.2f} | {common_p99:>10.2f} | {rare_mean:>9.2f} | {rare_p99:>8.2f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
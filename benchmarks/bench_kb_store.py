@@ -0,0 +1,116 @@
+"""
+Benchmark: startup time, memory and lookups of the on-disk KB store against loading kb.json.
+
+For 100K, 1M and 10M synthetic entries (summaries of about 120 characters),
+writes the KB both as a JSON file and as a store (`write_store`, 1M entries
+per shard), then starts a fresh interpreter for each and reports the time
+to open the KB, the resident memory it adds to the interpreter once
+10K exact lookups of random names are done (Linux /proc), and the mean
+latency of those lookups. Resident memory is split into heap and mapped
+file pages: the store's are clean page cache pages (the OS maps the
+neighbours of each page read too), shared by every process that opens
+the store and dropped under memory pressure. The JSON KB is loaded as
+`kb_tools` does without a store (`json.load`) plus a dict of the names;
+it is skipped at 10M entries, which would not fit in memory here. The
+store is read through the page cache, warm from writing it.
+
+Usage:
+    python -m benchmarks.bench_kb_store
+"""
+
+import json
+import logging
+import os
+import random
+import subprocess
+import sys
+import tempfile
+import time
+from typing import Iterator, List
+
+from agent.tools.kb_index import KBItem
+from agent.tools.kb_store import write_store
+
+SIZES = [100_000, 1_000_000, 10_000_000]
+# Largest KB loaded with json.load
+JSON_MAX_SIZE = 1_000_000
+LOOKUPS = 10_000
+WORDS = ["alpha", "engine", "theory", "computing", "pioneer", "mathematician", "logic", "network", "the", "of"]
+
+# Run in a fresh interpreter with argv "store" or "json", the KB path and its size; prints the seconds to open
+# the KB, the heap and mapped file bytes made resident, and the seconds per lookup
+_CHILD = """
+import os, random, sys, time
+def memory():
+    resident, mapped = (int(pages) * os.sysconf("SC_PAGE_SIZE") for pages in open("/proc/self/statm").read().split()[1:3])
+    return resident - mapped, mapped
+size = int(sys.argv[3])
+if sys.argv[1] == "store":
+    from agent.tools.kb_store import KBStore
+    base = memory()
+    start = time.perf_counter()
+    kb = KBStore(sys.argv[2])
+    lookup = kb.get
+else:
+    import json
+    base = memory()
+    start = time.perf_counter()
+    with open(sys.argv[2], "r", encoding="utf-8") as f:
+        kb = {item["name"].casefold(): item for item in json.load(f)["entries"]}
+    lookup = lambda name: kb.get(name.casefold())
+opened = time.perf_counter() - start
+names = [f"Entry {i}" for i in random.Random(1).choices(range(size), k=%d)]
+start = time.perf_counter()
+assert all(lookup(name) is not None for name in names)
+lookups = (time.perf_counter() - start) / len(names)
+print(opened, *(after - before for after, before in zip(memory(), base)), lookups)
+""" % LOOKUPS
+
+
+def _entries(size: int) -> Iterator[KBItem]:
+    rng = random.Random(0)
+    for i in range(size):
+        yield {"name": f"Entry {i}", "summary": " ".join(rng.choices(WORDS, k=16))}
+
+
+def _run(kind: str, path: str, size: int) -> List[float]:
+    output = subprocess.run(
+        [sys.executable, "-c", _CHILD, kind, path, str(size)], capture_output=True, text=True, check=True
+    ).stdout
+    return [float(value) for value in output.split()]
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    print(
+        f"{'entries':>10} | {'kind':>5} | {'write s':>7} | {'disk MiB':>8} | "
+        f"{'open ms':>9} | {'heap MiB':>8} | {'mapped MiB':>10} | {'lookup us':>9}"
+    )
+    print("-" * 92)
+
+    for size in SIZES:
+        with tempfile.TemporaryDirectory() as directory:
+            kinds = []
+            if size <= JSON_MAX_SIZE:
+                path = os.path.join(directory, "kb.json")
+                start = time.perf_counter()
+                with open(path, "w", encoding="utf-8") as f:
+                    json.dump({"entries": list(_entries(size))}, f, ensure_ascii=False)
+                kinds.append(("json", path, time.perf_counter() - start, os.path.getsize(path)))
+
+            path = os.path.join(directory, "kb_store")
+            start = time.perf_counter()
+            write_store(_entries(size), path)
+            written = time.perf_counter() - start
+            kinds.append(("store", path, written, sum(entry.stat().st_size for entry in os.scandir(path))))
+
+            for kind, path, written, disk in kinds:
+                opened, heap, mapped, lookup = _run(kind, path, size)
+                print(
+                    f"{size:>10} | {kind:>5} | {written:>7.1f} | {disk / 2**20:>8.1f} | "
+                    f"{opened * 1e3:>9.1f} | {heap / 2**20:>8.1f} | {mapped / 2**20:>10.1f} | {lookup * 1e6:>9.2f}"
+                )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,59 @@
+"""
+Benchmark: raw plan step validation cost as more tools are registered.
+
+Compares the discriminated plan step schema (`build_plan_step_adapter`) with
+a plain `Union` over all args models, which Pydantic may have to try member by
+member.
+
+Usage:
+    python -m benchmarks.bench_plan_schema
+"""
+
+import logging
+import timeit
+from typing import Dict, Optional, Type, Union
+from pydantic import BaseModel, TypeAdapter, create_model
+from agent.types.plan_types import build_plan_step_adapter
+from constants.tool_constants import TOOL_MODELS
+
+RAW_STEP = {"tool": "kb", "args": {"q": "ada lovelace"}}
+
+
+def _registry(extra_tools: int) -> Dict[str, Type[BaseModel]]:
+    """Real args models plus synthetic ones, registered before the real tools."""
+
+    models: Dict[str, Type[BaseModel]] = {
+        f"tool_{i}": create_model(f"Tool{i}Args", value=(int, ...), label=(Optional[str], None))
+        for i in range(extra_tools)
+    }
+    models.update(TOOL_MODELS)
+    return models
+
+
+def _plain_union_adapter(models: Dict[str, Type[BaseModel]]) -> TypeAdapter:
+    """Step schema with `tool: str` and a non-discriminated union of args models."""
+
+    step = create_model("PlainStep", tool=(str, ...), args=(Union[tuple(models.values())], ...))
+    return TypeAdapter(step)
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    repeats = 20000
+
+    print(f"{'tools':>6} | {'discriminated us/step':>22} | {'plain union us/step':>20}")
+    print("-" * 56)
+    for extra_tools in (0, 20, 100, 400):
+        models = _registry(extra_tools)
+        discriminated = build_plan_step_adapter(models)
+        plain = _plain_union_adapter(models)
+
+        discriminated_time = timeit.timeit(lambda: discriminated.validate_python(RAW_STEP), number=repeats)
+        plain_time = timeit.timeit(lambda: plain.validate_python(RAW_STEP), number=repeats)
+
+        per_step = 1e6 / repeats
+        print(f"{len(models):>6} | {discriminated_time * per_step:>22.2f} | {plain_time * per_step:>20.2f}")
+
+
+if __name__ == "__main__":
+    main()
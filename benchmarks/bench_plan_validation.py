@@ -0,0 +1,77 @@
+"""
+Benchmark: per-query cost of handing a plan from the parsers to the handlers.
+
+The legacy pipeline validated every step four times (args model in the parser,
+args model again plus the plan step model in call_llm, the plan step model in
+answer, args model once more before the handler). The current pipeline
+validates args once when the parser builds them and passes trusted steps
+through.
+
+Usage:
+    python -m benchmarks.bench_plan_validation
+"""
+
+import logging
+import timeit
+from typing import List, Tuple, Union
+from pydantic import BaseModel
+from agent.types.plan_types import plan_step
+from agent.types.tool_types import CalcArgs, FXArgs, KBArgs, TempArgs, WeatherArgs
+from constants.tool_constants import TOOL_MODELS
+
+
+class LegacyPlanStepModel(BaseModel):
+    """Plan step schema of the legacy pipeline (plain, non-discriminated union)."""
+
+    tool: str
+    args: Union[CalcArgs, FXArgs, KBArgs, TempArgs, WeatherArgs]
+
+
+# (tool, args model, raw args) for a few representative plans
+PLANS: List[List[Tuple[str, type, dict]]] = [
+    [("calc", CalcArgs, {"expr": "12.5% of 243"})],
+    [("calc", CalcArgs, {"numbers": [10.0, 20.0], "operation": "average"}),
+     ("fx", FXArgs, {"amount": None, "from_currency": "USD", "to_currency": "EUR"})],
+    [("temperature", TempArgs, {"cities": ["paris", "london"], "operation": "average"}),
+     ("calc", CalcArgs, {"expr": "+ 10"})],
+    [("kb", KBArgs, {"q": "ada lovelace"})],
+]
+
+
+def _legacy(plan: List[Tuple[str, type, dict]]) -> List[BaseModel]:
+    """Parser dumps args to dicts; call_llm, answer and the executor validate them again."""
+
+    dicts = [{"tool": tool, "args": model(**raw).model_dump()} for tool, model, raw in plan]
+    steps = [
+        LegacyPlanStepModel(tool=d["tool"], args=TOOL_MODELS[d["tool"]].model_validate(d["args"]))
+        for d in dicts
+    ]
+    steps = [LegacyPlanStepModel.model_validate(step) for step in steps]
+    return [TOOL_MODELS[step.tool].model_validate(step.args) for step in steps]
+
+
+def _validate_once(plan: List[Tuple[str, type, dict]]) -> List[BaseModel]:
+    """Parser builds trusted steps; downstream only checks the args type."""
+
+    steps = [plan_step(tool, model(**raw)) for tool, model, raw in plan]
+    return [
+        step.args if isinstance(step.args, TOOL_MODELS[step.tool]) else TOOL_MODELS[step.tool].model_validate(step.args)
+        for step in steps
+    ]
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    repeats = 20000
+
+    legacy = timeit.timeit(lambda: [_legacy(plan) for plan in PLANS], number=repeats)
+    once = timeit.timeit(lambda: [_validate_once(plan) for plan in PLANS], number=repeats)
+
+    per_query = 1e6 / (repeats * len(PLANS))
+    print(f"legacy (4x validation):  {legacy * per_query:8.2f} us/query")
+    print(f"validate once:           {once * per_query:8.2f} us/query")
+    print(f"saved per query:         {(legacy - once) * per_query:8.2f} us ({(1 - once / legacy) * 100:.0f}%)")
+
+
+if __name__ == "__main__":
+    main()
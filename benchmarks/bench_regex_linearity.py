@@ -0,0 +1,83 @@
+"""
+Benchmark: prompt parsing time on adversarial and very long prompts.
+
+Every prompt pattern is meant to run in linear time, so `call_llm` on a
+prompt ten times longer should take about ten times as long. Each family
+below targets one pattern's former weak spot (amount runs with no currency
+pair, aggregation words with no "temperature", keywords repeated without a
+terminator, digit runs, trailing blanks) and grows from 1 KB to 10 MB. The
+benchmark exits non-zero when a tenfold longer prompt takes more than
+MAX_GROWTH times as long (a quadratic pattern takes about 100 times as long).
+Like every timeit run, the garbage collector is paused, so the ratios show
+the parsers' work rather than collector passes over millions of tokens.
+
+Usage:
+    python -m benchmarks.bench_regex_linearity [max size in bytes]
+"""
+
+import logging
+import os
+import sys
+import timeit
+from typing import Callable, Dict, List
+
+os.environ.setdefault("TYPECHECK_MODE", "off")
+
+from agent.llm import PLAN_CACHE, TEMPLATE_CACHE, call_llm  # noqa: E402
+
+SIZES = [1_000, 10_000, 100_000, 1_000_000, 10_000_000]
+
+# Allowed time ratio between consecutive sizes (10x apart); linear is 10, quadratic 100
+MAX_GROWTH = 25
+
+# Prompts below this size finish in well under a millisecond and are too noisy to compare
+MIN_COMPARED_SIZE = 10_000
+
+
+def _repeat(unit: str, size: int, tail: str = "") -> str:
+    return unit * max(1, (size - len(tail)) // len(unit)) + tail
+
+
+FAMILIES: Dict[str, Callable[[int], str]] = {
+    "amounts, no currency pair": lambda n: _repeat("1, 2 and 3 ", n, "usd"),
+    "amounts, currency pair": lambda n: _repeat("1, 2 and 3 ", n, "usd to eur"),
+    "aggregations, no keyword": lambda n: _repeat("sum of the ", n, "temperature"),
+    "temperature clauses": lambda n: _repeat("temperature in paris and ", n, "london?"),
+    "weather clauses": lambda n: _repeat("weather in ", n, "dhaka"),
+    "digit run": lambda n: _repeat("7", n, " plus"),
+    "calc phrases": lambda n: _repeat("add 10 and multiply by 2, then 12.5% of 243 and 31 plus 5. ", n),
+}
+
+
+def _time_prompt(prompt: str) -> float:
+    PLAN_CACHE.clear()
+    TEMPLATE_CACHE.clear()
+    return timeit.timeit(lambda: call_llm(prompt), number=1)
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    max_size: int = int(sys.argv[1]) if len(sys.argv) > 1 else SIZES[-1]
+    sizes: List[int] = [size for size in SIZES if size <= max_size]
+
+    print(f"{'prompt family':>26} | " + " | ".join(f"{size:>11,}" for size in sizes) + " | worst growth")
+    print("-" * (44 + 14 * len(sizes)))
+
+    failures: List[str] = []
+    for label, build in FAMILIES.items():
+        timings: List[float] = [_time_prompt(build(size)) for size in sizes]
+        growth: List[float] = [
+            timings[i] / timings[i - 1] for i in range(1, len(sizes)) if sizes[i - 1] >= MIN_COMPARED_SIZE
+        ]
+        worst: float = max(growth, default=0.0)
+        print(f"{label:>26} | " + " | ".join(f"{t * 1e3:>9.2f}ms" for t in timings) + f" | {worst:>11.1f}x")
+        if worst > MAX_GROWTH:
+            failures.append(label)
+
+    if failures:
+        print(f"Superlinear parse time (over {MAX_GROWTH}x per 10x size): {', '.join(failures)}")
+        sys.exit(1)
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,58 @@
+"""
+Benchmark: median/p90/p99/stddev over generators of growing length.
+
+The streamed values are never materialized, so peak memory (traced with
+tracemalloc) should stay flat while the sorted-list baseline grows with
+the input. Quantile error is reported as the distance in rank from the
+exact answer, which is known for a uniform stream over [0, 1).
+
+Usage:
+    python -m benchmarks.bench_streaming_stats
+"""
+
+import logging
+import random
+import time
+import tracemalloc
+from utils.streaming_stats import streaming_quantile, streaming_stddev
+
+
+def _stream(size: int, seed: int = 0):
+    rng = random.Random(seed)
+    return (rng.random() for _ in range(size))
+
+
+def _measure(function, *args):
+    tracemalloc.start()
+    start = time.perf_counter()
+    result = function(*args)
+    elapsed = time.perf_counter() - start
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return result, elapsed, peak
+
+
+def _sorted_p99(values):
+    ordered = sorted(values)
+    return ordered[int(0.99 * (len(ordered) - 1))]
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    print(f"{'size':>10} | {'p99 sketch KiB':>14} | {'p99 sorted KiB':>14} | {'sketch s':>9} | {'p50/p90/p99 rank err':>21} | {'stddev KiB':>10}")
+    print("-" * 94)
+
+    for exponent in range(3, 7):
+        size = 10 ** exponent
+        _, elapsed, sketch_peak = _measure(streaming_quantile, _stream(size), 0.99)
+        _, _, sorted_peak = _measure(_sorted_p99, _stream(size))
+        _, _, stddev_peak = _measure(streaming_stddev, _stream(size))
+        errors = "/".join(f"{abs(streaming_quantile(_stream(size), q) - q):.4f}" for q in (0.5, 0.9, 0.99))
+        print(
+            f"{size:>10} | {sketch_peak / 1024:>14.1f} | {sorted_peak / 1024:>14.1f} | "
+            f"{elapsed:>9.3f} | {errors:>21} | {stddev_peak / 1024:>10.1f}"
+        )
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,48 @@
+"""
+Benchmark: `answer()` throughput under each TYPECHECK_MODE.
+
+The mode is applied when modules are imported, so every mode is measured in
+its own interpreter.
+
+Usage:
+    python -m benchmarks.bench_typecheck_modes
+"""
+
+import os
+import subprocess
+import sys
+
+QUERIES = [
+    "What is 12.5% of 243?",
+    "Convert the average of 10 and 20 USD into EUR.",
+    "Add 10 to the average temperature in Paris and London right now.",
+    "Weather in Paris and London?",
+    "Who is Ada Lovelace?",
+]
+
+WORKER = """
+import logging, sys, timeit
+logging.disable(logging.CRITICAL)
+from agent.agent import answer
+queries = sys.argv[1:]
+for q in queries:
+    answer(q)  # warm the plan cache
+repeats = 400
+elapsed = timeit.timeit(lambda: [answer(q) for q in queries], number=repeats)
+print(repeats * len(queries) / elapsed)
+"""
+
+
+def main() -> None:
+    print(f"{'mode':>8} | {'answer() calls/s':>17}")
+    print("-" * 30)
+    for mode in ("full", "sampled", "off"):
+        env = dict(os.environ, TYPECHECK_MODE=mode, LOG_DIR=os.environ.get("LOG_DIR", "/tmp/agent-bench-logs"))
+        out = subprocess.run(
+            [sys.executable, "-c", WORKER, *QUERIES], env=env, capture_output=True, text=True, check=True
+        )
+        print(f"{mode:>8} | {float(out.stdout.strip()):>17.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,47 @@
+"""
+Benchmark: sum/average/min/max over lists vs. contiguous float arrays.
+
+Lists go through the builtins (the legacy path); array.array('d') inputs go
+through `utils.vector_ops`, which uses NumPy above VECTOR_MIN_SIZE when it is
+installed and the same builtins otherwise.
+
+Usage:
+    python -m benchmarks.bench_vector_ops
+"""
+
+import array
+import logging
+import random
+import timeit
+from utils.vector_ops import vector_max, vector_mean, vector_min, vector_sum, vectorized_available
+
+
+def _all_builtin(values):
+    return sum(values), sum(values) / len(values), min(values), max(values)
+
+
+def _all_vector(values):
+    return vector_sum(values), vector_mean(values), vector_min(values), vector_max(values)
+
+
+def main() -> None:
+    logging.disable(logging.CRITICAL)
+    rng = random.Random(0)
+    backend = "numpy" if vectorized_available() else "pure Python (numpy not installed)"
+    print(f"array backend: {backend}")
+    print(f"{'size':>10} | {'list builtins ms':>17} | {'float array ms':>15}")
+    print("-" * 48)
+
+    for exponent in range(1, 8):
+        size = 10 ** exponent
+        values = [rng.uniform(-50, 50) for _ in range(size)]
+        packed = array.array("d", values)
+        repeats = max(1, 10 ** 6 // size)
+
+        listed = timeit.timeit(lambda: _all_builtin(values), number=repeats) / repeats
+        vector = timeit.timeit(lambda: _all_vector(packed), number=repeats) / repeats
+        print(f"{size:>10} | {listed * 1e3:>17.4f} | {vector * 1e3:>15.4f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -9,5 +9,47 @@ BASE_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
 # Path to KB JSON file
 KB_FILE_PATH = os.path.join(BASE_DIR, "data", "kb.json")
 
+# Path to the historical FX rates file (CSV rows of date,pair,rate)
+FX_HISTORY_FILE_PATH = os.path.join(BASE_DIR, "data", "fx_history.csv")
+
 # Read from .env, fallback to "logs" if not set
-LOG_DIR = os.getenv("LOG_DIR", "logs")
\ No newline at end of file
+LOG_DIR = os.getenv("LOG_DIR", "logs")
+
+# In-process plan cache used by call_llm (0 disables the TTL)
+PLAN_CACHE_MAX_ENTRIES = int(os.getenv("PLAN_CACHE_MAX_ENTRIES", "4096"))
+PLAN_CACHE_MAX_BYTES = int(os.getenv("PLAN_CACHE_MAX_BYTES", str(8 * 1024 * 1024)))
+PLAN_CACHE_TTL_SECONDS = float(os.getenv("PLAN_CACHE_TTL_SECONDS", "3600"))
+
+# Compiled calculator expressions kept by tools.evaluate
+CALC_EXPRESSION_CACHE_SIZE = int(os.getenv("CALC_EXPRESSION_CACHE_SIZE", "4096"))
+
+# Minimum length of a numeric array for sum/average/min/max to use the NumPy backend (when installed)
+VECTOR_MIN_SIZE = int(os.getenv("VECTOR_MIN_SIZE", "10000"))
+
+# Accuracy parameter k of the median/p90/p99 sketch (about 3 * k values kept; streams under k values are exact)
+QUANTILE_SKETCH_SIZE = int(os.getenv("QUANTILE_SKETCH_SIZE", "200"))
+
+# Runtime type checking of @typechecked functions: "full", "sampled" (1 in TYPECHECK_SAMPLE_RATE calls) or "off"
+TYPECHECK_MODE = os.getenv("TYPECHECK_MODE", "full").lower()
+TYPECHECK_SAMPLE_RATE = int(os.getenv("TYPECHECK_SAMPLE_RATE", "100"))
+
+# Worker threads running independent plan steps in parallel (1 runs every plan in order)
+PLAN_EXECUTOR_WORKERS = int(os.getenv("PLAN_EXECUTOR_WORKERS", "4"))
+
+# Dates whose all-pairs cross-rate matrix is kept for historical FX conversions
+FX_HISTORY_MATRIX_CACHE_SIZE = int(os.getenv("FX_HISTORY_MATRIX_CACHE_SIZE", "256"))
+
+# Typo-tolerant KB name matching: maximum edit distance of a fuzzy match (0 disables it)
+KB_FUZZY_MAX_DISTANCE = int(os.getenv("KB_FUZZY_MAX_DISTANCE", "2"))
+
+# Number of summaries answered for KB full-text queries ("who worked on the Analytical Engine")
+KB_SEARCH_TOP_K = int(os.getenv("KB_SEARCH_TOP_K", "1"))
+
+# On-disk KB store (`make kb-store` converts KB_FILE_PATH to it), read instead of KB_FILE_PATH when present
+KB_STORE_PATH = os.path.join(BASE_DIR, "data", "kb_store")
+
+# Reloading of the KB when KB_FILE_PATH (or the KB store) changes, once `kb_tools.start_kb_reloader` is called:
+# seconds between checks (0 disables it), and most entries changed since the last full build for the indexes
+# to be updated instead of rebuilt
+KB_RELOAD_INTERVAL_SECONDS = float(os.getenv("KB_RELOAD_INTERVAL_SECONDS", "2"))
+KB_RELOAD_MAX_CHANGES = int(os.getenv("KB_RELOAD_MAX_CHANGES", "1000"))
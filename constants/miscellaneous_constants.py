@@ -1,4 +1,6 @@
-from typing import Dict, List, Callable, Union
+from typing import Dict, FrozenSet, Iterable, List, Callable, Tuple, Union
+from utils.streaming_stats import streaming_quantile, streaming_stddev
+from utils.vector_ops import vector_max, vector_mean, vector_min, vector_sum
 
 TEMPERATURE_TOOL = "temperature"
 WEATHER_TOOL = "weather"
@@ -14,12 +16,38 @@ WORD_OPS: Dict[str, str] = {
     "divide": "/", "divided": "/"
 }
 
+# Words of element-wise list operations: "add 5 to each of 1, 2, 3" and "multiply 10, 20, 30 by 1.5"
+ELEMENTWISE_OPS: Tuple[str, ...] = ("add", "plus", "subtract", "minus", "multiply", "times", "divide")
+ELEMENTWISE_BY_OPS: Tuple[str, ...] = ("multiply", "divide")
+ELEMENTWISE_PREPOSITIONS: Tuple[str, ...] = ("to", "from", "by", "with")
+ELEMENTWISE_QUANTIFIERS: Tuple[str, ...] = ("each", "every", "all")
+
+# Calc expressions starting with one of these continue from the previous result (e.g. "+ 10")
+CHAIN_OPERATORS: Tuple[str, ...] = tuple(dict.fromkeys(WORD_OPS.values()))
+
+# Typographic quotes folded to ASCII when normalizing prompts
+QUOTE_TRANSLATION: Dict[int, str] = str.maketrans({
+    "\u2018": "'", "\u2019": "'", "\u201a": "'", "\u201b": "'",
+    "\u201c": '"', "\u201d": '"', "\u201e": '"', "\u201f": '"',
+})
+
 # List of valid currencies
 VALID_CURRENCIES: List[str] = ["USD", "EUR", "GBP", "JPY", "AUD", "CAD"]
 
+# Words left out of the KB full-text index and of search queries
+KB_STOPWORDS: FrozenSet[str] = frozenset(
+    "a about an and are as at be by did do does for from had has have he her his i in is it its know "
+    "me of on or s she tell that the their them they this to was were what which who whom with you".split()
+)
+
+# BM25 parameters of the KB full-text search: term frequency saturation and length normalization
+KB_BM25_K1 = 1.2
+KB_BM25_B = 0.75
+
 DEFAULT_CITY = "dhaka"
 SUPPORTED_CITIES = {"paris", "london", "dhaka"}
 
+# Quoted FX rates; every other pair of currencies is derived through the shortest chain of quotes
 FX_RATES: Dict[str, float] = {
     "usd_to_eur": 0.91
 }
@@ -32,15 +60,24 @@ CITY_TEMPS: dict[str, float] = {
     "amsterdam": 19.5
 }
 
-AGGREGATE_FUNCTIONS: Dict[str, Callable[[List[float]], Union[int, float]]] = {
-    "average": lambda lst: round(sum(lst) / len(lst)),
-    "avg": lambda lst: round(sum(lst) / len(lst)),
-    "total": lambda lst: round(sum(lst)),
-    "sum": lambda lst: round(sum(lst)),
-    "maximum": max,
-    "max": max,
-    "minimum": min,
-    "min": min,
+# Streaming aggregates: quantile operations and their q, and standard deviation names
+QUANTILE_OPERATIONS: Dict[str, float] = {"median": 0.5, "p90": 0.9, "p99": 0.99}
+STDDEV_OPERATIONS: Tuple[str, ...] = ("stddev", "std")
+
+AGGREGATE_FUNCTIONS: Dict[str, Callable[[Iterable[float]], Union[int, float]]] = {
+    "average": lambda lst: round(vector_mean(lst)),
+    "avg": lambda lst: round(vector_mean(lst)),
+    "total": lambda lst: round(vector_sum(lst)),
+    "sum": lambda lst: round(vector_sum(lst)),
+    "maximum": vector_max,
+    "max": vector_max,
+    "minimum": vector_min,
+    "min": vector_min,
+    "median": lambda values: round(streaming_quantile(values, QUANTILE_OPERATIONS["median"])),
+    "p90": lambda values: round(streaming_quantile(values, QUANTILE_OPERATIONS["p90"])),
+    "p99": lambda values: round(streaming_quantile(values, QUANTILE_OPERATIONS["p99"])),
+    "stddev": lambda values: round(streaming_stddev(values)),
+    "std": lambda values: round(streaming_stddev(values)),
 }
 
 WEATHER_DESCRIPTIONS: dict[str, str] = {
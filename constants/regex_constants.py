@@ -1,34 +1,74 @@
-from constants.miscellaneous_constants import VALID_CURRENCIES
+import re
+from constants.miscellaneous_constants import VALID_CURRENCIES, WORD_OPS
 
-# Binary expressions (words or symbols)
-BINARY_PATTERN = r"([\d\.]+[a-zA-Z]*)\s*(add|plus|sum|subtract|minus|multiply|times|divide|divided|[\+\-\*/])\s*([\d\.]+[a-zA-Z]*)"
+# Every pattern is compiled once here and written so that a search or scan runs in time linear in the
+# input: no two quantifiers compete for the same characters, and a scan does not restart inside a
+# run it has already rejected (a `(?<!...)` guard at the start of the pattern)
 
-# Percentage expressions
-PERCENT_PATTERN = r"([\d\.]+[a-zA-Z]*)\s*%\s*of\s*([\d\.a-zA-Z]+)"
+_AGGREGATE_OPS = "average|avg|total|sum|maximum|minimum|max|min|median|p90|p99|stddev|std"
+_CURRENCIES = "|".join(VALID_CURRENCIES)
+_ISO_DATE = r"\d{4}-\d{2}-\d{2}(?![\d\.])"
 
-# Imperative expressions
-IMPERATIVE_PATTERN = r"\b(add|plus|sum|subtract|minus|multiply|times|divide|divided)\b\s*(?:by\s*)?([\d\.]+[a-zA-Z]*)"
+# Tokens of a calc prompt, in one scan: leading whitespace, then a number, operator word, other word,
+# percent sign, operator symbol, or any other character. An ISO date ("2025-08-22") is one "other"
+# token, so it is never read as a subtraction. A token never ends in whitespace, so a scan never
+# starts after a blank; this keeps trailing whitespace from being rescanned from every position
+CALC_PROMPT_TOKEN_PATTERN = re.compile(
+    rf"(?<!\s)(\s*)(?:((?!{_ISO_DATE})[\d\.]+)|((?i:{'|'.join(sorted(WORD_OPS, key=len, reverse=True))}))(?![a-zA-Z])"
+    rf"|([a-zA-Z]+)|(%)|([-+*/])|({_ISO_DATE}|\S))"
+)
 
-# Regex pattern to match currency conversion phrases
-CURRENCY_OP_PATTERN = rf"(average|avg|total|sum|maximum|minimum|max|min)?\s*(?:of)?\s*([\d\.,\sand]+)\s*({'|'.join(VALID_CURRENCIES)})\s*(?:into|to)\s*({'|'.join(VALID_CURRENCIES)})"
+# Regex pattern to match currency conversion phrases: an optional aggregation, then amounts separated
+# by spaces, commas or the word "and", glued to the source currency, then an optional "on <ISO date>".
+# A match starts at an aggregation, at "of" or at the beginning of a run of amounts, never inside one
+CURRENCY_OP_PATTERN = re.compile(
+    rf"(?:({_AGGREGATE_OPS})(?:\s*of\b)?|\bof\b|(?<![\d\.,\s])(?<!\band))((?:[\d\.,\s]|\band\b)[\d\.,\s]*(?:\band\b[\d\.,\s]*)*)"
+    rf"({_CURRENCIES})\s*(?:into|to)\s*({_CURRENCIES})(?:\s*(?:on|as of)\s+({_ISO_DATE}))?",
+    re.IGNORECASE,
+)
 
-# Regex to detect temperature queries
-TEMPERATURE_PATTERN = r"(average|avg|total|sum|maximum|minimum|max|min)?\s*(?:of|the|for)?\s*temperature (?:in|at) (.+?)(?: right now|\?|$)"
+# Regex to detect temperature queries; the city part ends at "right now", "?" or the end of the line
+TEMPERATURE_PATTERN = re.compile(
+    rf"(?:({_AGGREGATE_OPS})\s*(?:(?:of|the|for)\s*)?)?temperature (?:in|at) (.+?)(?: right now|\?|$|(?=\n))",
+    re.IGNORECASE,
+)
 
 # Regex to clean non-word characters from city part
-CITY_CLEAN_PATTERN = r"[^\w\s]"
+CITY_CLEAN_PATTERN = re.compile(r"[^\w\s]")
 
 # Regex to split words/cities
-CITY_SPLIT_PATTERN = r"[ ,?]+| and "
+CITY_SPLIT_PATTERN = re.compile(r"[ ,?]+| and ")
 
-# Regex to detect weather queries
-WEATHER_PATTERN = r"weather(?: in| of)? (.+?)(?: right now|\?|$)"
+# Regex to detect weather queries; the city part ends at "right now", "?" or the end of the line
+WEATHER_PATTERN = re.compile(r"weather(?: in| of)? (.+?)(?: right now|\?|$|(?=\n))", re.IGNORECASE)
 
 # Regex to extract numeric temperature from a string like "31.36°C" or "Temperature data unavailable. Default for Dhaka: 31°C"
-NUMERIC_TEMPERATURE_PATTERN = r"[-+]?\d*\.?\d+"
+NUMERIC_TEMPERATURE_PATTERN = re.compile(r"[-+]?(?:\d+(?:\.\d+)?|\.\d+)")
 
 # Regex pattern to detect "average of X and Y"
-AVERAGE_PATTERN = r"average of (\d+) and (\d+)"
+AVERAGE_PATTERN = re.compile(r"average of (\d+) and (\d+)")
 
 # Regex pattern to clean expression strings before eval
-CLEAN_EXPRESSION_PATTERN = r"[^\w\s\.\%\+\-\*\/]"
\ No newline at end of file
+CLEAN_EXPRESSION_PATTERN = re.compile(r"[^\w\s\.\%\+\-\*\/]")
+
+# Amounts of a currency conversion, commas between digits included ("1,000.5", but also "10,20"),
+# and the amounts among them whose commas are thousands separators
+AMOUNT_LITERAL_PATTERN = re.compile(r"\d+(?:,\d+)*(?:\.\d+)?")
+THOUSANDS_AMOUNT_PATTERN = re.compile(r"\d{1,3}(?:,\d{3})+(?:\.\d+)?")
+
+# Numeric literals that plan templates mask: standalone numbers, not the digits of a word like "p90"
+TEMPLATE_LITERAL_PATTERN = re.compile(r"(?<![\w.])\d+(?:\.\d+)?(?!\w|\.\d)")
+
+# Tokens of the calculator's arithmetic language: number, operator, name, or any other character.
+# As in CALC_PROMPT_TOKEN_PATTERN, a scan never starts after a blank
+CALC_TOKEN_PATTERN = re.compile(
+    r"(?<!\s)\s*(?:(\d+\.?\d*(?:e[+-]?\d+)?|\.\d+(?:e[+-]?\d+)?)|(\*\*|//|[-+*/%()])|([a-z_]\w*)|(\S))"
+)
+
+# Terms of KB summaries and search queries (matched on casefolded text)
+KB_TERM_PATTERN = re.compile(r"[^\W_]+")
+
+# KB full-text queries, only at the start of a question and up to the end of its clause:
+# "what/who ... about <topic>" and "who <verb> ..." (but not "who is <name>")
+KB_ABOUT_PATTERN = re.compile(r"^\s*(?:what|who)\b[^?!,;\n]*?\babout\s+([^?!,;\n]+)", re.IGNORECASE)
+KB_WHO_PATTERN = re.compile(r"^\s*who\s+(?!is\b)([^?!,;\n]+)", re.IGNORECASE)
@@ -2,12 +2,15 @@ from typing import List, Callable, Dict, Type
 from pydantic import BaseModel
 from agent.llm_parsers import parse_weather, parse_temperature, parse_calc, parse_kb, parse_currency
 from agent.types.tool_types import CalcArgs, FXArgs, KBArgs, TempArgs, WeatherArgs
+from agent.types.plan_types import PlanStepsListType, build_plan_step_adapter
 from agent.handlers import handle_calc, handle_temp, handle_weather, handle_fx, handle_kb
-from constants.miscellaneous_constants import TEMPERATURE_TOOL, WEATHER_TOOL, CALC_TOOL, KB_TOOL, FX_TOOL
+from agent.handlers import handle_temp_many, handle_weather_many, handle_fx_many, handle_kb_many
+from agent.handlers import handle_temp_async, handle_weather_async, handle_fx_async, handle_kb_async
+from constants.miscellaneous_constants import TEMPERATURE_TOOL, WEATHER_TOOL, CALC_TOOL, KB_TOOL, FX_TOOL, WORD_OPS, VALID_CURRENCIES
 
 
-# Each parser returns a list of dicts that can be parsed into PlanStepModel
-PARSERS: Dict[str, Callable[[str], List[dict]]] = {
+# Each parser returns a list of trusted PlanStep steps with validated args
+PARSERS: Dict[str, Callable[[str], PlanStepsListType]] = {
     WEATHER_TOOL: parse_weather,
     TEMPERATURE_TOOL: parse_temperature,
     KB_TOOL: parse_kb,
@@ -15,6 +18,16 @@ PARSERS: Dict[str, Callable[[str], List[dict]]] = {
     CALC_TOOL: parse_calc,
 }
 
+# Lowercased tokens that must occur in a prompt for a parser to produce any step.
+# Parsers without an entry here are always run.
+PARSER_TRIGGERS: Dict[str, List[str]] = {
+    WEATHER_TOOL: ["weather"],
+    TEMPERATURE_TOOL: ["temperature"],
+    KB_TOOL: ["who", "about"],
+    FX_TOOL: [currency.lower() for currency in VALID_CURRENCIES],
+    CALC_TOOL: list(WORD_OPS) + ["+", "-", "*", "/", "%"],
+}
+
 # Map tool names to their specific Pydantic args models
 TOOL_MODELS: Dict[str, Type[BaseModel]] = {
     CALC_TOOL: CalcArgs,
@@ -24,10 +37,30 @@ TOOL_MODELS: Dict[str, Type[BaseModel]] = {
     FX_TOOL: FXArgs
 }
 
+# Validates raw (untrusted) plan steps, discriminated on the tool name
+PLAN_STEP_ADAPTER = build_plan_step_adapter(TOOL_MODELS)
+
 TOOL_HANDLERS: Dict[str, Callable] = {
     CALC_TOOL: handle_calc,
     WEATHER_TOOL: handle_weather,
     TEMPERATURE_TOOL: handle_temp,
     KB_TOOL: handle_kb,
     FX_TOOL: handle_fx
-}
\ No newline at end of file
+}
+
+# Handlers that run the same step of many plans at once: (args list, intermediate values list) -> result list.
+# A result may be an exception instance, meaning that step failed the way the scalar handler would have raised.
+BATCH_TOOL_HANDLERS: Dict[str, Callable] = {
+    WEATHER_TOOL: handle_weather_many,
+    TEMPERATURE_TOOL: handle_temp_many,
+    KB_TOOL: handle_kb_many,
+    FX_TOOL: handle_fx_many,
+}
+
+# Coroutine handlers whose lookups can be awaited; tools without one (calc) run inline
+ASYNC_TOOL_HANDLERS: Dict[str, Callable] = {
+    WEATHER_TOOL: handle_weather_async,
+    TEMPERATURE_TOOL: handle_temp_async,
+    KB_TOOL: handle_kb_async,
+    FX_TOOL: handle_fx_async,
+}
@@ -0,0 +1,45 @@
+import asyncio
+import time
+from agent import tools
+from agent.agent import answer, answer_async
+from agent.plan_graph import step_dependencies
+from agent.types.plan_types import plan_step
+from agent.types.tool_types import CalcArgs, FXArgs, TempArgs, WeatherArgs
+from constants.tool_constants import TOOL_HANDLERS
+from tests.test_batch import QUERIES
+
+
+def test_answer_async_matches_answer():
+    for q in QUERIES:
+        assert asyncio.run(answer_async(q)) == answer(q)
+
+def test_answer_async_runs_independent_lookups_concurrently(monkeypatch):
+    weather, temp = tools.weather, tools.temp
+
+    def slow_weather(city):
+        time.sleep(0.1)
+        return weather(city)
+
+    def slow_temp(cities, operation="single"):
+        time.sleep(0.1)
+        return temp(cities, operation)
+
+    monkeypatch.setattr(tools, "weather", slow_weather)
+    monkeypatch.setattr(tools, "temp", slow_temp)
+
+    start = time.perf_counter()
+    result = asyncio.run(answer_async("Weather and temperature in Paris and London?"))
+    elapsed = time.perf_counter() - start
+
+    assert result == {"Paris": "18°C", "London": "17.0°C"}
+    # Two weather lookups and one temperature lookup, 0.3s when run in order
+    assert elapsed < 0.25
+
+def test_step_dependencies_follow_shared_keys():
+    plan = [
+        plan_step("weather", WeatherArgs(cities=["paris"])),
+        plan_step("temperature", TempArgs(cities=["paris"], operation="average")),
+        plan_step("calc", CalcArgs(expr="+ 10")),
+        plan_step("fx", FXArgs(amount=None, from_currency="USD", to_currency="EUR")),
+    ]
+    assert step_dependencies(plan, TOOL_HANDLERS) == [(), (), (1,), (2,)]
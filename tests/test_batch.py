@@ -0,0 +1,57 @@
+from agent.agent import answer, answer_many
+from agent.handlers import handle_fx_many
+from agent.tools import temp, temp_many
+from agent.types.tool_types import FXArgs
+
+QUERIES = [
+    "Who is Ada Lovelace?",
+    "Who is Foo Bar?",
+    "What is 12.5% of 243?",
+    "What is 8 / 0?",
+    "What is foo + bar",
+    "Convert the average of 10 and 20 USD into EUR.",
+    "Convert 10 USD to ABC",
+    "Add 10 to the average temperature in Paris and London right now.",
+    "Add 10 and multiply by 2 and multiply by 4 and then divide by 2 to the average temperature in dhaka and London.",
+    "Temperature in Dhaka?",
+    "Temperature in Paris and Mumbai?",
+    "Weather in Paris and London?",
+    "Weather in Gotham?",
+    "Weather in Paris?",
+    "dummy input that makes no sense 12345",
+    "",
+]
+
+
+def test_answer_many_matches_answer():
+    queries = QUERIES + QUERIES[::-1]
+    assert answer_many(queries) == [answer(q) for q in queries]
+
+def test_answer_many_duplicates_get_own_results():
+    results = answer_many(["Weather in Paris and London?", "Weather in Paris and London?"])
+    assert results[0] == results[1]
+    assert results[0] is not results[1]
+
+def test_answer_many_empty():
+    assert answer_many([]) == []
+
+def test_handle_fx_many_uses_last_calc_result():
+    states = [{"last_calc_result": 15.0}, {}]
+    args = FXArgs(amount=None, from_currency="USD", to_currency="EUR")
+    results = handle_fx_many([args, args], states)
+    assert results[0] == states[0]["last_fx_result"]
+    assert isinstance(results[1], ValueError)
+
+def test_handle_fx_many_converts_bulk_steps():
+    states = [{}, {}]
+    bulk = FXArgs(amounts=[10.0, 20.0], from_currency="USD", to_currency="EUR")
+    single = FXArgs(amount=5.0, from_currency="EUR", to_currency="USD")
+    assert handle_fx_many([bulk, single], states) == ["9.1, 18.2", 5.49]
+    assert states[0]["last_fx_result"] == [9.1, 18.2]
+
+def test_temp_many_shares_lookups_and_matches_temp():
+    requests = [(["Paris", "london"], "average"), (["mumbai"], "single"), (["paris", "dhaka"], "bogus")] * 2
+    results = temp_many(requests)
+    assert results == [temp(cities, operation) for cities, operation in requests]
+    # A repeated request gets its own copy of the result
+    assert results[0] is not results[3]
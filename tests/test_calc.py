@@ -1,4 +1,13 @@
+import array
+import builtins
+import time
+import pytest
 from agent.agent import answer
+from agent.llm_parsers import parse_calc
+from agent.tools import calc_elementwise, calc_numbers, compile_chain, evaluate
+from agent.tools import calc_tools
+from agent.tools.calc_tools import _cached_expression
+from utils import vector_ops
 
 def test_calc_simple_addition():
     result = answer("What is 2 + 3?")
@@ -59,3 +68,88 @@ def test_calc_percentage():
     assert result is not None
     assert isinstance(result, float)
     assert result == 30.375
+
+def test_calc_engine_follows_python_arithmetic():
+    assert evaluate("-2 ** 2") == -4.0
+    assert evaluate("2 ** -1") == 0.5
+    assert evaluate("7 // -2") == -4.0
+    assert evaluate("-7 % 3") == 2.0
+    assert evaluate("what is 2 + 3 * 4") == 14.0
+    assert evaluate("2 3") is None
+    assert evaluate("foo + bar") is None
+
+def test_calc_never_calls_eval(monkeypatch):
+    def no_eval(*args, **kwargs):
+        raise AssertionError("eval must not be called")
+
+    monkeypatch.setattr(builtins, "eval", no_eval)
+    assert answer("What is 3 plus 1.5?") == 4.5
+    assert evaluate("5 % of 20") == 1.0
+    assert evaluate("1 % of x") == 0.0
+
+def test_calc_compiles_repeated_expressions_once():
+    before = _cached_expression.cache_info()
+    for _ in range(3):
+        assert evaluate("  6 *   7 ") == 42.0
+    after = _cached_expression.cache_info()
+    assert after.misses - before.misses <= 1
+    assert after.hits - before.hits >= 2
+
+def test_calc_compiled_chain_matches_textual_evaluation():
+    ops = ["+ 10", "* 2", "/ 4", "- 0.05"]
+    chain = compile_chain(ops)
+    for value in [18.0, 31.36, -5.0, 0.0, 17, None, float("inf")]:
+        expected = value
+        for op in ops:
+            expected = evaluate(f"{expected}{op}")
+        assert chain(value) == expected
+
+def test_calc_numbers_accepts_float_arrays(monkeypatch):
+    monkeypatch.setattr(vector_ops, "VECTOR_MIN_SIZE", 4)
+    values = [3.5, -1.25, 10.0, 7.75, 0.5]
+    packed = array.array("d", values)
+    assert calc_numbers(packed, "sum") == calc_numbers(values, "sum") == 20.5
+    assert calc_numbers(packed, "average") == calc_numbers(values, "average") == 4.1
+    assert calc_numbers(packed, "min") == -1.25
+    assert calc_numbers(packed, "max") == 10.0
+    assert calc_numbers(array.array("d"), "sum") == 0.0
+
+def test_calc_numbers_streaming_operations():
+    values = [4, 1, 3, 2]
+    assert calc_numbers(values, "median") == 2.5
+    assert calc_numbers(values, "p90") == 3.7
+    assert calc_numbers(values, "stddev") == pytest.approx(1.118033988749895)
+    assert calc_numbers((v for v in values), "median") == 2.5
+    assert calc_numbers((v for v in values), "sum") == 10.0
+    assert calc_numbers((v for v in values), "average") == 2.5
+    assert calc_numbers((v for v in values), "max") == 4.0
+    assert calc_numbers((v for v in []), "p99") == 0.0
+    assert calc_numbers((v for v in values), "mode") is None
+
+def test_calc_elementwise_lists():
+    assert answer("Add 5 to each of 1, 2, 3") == "6.0, 7.0, 8.0"
+    assert answer("Multiply 10, 20, 30 by 1.5") == "15.0, 30.0, 45.0"
+    assert answer("Subtract 2 from each of 4, 5 and 6") == "2.0, 3.0, 4.0"
+    assert answer("Add 5 to each of 7") == 12.0
+    assert answer("Divide 10 and 20 by 0") is None
+
+def test_calc_elementwise_compiles_once(monkeypatch):
+    calls = []
+    monkeypatch.setattr(calc_tools, "evaluate", lambda expr: calls.append(expr))
+    assert calc_elementwise((float(n) for n in range(1000)), ["* 2", "+ 1"])[-1] == 1999.0
+    assert calls == []
+
+def test_parse_calc_phrases():
+    def exprs(prompt):
+        return [(step.args.numbers, step.args.expr) for step in parse_calc(prompt)]
+
+    assert exprs("What is 12.5% of 243 and 31 plus 5?") == [(None, "12.5% of 243"), (None, "31 + 5")]
+    assert exprs("Add 10 and multiply by 2") == [(None, "+ 10 and * 2")]
+    assert exprs("What is 10usdplus 5?") == [(None, "10usd + 5")]
+    assert exprs("readd 5") == []
+    assert exprs("Multiply each of 1, 2 and 3 by 4") == [([1.0, 2.0, 3.0], "* 4")]
+
+def test_parse_calc_long_numbers_are_linear():
+    start = time.perf_counter()
+    assert parse_calc("7" * 200_000 + " apples") == []
+    assert time.perf_counter() - start < 1.0
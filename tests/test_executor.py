@@ -0,0 +1,64 @@
+import time
+from agent import executor, tools
+from agent.agent import answer
+from agent.executor import NOT_RUN, execute_plan
+from agent.plan_graph import step_dependencies
+from agent.types.plan_types import plan_step
+from agent.types.tool_types import CalcArgs, FXArgs, KBArgs, TempArgs, WeatherArgs
+from constants.tool_constants import TOOL_HANDLERS
+
+PLAN = [
+    plan_step("weather", WeatherArgs(cities=["paris", "london"])),
+    plan_step("temperature", TempArgs(cities=["paris", "london"], operation="average")),
+    plan_step("kb", KBArgs(q="ada lovelace")),
+    plan_step("calc", CalcArgs(expr="+ 10")),
+    plan_step("fx", FXArgs(amount=None, from_currency="USD", to_currency="EUR")),
+    plan_step("fx", FXArgs(amount=5.0, from_currency="EUR", to_currency="USD")),
+]
+
+
+def test_dependencies_depend_on_args():
+    assert step_dependencies(PLAN, TOOL_HANDLERS) == [(), (), (), (1,), (3,), (4,)]
+
+def test_parallel_matches_sequential(monkeypatch):
+    parallel_state = {}
+    parallel = execute_plan(PLAN, TOOL_HANDLERS, parallel_state)
+
+    monkeypatch.setattr(executor, "PLAN_EXECUTOR_WORKERS", 1)
+    sequential_state = {}
+    sequential = execute_plan(PLAN, TOOL_HANDLERS, sequential_state)
+
+    assert parallel == sequential
+    assert parallel_state == sequential_state
+
+def test_failed_step_skips_dependents():
+    plan = [
+        plan_step("calc", CalcArgs(expr="8 / 0")),
+        plan_step("weather", WeatherArgs(cities=["paris"])),
+        plan_step("fx", FXArgs(amount=None, from_currency="USD", to_currency="EUR")),
+    ]
+    outcomes = execute_plan(plan, TOOL_HANDLERS, {})
+    assert isinstance(outcomes[0], ZeroDivisionError)
+    assert outcomes[1] == "Mild and cloudy."
+    assert outcomes[2] is NOT_RUN
+
+def test_answer_runs_independent_steps_in_parallel(monkeypatch):
+    weather, temp = tools.weather, tools.temp
+
+    def slow_weather(city):
+        time.sleep(0.1)
+        return weather(city)
+
+    def slow_temp(cities, operation="single"):
+        time.sleep(0.1)
+        return temp(cities, operation)
+
+    monkeypatch.setattr(tools, "weather", slow_weather)
+    monkeypatch.setattr(tools, "temp", slow_temp)
+
+    start = time.perf_counter()
+    result = answer("Weather and temperature in Paris?")
+    elapsed = time.perf_counter() - start
+
+    assert result == "18°C"
+    assert elapsed < 0.18
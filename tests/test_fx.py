@@ -1,5 +1,17 @@
+import array
+import time
+import pytest
+from agent.llm_parsers.fx_parser import parse_currency
+from agent.tools.fx_history import RateHistory
+from agent.tools.fx_rates import FX_MATRIX, RateMatrix
+from agent.tools import fx_convert, fx_convert_many
+import agent.tools.fx_tools as fx_tools
+from constants.miscellaneous_constants import VALID_CURRENCIES
 from agent.agent import answer
 
+# Quotes reaching every currency of VALID_CURRENCIES, for the cross-rate tests
+CROSS_QUOTES = {"usd_to_eur": 0.91, "eur_to_gbp": 0.86, "usd_to_jpy": 147.5, "usd_to_cad": 1.37, "cad_to_aud": 1.11}
+
 def test_fx_simple_conversion():
     result = answer("Convert 10 USD to EUR")
     assert result is not None
@@ -29,3 +41,87 @@ def test_fx_known_to_unknown_currency():
 def test_fx_unknown_to_unknown_currency():
     result = answer("Convert 10 XYZ to ABC")
     assert result is None
+
+def test_parse_currency_long_amount_runs_are_linear():
+    start = time.perf_counter()
+    assert parse_currency("1, 2 and 3 " * 20_000 + "usd") == []
+    steps = parse_currency("sum of " + "1, 2 and 3 " * 20_000 + "usd to eur")
+    assert time.perf_counter() - start < 1.0
+    assert steps[0].args.operation == "sum" and len(steps[0].args.numbers) == 60_000
+
+def test_fx_cross_rates_cover_every_currency_pair():
+    matrix = RateMatrix(CROSS_QUOTES, VALID_CURRENCIES)
+    # GBP -> AUD has no quote: GBP -> EUR -> USD -> CAD -> AUD
+    assert matrix.rate("GBP", "aud") == pytest.approx(1 / 0.86 / 0.91 * 1.37 * 1.11)
+    for source in VALID_CURRENCIES:
+        for target in VALID_CURRENCIES:
+            assert matrix.rate(source, target) * matrix.rate(target, source.lower()) == pytest.approx(1.0)
+    # Only USD/EUR is quoted in production
+    assert FX_MATRIX.rate("EUR", "USD") == pytest.approx(1 / 0.91)
+    assert FX_MATRIX.rate("GBP", "AUD") is None
+
+
+def test_rate_matrix_unknown_and_disconnected_currencies():
+    matrix = RateMatrix({"usd_to_eur": 0.5, "gbp_to_jpy": 200.0}, ["CHF"])
+    assert matrix.rate("EUR", "usd") == 2.0
+    assert matrix.rate("USD", "JPY") is None
+    assert matrix.rate("CHF", "chf") == 1.0
+    assert matrix.rate("XYZ", "xyz") == 1.0
+    assert matrix.rate("XYZ", "USD") is None
+
+
+def test_fx_several_amounts_convert_in_one_bulk_step():
+    steps = parse_currency("convert 10, 20 and 30 usd to eur")
+    assert len(steps) == 1 and steps[0].args.amounts == [10.0, 20.0, 30.0]
+    assert answer("Convert 10, 20 and 30 USD to EUR") == "9.1, 18.2, 27.3"
+
+
+def test_fx_amounts_with_thousands_separators():
+    assert answer("Convert 1,000 USD to EUR") == 910.0
+    assert parse_currency("convert 1,000.50, 2,500 and 30 usd to eur")[0].args.amounts == [1000.5, 2500.0, 30.0]
+    assert parse_currency("convert 1,0000 usd to eur") == []
+    assert parse_currency("convert 10,20 usd to eur") == []
+
+
+def test_fx_convert_many_matches_scalar_conversions(monkeypatch):
+    monkeypatch.setattr(fx_tools, "FX_MATRIX", RateMatrix(CROSS_QUOTES, VALID_CURRENCIES))
+    amounts = [0.005, 1.115, 2.675, 10.0, 123456.785]
+    pairs = [(source, target) for source in VALID_CURRENCIES + ["XYZ"] for target in VALID_CURRENCIES]
+    expected = [fx_convert(amount, *pair) for pair in pairs for amount in amounts]
+    assert fx_convert_many(
+        amounts * len(pairs),
+        [pair[0] for pair in pairs for _ in amounts],
+        [pair[1] for pair in pairs for _ in amounts],
+    ) == expected
+    assert fx_convert_many(array.array("d", amounts), "usd", "GBP") == [fx_convert(amount, "USD", "GBP") for amount in amounts]
+    with pytest.raises(ValueError):
+        fx_convert_many(amounts, ["USD"], "EUR")
+
+
+def test_fx_conversion_on_a_date_uses_the_rate_as_of_that_date():
+    steps = parse_currency("convert 100 usd to eur on 2025-08-22")
+    assert steps[0].args.date == "2025-08-22"
+    assert answer("Convert 100 USD to EUR on 2025-08-22") == 85.47
+    # A weekend falls back to the last quote before it
+    assert answer("Convert 100 USD to EUR as of 2025-08-24") == 85.47
+    assert answer("Convert 100 EUR to USD on 2025-08-20") == round(100 / 0.8590, 2)
+    assert answer("Convert 100 USD to EUR on 2020-01-01") == 0.0
+
+
+def test_rate_history_sorts_rows_and_crosses_pairs():
+    history = RateHistory.from_rows([
+        ("2025-01-03", "usd_to_eur", 0.9),
+        ("2025-01-01", "usd_to_eur", 0.8),
+        ("2025-01-03", "usd_to_eur", 0.95),
+        ("2025-01-02", "eur_to_gbp", 0.5),
+    ])
+    assert history.rate("USD", "EUR", "2024-12-31") is None
+    assert history.rate("USD", "EUR", "2025-01-02") == 0.8
+    assert history.rate("usd", "eur", "2025-01-03") == 0.95
+    assert history.rate("EUR", "USD", "2025-01-01") == 1 / 0.8
+    assert history.rate("USD", "GBP", "2025-01-01") is None
+    assert history.rate("USD", "GBP", "2025-01-02") == pytest.approx(0.4)
+    with pytest.raises(ValueError):
+        history.rate("USD", "EUR", "2025-02-30")
+    with pytest.raises(ValueError):
+        RateHistory.from_rows([("2025-01-01", "usdeur", 0.9)])
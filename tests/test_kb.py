@@ -1,4 +1,15 @@
+import json
+import os
+import random
+import threading
 from agent.agent import answer
+from agent.tools import kb_lookup_many, kb_lookup_prefix, kb_search_names
+from agent.tools.kb_index import KBIndex, edit_distance
+from agent.tools.kb_reloader import KBReloader, KBSnapshot
+from agent.tools.kb_store import KBStore, convert, write_store
+from agent.tools.kb_text_index import SummaryIndex
+from agent.llm_parsers.kb_parser import parse_kb
+from config.settings import KB_FILE_PATH
 
 def test_kb_existing_query():
     result = answer("Who is Ada Lovelace?")
@@ -16,7 +27,7 @@ def test_kb_existing_query_typo():
     result = answer("Who is aDa LOVlace?")
     assert result is not None
     assert isinstance(result, str)
-    assert result == "No entry found."
+    assert result == "Ada Lovelace was a 19th-century mathematician regarded as an early computing pioneer for her work on Charles Babbage's Analytical Engine."
 
 def test_kb_existing_query_partial_name():
     result = answer("Who is lace?")
@@ -29,3 +40,204 @@ def test_kb_unknown_query():
     assert result is not None
     assert isinstance(result, str)
     assert result == "No entry found."
+
+def test_kb_lookup_many_and_prefix():
+    assert kb_lookup_many(["alan TURING", "Foo", "ada lovelace"]) == [
+        "Alan Turing was a mathematician and logician, widely considered to be the father of theoretical computer science and artificial intelligence.",
+        "No entry found.",
+        "Ada Lovelace was a 19th-century mathematician regarded as an early computing pioneer for her work on Charles Babbage's Analytical Engine.",
+    ]
+    assert kb_lookup_prefix("A") == ["Ada Lovelace", "Alan Turing"]
+    assert kb_lookup_prefix("al") == ["Alan Turing"]
+    assert kb_lookup_prefix("", limit=1) == ["Ada Lovelace"]
+    assert kb_lookup_prefix("lace") == []
+
+def test_kb_index_first_duplicate_wins():
+    index = KBIndex([
+        {"name": "Straße", "summary": "first"},
+        {"name": "STRASSE", "summary": "second"},
+        {"name": "Strand", "summary": "third"},
+    ])
+    assert len(index) == 2
+    assert index.get("strasse")["summary"] == "first"
+    assert [item["summary"] for item in index.get_many(["STRAND", "x"]) if item] == ["third"]
+    assert [item["summary"] for item in index.with_prefix("stra")] == ["third", "first"]
+
+def test_kb_typos_match_the_closest_name():
+    assert answer("who is alan turin").startswith("Alan Turing was")
+    assert answer("Who is ada lovelac?").startswith("Ada Lovelace was")
+    assert kb_search_names("alan turin") == ["Alan Turing"]
+    assert kb_search_names("alan turin", max_distance=0) == []
+    assert kb_lookup_many(["ada lovelac", "alan tu"]) == [answer("Who is Ada Lovelace?"), "No entry found."]
+
+def test_kb_index_fuzzy_search_ranks_by_distance():
+    names = ["Marie Curie", "Marie Curle", "Marie Curry", "Mary", "Marx", "Ann"]
+    index = KBIndex([{"name": name, "summary": name} for name in names])
+    assert [(distance, item["name"]) for distance, item in index.search("marie curie", 2)] == [
+        (0, "Marie Curie"), (1, "Marie Curle"), (2, "Marie Curry"),
+    ]
+    assert [item["name"] for _, item in index.search("MARIE CURRY", 2, limit=2)] == ["Marie Curry", "Marie Curie"]
+    assert [item["name"] for _, item in index.search("marie curiex", 2)] == ["Marie Curie", "Marie Curle"]
+    # Short queries are matched within fewer edits: one for six letters, none under six
+    assert index.search("marxes", 2) == []
+    assert [item["name"] for _, item in index.search("MARY", 2)] == ["Mary"]
+    assert index.search("mar", 2) == []
+
+def test_kb_index_fuzzy_search_matches_a_full_scan():
+    rng = random.Random(7)
+    names = ["".join(rng.choice("abc ") for _ in range(rng.randint(1, 12))) for _ in range(300)]
+    index = KBIndex([{"name": name, "summary": name} for name in names])
+    for query in names[:100] + ["".join(rng.choice("abc") for _ in range(9)) for _ in range(50)]:
+        distance = min(2, len(query) // 3 - 1)
+        if distance <= 0:
+            continue
+        expected = sorted((found, key) for key in index.keys if (found := edit_distance(query, key, distance)) <= distance)
+        assert [(found, item["name"]) for found, item in index.search(query, 2)] == expected
+
+def test_kb_full_text_questions_search_the_summaries():
+    assert parse_kb("who worked on the analytical engine?")[0].args.model_dump() == {"q": "worked on the analytical engine", "search": True}
+    assert parse_kb("what do you know about alan turing?")[0].args.model_dump() == {"q": "alan turing", "search": True}
+    assert parse_kb("who is alan turing?")[0].args.model_dump() == {"q": "alan turing", "search": False}
+    assert answer("Who worked on the Analytical Engine?").startswith("Ada Lovelace was")
+    assert answer("What do you know about theoretical computer science?").startswith("Alan Turing was")
+    assert answer("Who invented the telephone?") == "No entry found."
+
+def test_kb_full_text_search_leaves_other_questions_alone():
+    assert answer("What about the weather in Paris?") == "Mild and cloudy."
+    assert answer("Who wants to know the weather in London?") == "Cool and rainy."
+    assert answer("what's the weather about london") == "Cool and rainy."
+    assert parse_kb("who cares, add 5")[0].args.model_dump() == {"q": "cares", "search": True}
+    assert parse_kb("tell me who worked on the analytical engine") == []
+    assert parse_kb("add 2 and 3, then what about alan turing?") == []
+
+def test_summary_index_ranks_with_bm25():
+    summaries = ["red fox", "red red fox jumps", "blue fox", "red", "green frog"] + ["fox and hound"] * 30
+    index = SummaryIndex([{"name": str(i), "summary": summary} for i, summary in enumerate(summaries)])
+    # "fox" is in almost every summary, so the rare "red" decides; a shorter summary weighs more
+    assert [item["name"] for _, item in index.search("red fox", 3)] == ["3", "1", "0"]
+    assert [item["name"] for _, item in index.search("Frog!", 5)] == ["4"]
+    assert index.search("the", 3) == [] and index.search("fox", 0) == []
+
+def test_summary_index_pruning_keeps_the_exact_top_k():
+    rng = random.Random(3)
+    words = [f"w{i}" for i in range(40)]
+    summaries = [" ".join(rng.choice(words[:rng.randint(2, 40)]) for _ in range(rng.randint(1, 12))) for _ in range(2000)]
+    index = SummaryIndex([{"name": str(i), "summary": summary} for i, summary in enumerate(summaries)])
+    for _ in range(50):
+        query = " ".join(rng.sample(words, 3))
+        everything = index.search(query, len(summaries))
+        assert [score for score, _ in index.search(query, 5)] == [score for score, _ in everything[:5]]
+
+def test_summary_index_ties_come_in_kb_order():
+    # "b" once in two words scores exactly as twice in five, but is read last
+    index = SummaryIndex([{"name": str(i), "summary": summary} for i, summary in enumerate(["b d", "d c", "c c c b b"])])
+    assert [item["name"] for _, item in index.search("b", 1)] == ["0"]
+    assert [item["name"] for _, item in index.search("b", 2)] == ["0", "2"]
+    rng = random.Random(11)
+    summaries = [" ".join(rng.choice("bcde") for _ in range(rng.randint(1, 6))) for _ in range(300)]
+    index = SummaryIndex([{"name": str(i), "summary": summary} for i, summary in enumerate(summaries)])
+    for query in ["b", "b c", "c d e", "b e"]:
+        everything = index.search(query, len(summaries))
+        for k in (1, 3, 10):
+            assert index.search(query, k) == everything[:k]
+
+def test_kb_store_matches_the_in_memory_index(tmp_path):
+    rng = random.Random(5)
+    names = ["Straße", "STRASSE", "Strand", "Émile Borel", "émile", "Zoë", "Ada"] + [
+        "".join(rng.choice("abé ") for _ in range(rng.randint(1, 10))) for _ in range(200)
+    ]
+    entries = [{"name": name, "summary": f"summary {i}"} for i, name in enumerate(names)]
+    assert write_store(entries, str(tmp_path), shard_size=16) == len(entries)
+    store, index = KBStore(str(tmp_path)), KBIndex(entries)
+    assert len(store) == len(index) and len(store.shards) == 13
+    assert list(store.entries()) == entries
+    for name in names + ["strasse", "ÉMILE", "missing", ""]:
+        assert store.get(name) == index.get(name)
+        assert store.search(name, 2) == index.search(name, 2)
+    for prefix in ["", "a", "str", "É", "é", "ab", "zz"]:
+        assert store.with_prefix(prefix) == index.with_prefix(prefix)
+        assert store.with_prefix(prefix, limit=3) == index.with_prefix(prefix, limit=3)
+    assert store.get_many(["zoë", "x"]) == [entries[5], None]
+    store.close()
+
+def test_kb_store_converts_the_kb_file(tmp_path):
+    with open(KB_FILE_PATH, "r", encoding="utf-8") as f:
+        entries = json.load(f)["entries"]
+    assert convert(KB_FILE_PATH, str(tmp_path)) == len(entries)
+    store = KBStore(str(tmp_path))
+    assert store.get("ADA LOVELACE") == entries[0]
+    # Converting again replaces the files; the open store keeps reading the ones it mapped
+    write_store([{"name": "Grace Hopper", "summary": "Admiral"}], str(tmp_path))
+    assert store.get("alan turing") == entries[1]
+    assert KBStore(str(tmp_path)).get("alan turing") is None
+    assert KBStore(str(tmp_path)).get("grace hopper")["summary"] == "Admiral"
+
+def test_kb_indexes_updated_for_a_few_changes_match_a_rebuild():
+    rng = random.Random(11)
+    words = [f"w{i}" for i in range(30)]
+    def entry():
+        name = "".join(rng.choices("abcdefgh", k=rng.randint(4, 10)))
+        return {"name": name, "summary": " ".join(rng.choice(words[:rng.randint(2, 30)]) for _ in range(rng.randint(1, 10)))}
+    entries = [entry() for _ in range(300)]
+    index, summaries = KBIndex(entries), SummaryIndex(entries)
+    for _ in range(3):
+        entries = list(entries)
+        for _ in range(4):
+            entries.pop(rng.randrange(len(entries)))
+            entries.insert(rng.randrange(len(entries)), entry())
+            entries[rng.randrange(len(entries))] = dict(entries[rng.randrange(len(entries))], summary="w1 w2 w2")
+        index, summaries = index.updated(entries, 60), summaries.updated(entries, 60)
+        rebuilt_index, rebuilt_summaries = KBIndex(entries), SummaryIndex(entries)
+        assert len(index) == len(rebuilt_index) and len(summaries) == len(rebuilt_summaries)
+        for item in entries[:100] + [{"name": "missing"}]:
+            assert index.get(item["name"]) == rebuilt_index.get(item["name"])
+            assert index.search(item["name"] + "x", 2) == rebuilt_index.search(item["name"] + "x", 2)
+        for prefix in ["a", "bc", "hhh", "x"]:
+            assert index.with_prefix(prefix) == rebuilt_index.with_prefix(prefix)
+        for _ in range(30):
+            query = " ".join(rng.sample(words, 3))
+            assert summaries.search(query, 5) == rebuilt_summaries.search(query, 5)
+    assert index.updated(entries[150:], 60) is None and summaries.updated(entries[150:], 60) is None
+
+def test_kb_reloader_swaps_in_an_edited_kb(tmp_path):
+    path = str(tmp_path / "kb.json")
+    def write(entries):
+        with open(path, "w", encoding="utf-8") as f:
+            json.dump({"entries": entries}, f)
+        os.utime(path, ns=(0, os.stat(path).st_mtime_ns + 10**9))
+    def load(previous):
+        with open(path, "r", encoding="utf-8") as f:
+            return KBSnapshot.from_entries(json.load(f)["entries"], previous, max_changes=5)
+    write([{"name": "Ada Lovelace", "summary": "Analytical Engine"}, {"name": "Alan Turing", "summary": "Computability"}])
+    reloader = KBReloader([path], load, interval=0)
+    first = reloader.snapshot
+    assert not reloader.check()
+
+    write([{"name": "Ada Lovelace", "summary": "First program"}, {"name": "Grace Hopper", "summary": "Compilers"}])
+    assert reloader.check()
+    assert reloader.snapshot.index.get("ada lovelace")["summary"] == "First program"
+    assert reloader.snapshot.index.get("alan turing") is None
+    assert [item["name"] for _, item in reloader.snapshot.summaries().search("compilers", 1)] == ["Grace Hopper"]
+    # Readers holding the previous snapshot keep a complete, unchanged KB
+    assert first.index.get("ada lovelace")["summary"] == "Analytical Engine"
+    assert first.summaries().search("compilers", 1) == []
+
+    with open(path, "w", encoding="utf-8") as f:
+        f.write('{"entries": [')
+    assert not reloader.check()
+    assert reloader.snapshot.index.get("grace hopper")["summary"] == "Compilers"
+
+def test_kb_reloader_thread_runs_only_between_start_and_stop(tmp_path):
+    assert "kb-reloader" not in [thread.name for thread in threading.enumerate()]
+    path = str(tmp_path / "kb.json")
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump({"entries": []}, f)
+    def load(previous):
+        with open(path, "r", encoding="utf-8") as f:
+            return KBSnapshot.from_entries(json.load(f)["entries"], previous)
+    reloader = KBReloader([path], load, interval=0.01)
+    for _ in range(2):
+        reloader.start()
+        assert "kb-reloader" in [thread.name for thread in threading.enumerate()]
+        reloader.stop()
+        assert "kb-reloader" not in [thread.name for thread in threading.enumerate()]
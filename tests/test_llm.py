@@ -0,0 +1,117 @@
+import pytest
+from concurrent.futures import ThreadPoolExecutor
+from pydantic import ValidationError
+import agent.agent as agent_module
+from agent.agent import answer
+from agent.types.tool_types import CalcArgs, TempArgs
+from agent.llm import call_llm, plan_cache_stats, DISPATCHER, PLAN_CACHE, TEMPLATE_CACHE
+from agent.dispatcher import IntentDispatcher
+from agent.plan_cache import PlanCache
+from constants.tool_constants import PARSERS, PLAN_STEP_ADAPTER
+
+def test_dispatcher_triggers_only_matching_tools():
+    assert DISPATCHER.dispatch("who is ada lovelace?") == {"kb"}
+    assert DISPATCHER.dispatch("convert 10 usd to eur") == {"fx"}
+    assert DISPATCHER.dispatch("what is 3 plus 1.5?") == {"calc"}
+    assert DISPATCHER.dispatch("hello there") == set()
+
+def test_dispatcher_reports_overlapping_triggers():
+    dispatcher = IntentDispatcher({"a": ["divide"], "b": ["divided"], "c": ["cad"], "d": ["add"]})
+    assert dispatcher.dispatch("divided") == {"a", "b"}
+    assert dispatcher.dispatch("cadd") == {"c", "d"}
+
+def test_call_llm_skips_untriggered_parsers():
+    plan = call_llm("Weather in Paris?")
+    assert [step.tool for step in plan] == ["weather"]
+
+def test_plan_cache_hits_near_identical_prompts():
+    PLAN_CACHE.clear()
+    first = call_llm("Summarize today’s weather in Paris")
+    second = call_llm("  summarize TODAY'S   weather in paris ")
+    assert first == second
+    assert PLAN_CACHE.stats()["hits"] == 1
+
+def test_plan_cache_invalidated_when_parsers_change(monkeypatch):
+    PLAN_CACHE.clear()
+    call_llm("Weather in Paris?")
+    monkeypatch.setitem(PARSERS, "weather", lambda prompt: [])
+    assert call_llm("Weather in Paris?") == []
+
+def test_plan_cache_evicts_least_recently_used():
+    cache = PlanCache(max_entries=2, max_bytes=1024)
+    cache.put("a", 1)
+    cache.put("b", 2)
+    cache.get("a")
+    cache.put("c", 3)
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+def test_plan_cache_is_thread_safe():
+    cache = PlanCache(max_entries=50, max_bytes=10_000)
+
+    def worker(offset):
+        for i in range(500):
+            cache.put(str((i + offset) % 80), i)
+            cache.get(str(i % 80))
+
+    with ThreadPoolExecutor(max_workers=8) as pool:
+        list(pool.map(worker, range(8)))
+
+    stats = cache.stats()
+    assert stats["entries"] <= 50
+    assert stats["hits"] + stats["misses"] == 8 * 500
+
+def test_plan_template_fills_numeric_variants():
+    TEMPLATE_CACHE.clear()
+    call_llm("What is 12.5% of 243?")
+    plan = call_llm("What is 17.5% of 120?")
+    assert plan_cache_stats()["templates"]["hits"] == 1
+    assert plan[0].args.expr == "17.5% of 120"
+    assert answer("What is 50% of 90?") == 45.0
+
+def test_plan_template_skipped_when_literals_are_ambiguous():
+    TEMPLATE_CACHE.clear()
+    call_llm("What is 2 + 2?")
+    assert plan_cache_stats()["templates"]["entries"] == 0
+    assert answer("What is 4 + 2?") == 6.0
+
+@pytest.mark.parametrize("first, second", [
+    ("what is 2025-08-22", "what is 12-3-4"),
+    ("p90 temperature in paris and london", "p50 temperature in paris and london"),
+    ("convert 100 usd to eur on 2025-08-22", "convert 100 usd to eur on 2025-8-22"),
+])
+def test_plan_template_does_not_depend_on_earlier_prompts(first, second):
+    PLAN_CACHE.clear()
+    TEMPLATE_CACHE.clear()
+    fresh = call_llm(second)
+    PLAN_CACHE.clear()
+    TEMPLATE_CACHE.clear()
+    call_llm(first)
+    assert call_llm(second) == fresh
+
+def test_plan_template_not_cached_for_empty_plans():
+    TEMPLATE_CACHE.clear()
+    assert call_llm("what is 2025-08-22") == []
+    assert plan_cache_stats()["templates"]["entries"] == 0
+
+def test_parsed_steps_are_not_revalidated(monkeypatch):
+    PLAN_CACHE.clear()
+
+    def fail(*args, **kwargs):
+        raise AssertionError("args validated twice")
+
+    monkeypatch.setattr(CalcArgs, "model_validate", fail)
+    assert answer("What is 6 * 7?") == 42.0
+
+def test_raw_llm_steps_are_validated_at_the_boundary(monkeypatch):
+    monkeypatch.setattr(agent_module, "call_llm", lambda q: [{"tool": "calc", "args": {"expr": "2 + 3"}}])
+    assert answer("anything") == 5.0
+
+def test_plan_step_schema_is_discriminated_on_tool():
+    step = PLAN_STEP_ADAPTER.validate_python({"tool": "temperature", "args": {"cities": ["paris"]}})
+    assert isinstance(step.args, TempArgs)
+
+def test_plan_step_schema_rejects_unknown_tool():
+    with pytest.raises(ValidationError):
+        PLAN_STEP_ADAPTER.validate_python({"tool": "teleport", "args": {}})
@@ -0,0 +1,43 @@
+from agent.agent import answer
+from agent.executor import execute_plan
+from agent.llm import call_llm
+from agent.plan_optimizer import optimize_plan
+from agent.types.plan_types import plan_step
+from agent.types.tool_types import CalcArgs, KBArgs
+from constants.tool_constants import TOOL_HANDLERS
+
+PROMPTS = [
+    "What is 10% of 50 and 20% of 30?",
+    "What is 2 + 3 and 4 * 5?",
+    "What is 10% of 50 then add 5?",
+    "Weather and temperature in Paris and London?",
+    "Add 10 and multiply by 2 to the average temperature in Paris and London.",
+    "Add 10 to the temperature in Paris and London.",
+    "Convert the average of 10 and 20 USD into EUR.",
+    "Who is Ada Lovelace?",
+]
+
+
+def test_optimized_plans_give_the_same_result():
+    for prompt in PROMPTS:
+        plan = call_llm(prompt)
+        optimized = optimize_plan(plan, TOOL_HANDLERS)
+        plain_state, optimized_state = {}, {}
+        assert execute_plan(plan, TOOL_HANDLERS, plain_state)[-1] == execute_plan(optimized, TOOL_HANDLERS, optimized_state)[-1]
+
+def test_independent_calc_steps_are_dropped():
+    assert len(call_llm("What is 10% of 50 and 20% of 30?")) == 2
+    assert answer("What is 10% of 50 and 20% of 30?") == 6.0
+
+def test_calc_chain_is_fused():
+    optimized = optimize_plan(call_llm("What is 10% of 50 then add 5?"), TOOL_HANDLERS)
+    assert optimized == [plan_step("calc", CalcArgs(expr="10% of 50 and + 5"))]
+    assert answer("What is 10% of 50 then add 5?") == 10.0
+
+def test_steps_feeding_later_steps_are_kept():
+    plan = call_llm("Convert the average of 10 and 20 USD into EUR.")
+    assert optimize_plan(plan, TOOL_HANDLERS) == plan
+
+def test_unrelated_steps_before_the_last_are_dropped():
+    plan = [plan_step("kb", KBArgs(q="ada lovelace")), plan_step("calc", CalcArgs(expr="2 + 3"))]
+    assert optimize_plan(plan, TOOL_HANDLERS) == plan[1:]
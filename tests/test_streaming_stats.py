@@ -0,0 +1,27 @@
+import random
+import statistics
+import pytest
+from utils.streaming_stats import QuantileSketch, running_stats, streaming_median, streaming_quantile, streaming_stddev
+
+def test_small_streams_are_exact():
+    rng = random.Random(1)
+    values = [rng.uniform(-50, 50) for _ in range(150)]
+    assert streaming_median(iter(values)) == pytest.approx(statistics.median(values))
+    assert streaming_stddev(iter(values)) == pytest.approx(statistics.pstdev(values))
+    stats = running_stats(iter(values))
+    assert (stats.count, stats.minimum, stats.maximum) == (150, min(values), max(values))
+
+def test_sketch_memory_is_bounded_and_rank_error_small():
+    rng = random.Random(7)
+    sketch = QuantileSketch(k=200)
+    for _ in range(200_000):
+        sketch.add(rng.random())
+    assert sum(len(items) for items in sketch._compactors) < 3 * 200 + 2 * len(sketch._compactors)
+    for q in (0.5, 0.9, 0.99):
+        assert sketch.quantile(q) == pytest.approx(q, abs=0.02)
+
+def test_empty_stream_raises():
+    with pytest.raises(ValueError):
+        streaming_quantile(iter([]), 0.5)
+    with pytest.raises(ValueError):
+        streaming_stddev([])
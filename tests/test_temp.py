@@ -1,3 +1,5 @@
+import time
+from agent.llm_parsers.temp_parser import parse_temperature
 from agent.agent import answer
 
 def test_temp_known_city():
@@ -36,3 +38,15 @@ def test_calc_nested_calc_and_average_temperature():
     assert isinstance(result, str)
     assert result == "136.0°C"
 
+
+def test_temp_median_and_percentiles():
+    assert answer("What is the median temperature in Paris, London and Dhaka?") == '18°C'
+    assert answer("p90 temperature in Paris, London, Dhaka and Amsterdam") == '28°C'
+    assert answer("Add 10 to the median temperature in Paris, London and Dhaka") == '28.0°C'
+
+def test_parse_temperature_long_prompts_are_linear():
+    start = time.perf_counter()
+    assert parse_temperature("sum" + " " * 200_000 + "temperature")[0].args.cities == [""]
+    steps = parse_temperature("temperature in paris and " * 20_000 + "\nx")
+    assert time.perf_counter() - start < 1.0
+    assert steps[0].args.cities == ["paris"]
@@ -1,3 +1,5 @@
+import time
+from agent.llm_parsers.weather_parser import parse_weather
 from agent.agent import answer
 
 def test_weather_known_city():
@@ -31,3 +33,9 @@ def test_temp_known_and_unknown_cities():
     assert result is not None
     assert isinstance(result, str)
     assert result == "Mild and cloudy."
+
+def test_parse_weather_long_prompts_are_linear():
+    start = time.perf_counter()
+    steps = parse_weather("weather in paris " * 20_000 + "\nx")
+    assert time.perf_counter() - start < 1.0
+    assert steps[0].args.cities == ["paris"]
@@ -1,3 +1,4 @@
+import inspect
 import time
 from functools import wraps
 from utils.logger import get_logger
@@ -8,6 +9,8 @@ def track_latency(module_name: str):
     """
     Decorator to measure and log the execution time of a function.
 
+    Coroutine functions are timed until the awaited coroutine completes.
+
     Args:
         module_name (str): Name of the module or context being timed (e.g., __name__).
 
@@ -16,6 +19,16 @@ def track_latency(module_name: str):
     """
     
     def decorator(func):
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                start_time = time.perf_counter()
+                result = await func(*args, **kwargs)
+                duration = time.perf_counter() - start_time
+                logger.info("Duration for %s: %.6f second(s)", module_name, duration)
+                return result
+            return async_wrapper
+
         @wraps(func)
         def wrapper(*args, **kwargs):
             start_time = time.perf_counter()
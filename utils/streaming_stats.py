@@ -0,0 +1,222 @@
+import math
+from itertools import islice
+from typing import Iterable, List, Union
+from config.settings import QUANTILE_SKETCH_SIZE
+
+Number = Union[int, float]
+
+
+class RunningStats:
+    """
+    One-pass count, sum, min, max, mean and variance (Welford's algorithm).
+
+    Keeps five numbers whatever the length of the stream.
+    """
+
+    __slots__ = ("count", "total", "minimum", "maximum", "mean", "_m2")
+
+    def __init__(self) -> None:
+        self.count: int = 0
+        self.total: Number = 0
+        self.minimum: float = math.inf
+        self.maximum: float = -math.inf
+        self.mean: float = 0.0
+        self._m2: float = 0.0
+
+    def add(self, value: Number) -> None:
+        """Fold one value into the statistics."""
+
+        self.count += 1
+        self.total += value
+        if value < self.minimum:
+            self.minimum = value
+        if value > self.maximum:
+            self.maximum = value
+        delta: float = value - self.mean
+        self.mean += delta / self.count
+        self._m2 += delta * (value - self.mean)
+
+    @property
+    def variance(self) -> float:
+        """Population variance of the values seen so far (0.0 before any value)."""
+
+        return self._m2 / self.count if self.count else 0.0
+
+    @property
+    def stddev(self) -> float:
+        """Population standard deviation of the values seen so far."""
+
+        return math.sqrt(self.variance)
+
+
+class QuantileSketch:
+    """
+    KLL quantile sketch: approximate quantiles of a stream in bounded memory.
+
+    Values go into a stack of compactors. When the sketch is full, every
+    compactor over its capacity, from the bottom up, is sorted and every
+    other value (alternating between odd and even positions) is promoted one
+    level up with twice the weight; the rest are dropped. Capacities shrink by 2/3 per level below
+    the top, so the sketch holds about 3 * k values, plus two per extra level.
+    Streams shorter than k values are never compacted and their quantiles
+    are exact.
+    """
+
+    def __init__(self, k: int = QUANTILE_SKETCH_SIZE) -> None:
+        self.k: int = max(k, 2)
+        self.count: int = 0
+        self._compactors: List[List[float]] = [[]]
+        self._offsets: List[int] = [0]
+        self._size: int = 0
+        self._max_size: int = self._capacity(0)
+
+    def _capacity(self, level: int) -> int:
+        depth: int = len(self._compactors) - level - 1
+        return max(2, math.ceil(self.k * (2 / 3) ** depth))
+
+    def add(self, value: Number) -> None:
+        """Fold one value into the sketch."""
+
+        self._compactors[0].append(value)
+        self.count += 1
+        self._size += 1
+        if self._size >= self._max_size:
+            self._compress()
+
+    def extend(self, values: Iterable[Number]) -> None:
+        """Fold an iterable into the sketch, reading it in chunks no larger than the free room."""
+
+        iterator = iter(values)
+        while True:
+            chunk: List[Number] = list(islice(iterator, self._max_size - self._size))
+            if not chunk:
+                return
+            self._compactors[0].extend(chunk)
+            self.count += len(chunk)
+            self._size += len(chunk)
+            if self._size >= self._max_size:
+                self._compress()
+
+    def _compress(self) -> None:
+        for level, items in enumerate(self._compactors):
+            if len(items) < self._capacity(level):
+                continue
+
+            if level + 1 == len(self._compactors):
+                self._compactors.append([])
+                self._offsets.append(0)
+
+            items.sort()
+            paired: int = len(items) - len(items) % 2
+            self._compactors[level + 1].extend(items[self._offsets[level]:paired:2])
+            self._offsets[level] ^= 1
+            self._compactors[level] = items[paired:]
+
+        self._size = sum(len(items) for items in self._compactors)
+        self._max_size = sum(self._capacity(level) for level in range(len(self._compactors)))
+
+    def quantile(self, q: float) -> float:
+        """
+        Estimate the q-quantile of the values seen so far.
+
+        Args:
+            q (float): Quantile between 0 and 1, e.g. 0.5 for the median.
+
+        Returns:
+            float: Linear interpolation between the closest ranks while the sketch
+                is exact, otherwise the smallest retained value whose weighted
+                rank reaches q.
+
+        Raises:
+            ValueError: If no value was added or q is outside [0, 1].
+        """
+
+        if not 0 <= q <= 1:
+            raise ValueError(f"Quantile must be between 0 and 1, got {q}")
+        if self.count == 0:
+            raise ValueError("Quantile of an empty stream")
+
+        if len(self._compactors) == 1:
+            values: List[float] = sorted(self._compactors[0])
+            position: float = q * (len(values) - 1)
+            low: int = math.floor(position)
+            high: int = min(low + 1, len(values) - 1)
+            return values[low] + (values[high] - values[low]) * (position - low)
+
+        weighted = sorted(
+            (value, 1 << level)
+            for level, items in enumerate(self._compactors)
+            for value in items
+        )
+        target: float = q * sum(weight for _, weight in weighted)
+        cumulative: int = 0
+        for value, weight in weighted:
+            cumulative += weight
+            if cumulative >= target:
+                return value
+        return weighted[-1][0]
+
+
+def running_stats(values: Iterable[Number]) -> RunningStats:
+    """
+    Consume an iterable once and return its running statistics.
+
+    Args:
+        values (Iterable[Number]): Numbers; generators are read lazily.
+
+    Returns:
+        RunningStats: Count, sum, min, max, mean and variance of the values.
+    """
+
+    stats = RunningStats()
+    for value in values:
+        stats.add(value)
+    return stats
+
+
+def streaming_quantile(values: Iterable[Number], q: float) -> float:
+    """
+    Approximate q-quantile of an iterable in one pass and bounded memory.
+
+    Exact (numpy-style linear interpolation) for fewer than QUANTILE_SKETCH_SIZE values.
+
+    Args:
+        values (Iterable[Number]): Numbers; generators are read lazily.
+        q (float): Quantile between 0 and 1.
+
+    Returns:
+        float: The estimated quantile.
+
+    Raises:
+        ValueError: If `values` is empty or q is outside [0, 1].
+    """
+
+    sketch = QuantileSketch()
+    sketch.extend(values)
+    return sketch.quantile(q)
+
+
+def streaming_median(values: Iterable[Number]) -> float:
+    """Approximate median of an iterable; see `streaming_quantile`."""
+
+    return streaming_quantile(values, 0.5)
+
+
+def streaming_stddev(values: Iterable[Number]) -> float:
+    """
+    Population standard deviation of an iterable in one pass.
+
+    Args:
+        values (Iterable[Number]): Numbers; generators are read lazily.
+
+    Returns:
+        float: The standard deviation.
+
+    Raises:
+        ValueError: If `values` is empty.
+    """
+
+    stats: RunningStats = running_stats(values)
+    if stats.count == 0:
+        raise ValueError("Standard deviation of an empty stream")
+    return stats.stddev
@@ -0,0 +1,55 @@
+import inspect
+import itertools
+from functools import wraps
+from typing import Callable, TypeVar
+from typeguard import typechecked as _typeguard_typechecked
+from config.settings import TYPECHECK_MODE, TYPECHECK_SAMPLE_RATE
+
+F = TypeVar("F", bound=Callable)
+
+TYPECHECK_MODES = ("full", "sampled", "off")
+
+if TYPECHECK_MODE not in TYPECHECK_MODES:
+    raise ValueError(f"TYPECHECK_MODE must be one of {TYPECHECK_MODES}, got {TYPECHECK_MODE!r}")
+
+
+def typechecked(func: F) -> F:
+    """
+    Apply typeguard runtime checks according to the configured TYPECHECK_MODE.
+
+    - "full": every call is checked (typeguard's `@typechecked`).
+    - "sampled": one call in TYPECHECK_SAMPLE_RATE is checked, the rest run uninstrumented.
+    - "off": the function is returned unchanged, with no per-call overhead.
+
+    Args:
+        func (F): Function to instrument.
+
+    Returns:
+        F: The instrumented (or original) function.
+    """
+
+    if TYPECHECK_MODE == "off":
+        return func
+
+    checked = _typeguard_typechecked(func)
+    if TYPECHECK_MODE == "full" or TYPECHECK_SAMPLE_RATE <= 1:
+        return checked
+
+    calls = itertools.count()
+
+    if inspect.iscoroutinefunction(func):
+        @wraps(func)
+        async def sampled_async(*args, **kwargs):
+            if next(calls) % TYPECHECK_SAMPLE_RATE == 0:
+                return await checked(*args, **kwargs)
+            return await func(*args, **kwargs)
+
+        return sampled_async
+
+    @wraps(func)
+    def sampled(*args, **kwargs):
+        if next(calls) % TYPECHECK_SAMPLE_RATE == 0:
+            return checked(*args, **kwargs)
+        return func(*args, **kwargs)
+
+    return sampled
@@ -0,0 +1,102 @@
+from typing import Any, Collection, Optional, Union
+from config.settings import VECTOR_MIN_SIZE
+
+try:
+    import numpy as np
+except ImportError:  # NumPy is optional; the pure-Python path covers every input
+    np = None
+
+Number = Union[int, float]
+
+
+def vectorized_available() -> bool:
+    """Whether the NumPy backend is installed."""
+
+    return np is not None
+
+
+def _as_float_array(values: Collection[Number]) -> Optional[Any]:
+    """
+    Return a float64 NumPy view of a contiguous numeric buffer, or None to use the Python path.
+
+    Only NumPy arrays and buffer-protocol objects (array.array, memoryview) of
+    at least VECTOR_MIN_SIZE values qualify; they are viewed without copying
+    when they already hold float64. Lists stay on the Python path: packing a
+    list into an array costs more than one builtin reduction over it.
+    """
+
+    if np is None or isinstance(values, (list, tuple)) or len(values) < VECTOR_MIN_SIZE:
+        return None
+    try:
+        return np.asarray(values, dtype=np.float64)
+    except (TypeError, ValueError):
+        return None
+
+
+def vector_sum(values: Collection[Number]) -> Number:
+    """
+    Sum of the values.
+
+    Args:
+        values (Collection[Number]): List, tuple, array.array, memoryview or NumPy array of numbers.
+
+    Returns:
+        Number: The sum (a float on the vectorized path).
+    """
+
+    array = _as_float_array(values)
+    return float(array.sum()) if array is not None else sum(values)
+
+
+def vector_mean(values: Collection[Number]) -> float:
+    """
+    Arithmetic mean of the values.
+
+    Args:
+        values (Collection[Number]): Non-empty collection of numbers.
+
+    Returns:
+        float: The mean.
+
+    Raises:
+        ZeroDivisionError: If `values` is empty.
+    """
+
+    array = _as_float_array(values)
+    return float(array.mean()) if array is not None else sum(values) / len(values)
+
+
+def vector_min(values: Collection[Number]) -> Number:
+    """
+    Smallest value.
+
+    Args:
+        values (Collection[Number]): Non-empty collection of numbers.
+
+    Returns:
+        Number: The minimum.
+
+    Raises:
+        ValueError: If `values` is empty.
+    """
+
+    array = _as_float_array(values)
+    return float(array.min()) if array is not None else min(values)
+
+
+def vector_max(values: Collection[Number]) -> Number:
+    """
+    Largest value.
+
+    Args:
+        values (Collection[Number]): Non-empty collection of numbers.
+
+    Returns:
+        Number: The maximum.
+
+    Raises:
+        ValueError: If `values` is empty.
+    """
+
+    array = _as_float_array(values)
+    return float(array.max()) if array is not None else max(values)